@@ -7,6 +7,32 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+def _parse_int_map(raw: str | None) -> dict[str, int]:
+    """Parse "Technical:6,Behavioral:4" style env values into a dict."""
+
+    result: dict[str, int] = {}
+    for item in (raw or "").split(","):
+        key, sep, value = item.partition(":")
+        if not sep or not key.strip():
+            continue
+        try:
+            result[key.strip().lower()] = int(value)
+        except ValueError:
+            continue
+    return result
+
+
+def _parse_str_map(raw: str | None) -> dict[str, str]:
+    """Parse "evaluate_answer:gemini-1.5-flash-8b,..." style env values into a dict."""
+
+    result: dict[str, str] = {}
+    for item in (raw or "").split(","):
+        key, sep, value = item.partition(":")
+        if sep and key.strip() and value.strip():
+            result[key.strip().lower()] = value.strip()
+    return result
+
+
 class Settings:
     PROJECT_NAME: str = "InterviewDost API"
     ENV: str = os.getenv("ENV", "development")
@@ -16,6 +42,13 @@ class Settings:
         "DATABASE_URL",
         "sqlite:///./interviewdost.db",
     )
+    # Optional read replica for read-only routes; a client that just wrote keeps
+    # reading from the primary for READ_YOUR_WRITES_SECONDS (replication lag)
+    DATABASE_REPLICA_URL: str | None = os.getenv("DATABASE_REPLICA_URL") or None
+    READ_YOUR_WRITES_SECONDS: int = int(os.getenv("READ_YOUR_WRITES_SECONDS", "10"))
+    # Also remember anonymous writers by peer address. Only enable when the
+    # address identifies one client: no proxy, or uvicorn --proxy-headers
+    READ_YOUR_WRITES_BY_IP: bool = os.getenv("READ_YOUR_WRITES_BY_IP", "false").lower() == "true"
 
     # LLM / Tavus placeholders for later wiring
     GEMINI_API_KEY: str | None = os.getenv("GEMINI_API_KEY")
@@ -23,6 +56,185 @@ class Settings:
     TAVUS_API_KEY: str | None = os.getenv("TAVUS_API_KEY")
     TAVUS_PERSONA_ID: str | None = os.getenv("TAVUS_PERSONA_ID")
     TAVUS_REPLICA_ID: str | None = os.getenv("TAVUS_REPLICA_ID")
+    # API hosts; overridden to point at local stand-ins (see benchmarks/stubs.py)
+    GEMINI_BASE_URL: str = os.getenv("GEMINI_BASE_URL", "https://generativelanguage.googleapis.com/v1beta")
+    TAVUS_BASE_URL: str = os.getenv("TAVUS_BASE_URL", "https://tavusapi.com")
+
+    # Interview flow: number of questions asked per interview type (keys are
+    # matched case-insensitively against Interview.type)
+    DEFAULT_INTERVIEW_QUESTION_COUNT: int = int(os.getenv("DEFAULT_INTERVIEW_QUESTION_COUNT", "5"))
+    INTERVIEW_QUESTION_COUNTS: dict[str, int] = _parse_int_map(
+        os.getenv("INTERVIEW_QUESTION_COUNTS", "technical:6,behavioral:4,hr:3")
+    )
+    # Follow-up prefetch: candidates generated per turn and max wait for them
+    FOLLOW_UP_CANDIDATES: int = int(os.getenv("FOLLOW_UP_CANDIDATES", "3"))
+    FOLLOW_UP_PREFETCH_WORKERS: int = int(os.getenv("FOLLOW_UP_PREFETCH_WORKERS", "4"))
+    FOLLOW_UP_WAIT_SECONDS: float = float(os.getenv("FOLLOW_UP_WAIT_SECONDS", "20"))
+    # Drafts of abandoned interviews are dropped after this long, and at most
+    # this many interviews keep drafts (oldest dropped first)
+    FOLLOW_UP_PREFETCH_TTL_SECONDS: float = float(os.getenv("FOLLOW_UP_PREFETCH_TTL_SECONDS", "3600"))
+    FOLLOW_UP_PREFETCH_MAX_PENDING: int = int(os.getenv("FOLLOW_UP_PREFETCH_MAX_PENDING", "1000"))
+    # A picked draft sharing less than this fraction of its words with the
+    # answer is refined against the answer by a short LLM call (0 disables)
+    FOLLOW_UP_REFINE_BELOW: float = float(os.getenv("FOLLOW_UP_REFINE_BELOW", "0.1"))
+
+    # Bulk candidate import: rows per DB batch and concurrent Gemini calls
+    BULK_IMPORT_BATCH_SIZE: int = int(os.getenv("BULK_IMPORT_BATCH_SIZE", "50"))
+    BULK_IMPORT_WORKERS: int = int(os.getenv("BULK_IMPORT_WORKERS", "4"))
+
+    # Bulk interview scheduling: concurrent context/question/Tavus jobs
+    BULK_SCHEDULE_WORKERS: int = int(os.getenv("BULK_SCHEDULE_WORKERS", "8"))
+    BULK_SCHEDULE_MAX_INTERVIEWS: int = int(os.getenv("BULK_SCHEDULE_MAX_INTERVIEWS", "200"))
+
+    # Question bank: retrieval score needed to skip LLM generation, optional
+    # LLM personalization of retrieved questions, and index refresh interval
+    QUESTION_BANK_MIN_SCORE: float = float(os.getenv("QUESTION_BANK_MIN_SCORE", "0.2"))
+    QUESTION_BANK_PERSONALIZE: bool = os.getenv("QUESTION_BANK_PERSONALIZE", "false").lower() == "true"
+    QUESTION_BANK_DIMENSIONS: int = int(os.getenv("QUESTION_BANK_DIMENSIONS", "1024"))
+    QUESTION_BANK_REFRESH_SECONDS: float = float(os.getenv("QUESTION_BANK_REFRESH_SECONDS", "60"))
+
+    # Near-duplicate question detection (MinHash/LSH): Jaccard similarity on
+    # character shingles above which a question links to a canonical one.
+    # 20 bands x 6 rows finds ~92% of pairs at 0.7 and ~1% of pairs at 0.3.
+    QUESTION_DEDUPE_THRESHOLD: float = float(os.getenv("QUESTION_DEDUPE_THRESHOLD", "0.7"))
+    QUESTION_LSH_BANDS: int = int(os.getenv("QUESTION_LSH_BANDS", "20"))
+    QUESTION_LSH_ROWS: int = int(os.getenv("QUESTION_LSH_ROWS", "6"))
+
+    # Skill canonicalization: how often to check for skills added by other
+    # workers, and the minimum name length for fuzzy (edit-distance) matching
+    SKILL_INDEX_REFRESH_SECONDS: float = float(os.getenv("SKILL_INDEX_REFRESH_SECONDS", "30"))
+    SKILL_FUZZY_MIN_LENGTH: int = int(os.getenv("SKILL_FUZZY_MIN_LENGTH", "8"))
+
+    # Interviewer contexts pre-rendered into the profile snapshot at enrich time
+    PROFILE_CONTEXT_TYPES: list[str] = [
+        t.strip() for t in os.getenv("PROFILE_CONTEXT_TYPES", "Technical,Behavioral,HR").split(",") if t.strip()
+    ]
+    PROFILE_CONTEXT_WORKERS: int = int(os.getenv("PROFILE_CONTEXT_WORKERS", "3"))
+
+    # Prompt budgets (estimated tokens for the whole prompt) per LLM task;
+    # resume text is extractively compressed to fit
+    DEFAULT_PROMPT_TOKEN_BUDGET: int = int(os.getenv("DEFAULT_PROMPT_TOKEN_BUDGET", "3000"))
+    PROMPT_TOKEN_BUDGETS: dict[str, int] = _parse_int_map(
+        os.getenv("PROMPT_TOKEN_BUDGETS", "interviewer_context:2500,profile_summary:3000")
+    )
+
+    # LLM model tiering: model, timeout (seconds) and max output tokens per
+    # task, falling back to GEMINI_MODEL and the defaults below. Task names:
+    # generate_question, personalize_question, follow_up_candidates,
+    # follow_up_question, refine_follow_up, evaluate_answer, summarize_profile,
+    # summarize_interview, interviewer_context, extract_resume
+    GEMINI_MODEL: str = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+    LLM_TASK_MODELS: dict[str, str] = _parse_str_map(
+        os.getenv(
+            "LLM_TASK_MODELS",
+            "evaluate_answer:gemini-1.5-flash-8b,generate_question:gemini-1.5-flash-8b,"
+            "personalize_question:gemini-1.5-flash-8b,refine_follow_up:gemini-1.5-flash-8b,"
+            "summarize_interview:gemini-1.5-pro",
+        )
+    )
+    DEFAULT_LLM_TIMEOUT_SECONDS: int = int(os.getenv("DEFAULT_LLM_TIMEOUT_SECONDS", "60"))
+    LLM_TASK_TIMEOUTS: dict[str, int] = _parse_int_map(
+        os.getenv(
+            "LLM_TASK_TIMEOUTS",
+            "evaluate_answer:15,generate_question:20,personalize_question:20,refine_follow_up:10,extract_resume:90",
+        )
+    )
+    DEFAULT_LLM_MAX_OUTPUT_TOKENS: int = int(os.getenv("DEFAULT_LLM_MAX_OUTPUT_TOKENS", "1024"))
+    LLM_TASK_MAX_TOKENS: dict[str, int] = _parse_int_map(
+        os.getenv(
+            "LLM_TASK_MAX_TOKENS",
+            "evaluate_answer:64,generate_question:200,personalize_question:200,follow_up_question:200,"
+            "refine_follow_up:200,"
+            "follow_up_candidates:600,interviewer_context:600,extract_resume:8192",
+        )
+    )
+    # Samples kept per task/model for latency percentiles
+    LLM_LATENCY_WINDOW: int = int(os.getenv("LLM_LATENCY_WINDOW", "500"))
+
+    # LLM providers behind GeminiService, in preference order until latency
+    # data exists ("gemini", "openrouter", "fake" for local runs and tests).
+    # Providers failing LLM_PROVIDER_FAILURE_THRESHOLD times in a row are
+    # skipped for LLM_PROVIDER_COOLDOWN_SECONDS. With hedging on, a second
+    # provider is started when the first exceeds its p95 for the task (but
+    # never sooner than LLM_HEDGE_AFTER_MS).
+    LLM_PROVIDERS: list[str] = [
+        p.strip().lower() for p in os.getenv("LLM_PROVIDERS", "gemini,openrouter").split(",") if p.strip()
+    ]
+    OPENROUTER_BASE_URL: str = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
+    OPENROUTER_MODEL: str = os.getenv("OPENROUTER_MODEL", "google/gemini-flash-1.5")
+    OPENROUTER_TASK_MODELS: dict[str, str] = _parse_str_map(os.getenv("OPENROUTER_TASK_MODELS"))
+    LLM_PROVIDER_FAILURE_THRESHOLD: int = int(os.getenv("LLM_PROVIDER_FAILURE_THRESHOLD", "3"))
+    LLM_PROVIDER_COOLDOWN_SECONDS: float = float(os.getenv("LLM_PROVIDER_COOLDOWN_SECONDS", "30"))
+    LLM_HEDGE_ENABLED: bool = os.getenv("LLM_HEDGE_ENABLED", "false").lower() == "true"
+    LLM_HEDGE_AFTER_MS: int = int(os.getenv("LLM_HEDGE_AFTER_MS", "1500"))
+    LLM_HEDGE_WORKERS: int = int(os.getenv("LLM_HEDGE_WORKERS", "16"))
+    # Simulated latency for the "fake" provider
+    FAKE_LLM_LATENCY_MS: int = int(os.getenv("FAKE_LLM_LATENCY_MS", "0"))
+
+    # Per-request SQL accounting: X-DB-* response headers (dev by default),
+    # slow-request logging thresholds and the N+1 repeat threshold
+    SQL_STATS_HEADERS: bool = os.getenv(
+        "SQL_STATS_HEADERS", "true" if ENV == "development" else "false"
+    ).lower() == "true"
+    SQL_REQUEST_MAX_STATEMENTS: int = int(os.getenv("SQL_REQUEST_MAX_STATEMENTS", "50"))
+    SQL_REQUEST_MAX_DB_MS: int = int(os.getenv("SQL_REQUEST_MAX_DB_MS", "500"))
+    SQL_REPEATED_STATEMENT_THRESHOLD: int = int(os.getenv("SQL_REPEATED_STATEMENT_THRESHOLD", "5"))
+
+    # Password hashing: bcrypt cost (hashes with another cost are upgraded on
+    # login) and the dedicated executor that runs it, so login bursts cannot
+    # take over the request thread pool
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+
+    # Access tokens: HMAC-signed and expiring. AUTH_TOKEN_SECRET must be set
+    # outside development (all workers must share it); the app refuses to
+    # start with the built-in one. AUTH_REQUIRED turns on bearer auth for the
+    # interview and profile routers (on by default outside development).
+    AUTH_TOKEN_SECRET: str = os.getenv("AUTH_TOKEN_SECRET", "dev-insecure-token-secret")
+    AUTH_TOKEN_TTL_SECONDS: int = int(os.getenv("AUTH_TOKEN_TTL_SECONDS", str(12 * 3600)))
+    AUTH_REQUIRED: bool = os.getenv(
+        "AUTH_REQUIRED", "false" if ENV == "development" else "true"
+    ).lower() == "true"
+    # Principals (user id, role) resolved from tokens are cached this long
+    PRINCIPAL_CACHE_TTL_SECONDS: int = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+    PRINCIPAL_CACHE_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+
+    # Interview WebSocket channel: how often the Tavus conversation status is
+    # polled for connected clients (0 disables the poller)
+    TAVUS_STATUS_POLL_SECONDS: float = float(os.getenv("TAVUS_STATUS_POLL_SECONDS", "15"))
+
+    # Compressed text columns (resumes, answers, feedback): "zlib", "zstd"
+    # (needs the zstandard package) or "none"; see services/text_codec.py
+    TEXT_COMPRESSION: str = os.getenv("TEXT_COMPRESSION", "zlib")
+    TEXT_COMPRESSION_LEVEL: int = int(os.getenv("TEXT_COMPRESSION_LEVEL", "6"))
+    # Shorter values are stored as plain UTF-8
+    TEXT_COMPRESSION_MIN_BYTES: int = int(os.getenv("TEXT_COMPRESSION_MIN_BYTES", "64"))
+    TEXT_DICTIONARY_SIZE: int = int(os.getenv("TEXT_DICTIONARY_SIZE", "16384"))
+
+    # Archival of completed interviews (see services/archive.py). The SQLite
+    # archive file defaults to "<database>_archive.db" next to the database
+    ARCHIVE_AFTER_DAYS: int = int(os.getenv("ARCHIVE_AFTER_DAYS", "365"))
+    ARCHIVE_BATCH_SIZE: int = int(os.getenv("ARCHIVE_BATCH_SIZE", "200"))
+    # Background archiver period; 0 leaves archival to the CLI
+    ARCHIVE_INTERVAL_SECONDS: float = float(os.getenv("ARCHIVE_INTERVAL_SECONDS", "0"))
+    ARCHIVE_DATABASE_PATH: str | None = os.getenv("ARCHIVE_DATABASE_PATH")
+
+    def question_count_for(self, interview_type: str | None) -> int:
+        key = (interview_type or "").strip().lower()
+        return max(1, self.INTERVIEW_QUESTION_COUNTS.get(key, self.DEFAULT_INTERVIEW_QUESTION_COUNT))
+
+    def model_for(self, task: str) -> str:
+        return self.LLM_TASK_MODELS.get(task.lower(), self.GEMINI_MODEL)
+
+    def llm_timeout_for(self, task: str) -> int:
+        return max(1, self.LLM_TASK_TIMEOUTS.get(task.lower(), self.DEFAULT_LLM_TIMEOUT_SECONDS))
+
+    def llm_max_tokens_for(self, task: str) -> int:
+        return max(1, self.LLM_TASK_MAX_TOKENS.get(task.lower(), self.DEFAULT_LLM_MAX_OUTPUT_TOKENS))
+
+    def prompt_budget_for(self, task: str) -> int:
+        return max(256, self.PROMPT_TOKEN_BUDGETS.get(task.lower(), self.DEFAULT_PROMPT_TOKEN_BUDGET))
 
 
 @lru_cache
@@ -2,6 +2,8 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from .core_config import get_settings
+from .services.metrics import instrument_engine, timed_pool_class
+from .services.text_codec import install_sql_functions
 
 
 settings = get_settings()
@@ -11,9 +13,29 @@ connect_args = {}
 if settings.DATABASE_URL.startswith("sqlite"):
     connect_args["check_same_thread"] = False
 
-engine = create_engine(settings.DATABASE_URL, echo=False, connect_args=connect_args)
+engine = create_engine(
+    settings.DATABASE_URL, echo=False, connect_args=connect_args, poolclass=timed_pool_class(settings.DATABASE_URL)
+)
+instrument_engine(engine)
+install_sql_functions(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Read-only routes use the replica when one is configured (see services/read_routing.py)
+if settings.DATABASE_REPLICA_URL:
+    replica_connect_args = {"check_same_thread": False} if settings.DATABASE_REPLICA_URL.startswith("sqlite") else {}
+    replica_engine = create_engine(
+        settings.DATABASE_REPLICA_URL,
+        echo=False,
+        connect_args=replica_connect_args,
+        poolclass=timed_pool_class(settings.DATABASE_REPLICA_URL),
+    )
+    instrument_engine(replica_engine)
+    install_sql_functions(replica_engine)
+    ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine, info={"read_only": True})
+else:
+    replica_engine = None
+    ReadSessionLocal = SessionLocal
+
 Base = declarative_base()
 
 
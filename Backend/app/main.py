@@ -1,14 +1,21 @@
 import uvicorn
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .core_config import get_settings
-from .db import Base, engine
-from .routers import interview, users, health, profile, auth
+from .db import Base, SessionLocal, engine, replica_engine
+from .routers import interview, users, health, profile, auth, analytics, questions, metrics
+from .services import archive, candidate_search, schema_upgrade, text_codec
+from .services.auth_tokens import require_principal
+from .services.metrics import MetricsMiddleware, track_in_flight
+from .services.query_stats import QueryStatsMiddleware
+from .services.read_routing import ReadYourWritesMiddleware
+from .services.question_bank import question_bank
+from .services.skills import skill_index
 
 settings = get_settings()
 
-app = FastAPI(title=settings.PROJECT_NAME)
+app = FastAPI(title=settings.PROJECT_NAME, dependencies=[Depends(track_in_flight)])
 
 app.add_middleware(
     CORSMiddleware,
@@ -17,18 +24,48 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(QueryStatsMiddleware)
+if settings.DATABASE_REPLICA_URL:
+    app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 @app.on_event("startup")
 def on_startup() -> None:
-    # Create tables if they do not exist. In production, use Alembic migrations instead.
+    # Create tables if they do not exist and add columns/indexes that older
+    # databases lack (see services/schema_upgrade.py); fails on what it cannot add
     Base.metadata.create_all(bind=engine)
+    schema_upgrade.upgrade(engine, Base.metadata)
+    candidate_search.install(engine)
+    archive.install(engine)
+    if replica_engine is not None:
+        archive.install(replica_engine, create=False)
 
+    with SessionLocal() as db:
+        text_codec.dictionaries.load(db)
+        question_bank.seed_if_empty(db)
+        question_bank.refresh(db, force=True)
+        skill_index.load(db)
 
-app.include_router(interview.router, prefix="/api/interview", tags=["interview"])
+    archive.archiver.start()
+
+
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    archive.archiver.stop()
+
+
+# Bearer auth for candidate data; verified from the token and a principal cache, no per-request query
+protected = [Depends(require_principal)] if settings.AUTH_REQUIRED else []
+
+app.include_router(interview.router, prefix="/api/interview", tags=["interview"], dependencies=protected)
+app.include_router(interview.ws_router, prefix="/api/interview", tags=["interview"])
 app.include_router(users.router, prefix="/api/users", tags=["users"])
 app.include_router(health.router, tags=["health"])
-app.include_router(profile.router, prefix="/api", tags=["profile"])
+app.include_router(metrics.router, tags=["metrics"])
+app.include_router(profile.router, prefix="/api", tags=["profile"], dependencies=protected)
 app.include_router(auth.router, prefix="/api", tags=["auth"])
+app.include_router(analytics.router, prefix="/api/analytics", tags=["analytics"])
+app.include_router(questions.router, prefix="/api/questions", tags=["questions"])
 
 
 if __name__ == "__main__":
@@ -1,9 +1,24 @@
 from datetime import date
 
-from sqlalchemy import Column, Date, ForeignKey, Integer, String, Text, Time
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    Time,
+    func,
+)
+from sqlalchemy.orm import deferred, relationship
 
 from .db import Base
+from .services.text_codec import CompressedText
 
 
 class User(Base):
@@ -15,8 +30,11 @@ class User(Base):
     password_hash = Column(String(255), nullable=True)
     role = Column(String(50), nullable=True)  # e.g., "candidate", "interviewer", "admin"
     resume_summary = Column(Text, nullable=True)
-    # Raw resume text extracted from uploaded PDF or plain text input
-    resume_raw = Column(Text, nullable=True)
+    # Raw resume text extracted from uploaded PDF or plain text input. Stored
+    # compressed and only loaded when accessed (undefer() where it is needed)
+    resume_raw = deferred(Column(CompressedText, nullable=True))
+    # Bumped on every change to the user or their skills (ETag for GET /users/{id})
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     # Relationships
     candidate_interviews = relationship(
@@ -30,6 +48,28 @@ class User(Base):
         foreign_keys="Interview.interviewer_id",
     )
     user_skills = relationship("UserSkill", back_populates="user", cascade="all, delete-orphan")
+    profile_snapshot = relationship(
+        "ProfileSnapshot", back_populates="user", uselist=False, cascade="all, delete-orphan"
+    )
+
+
+class ProfileSnapshot(Base):
+    """Denormalized candidate profile read by interview start.
+
+    `fingerprint` hashes the profile fields it was built from; `version` is
+    bumped whenever that changes, which also drops the rendered contexts.
+    """
+
+    __tablename__ = "profile_snapshots"
+
+    user_id = Column(Integer, ForeignKey("users.user_id"), primary_key=True)
+    version = Column(Integer, nullable=False, default=1)
+    fingerprint = Column(String(64), nullable=False)
+    resume_digest = Column(Text, nullable=True)
+    skills = Column(JSON, nullable=False, default=list)  # canonical skill names
+    contexts = Column(JSON, nullable=False, default=dict)  # interview type key -> interviewer context
+
+    user = relationship("User", back_populates="profile_snapshot")
 
 
 class Skill(Base):
@@ -41,6 +81,15 @@ class Skill(Base):
     user_skills = relationship("UserSkill", back_populates="skill", cascade="all, delete-orphan")
 
 
+class SkillAlias(Base):
+    """Alternative spelling that resolves to a canonical skill (e.g. "reactjs" -> React)."""
+
+    __tablename__ = "skill_aliases"
+
+    alias_key = Column(String(100), primary_key=True)
+    skill_id = Column(Integer, ForeignKey("skills.skill_id"), nullable=False)
+
+
 class UserSkill(Base):
     __tablename__ = "user_skills"
 
@@ -51,6 +100,9 @@ class UserSkill(Base):
     user = relationship("User", back_populates="user_skills")
     skill = relationship("Skill", back_populates="user_skills")
 
+    # Skill -> users posting lists for candidate search
+    __table_args__ = (Index("ix_user_skills_skill_user", "skill_id", "user_id"),)
+
 
 class Interview(Base):
     __tablename__ = "interviews"
@@ -64,11 +116,56 @@ class Interview(Base):
     overall_score = Column(Integer, nullable=True)
     tavus_conversation_id = Column(String(100), nullable=True)
     tavus_conversation_url = Column(String(255), nullable=True)
+    # Bumped on every change to the interview, its questions or responses
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     candidate = relationship("User", foreign_keys=[candidate_id], back_populates="candidate_interviews")
     interviewer = relationship("User", foreign_keys=[interviewer_id], back_populates="interviewer_interviews")
     questions = relationship("Question", back_populates="interview", cascade="all, delete-orphan")
     feedback = relationship("Feedback", back_populates="interview", uselist=False, cascade="all, delete-orphan")
+    stats = relationship("InterviewStats", back_populates="interview", uselist=False, cascade="all, delete-orphan")
+
+    # Covering indexes for per-user history pages, ordered by (date, id) so
+    # keyset pagination is an index range scan. They hold every column the
+    # history page selects, so rows are never looked up in the table.
+    __table_args__ = (
+        Index(
+            "ix_interviews_candidate_history",
+            "candidate_id", "date", "interview_id", "type", "overall_score", "time", "interviewer_id",
+        ),
+        Index(
+            "ix_interviews_interviewer_history",
+            "interviewer_id", "date", "interview_id", "type", "overall_score", "time", "candidate_id",
+        ),
+    )
+
+
+class InterviewStats(Base):
+    """Running score aggregates for one interview, maintained on every answer.
+
+    Kept in a side table so `overall_score` reads never need to scan responses.
+    """
+
+    __tablename__ = "interview_stats"
+
+    interview_id = Column(Integer, ForeignKey("interviews.interview_id"), primary_key=True)
+    response_count = Column(Integer, nullable=False, default=0)
+    relevance_sum = Column(Integer, nullable=False, default=0)
+    confidence_sum = Column(Integer, nullable=False, default=0)
+    relevance_min = Column(Integer, nullable=True)
+    relevance_max = Column(Integer, nullable=True)
+    confidence_min = Column(Integer, nullable=True)
+    confidence_max = Column(Integer, nullable=True)
+    # [dimension, key] pairs of the score buckets the interview is counted in
+    analytics_keys = Column(JSON, nullable=True)
+
+    interview = relationship("Interview", back_populates="stats")
+
+    @property
+    def overall_score(self) -> int | None:
+        if not self.response_count:
+            return None
+        return int((self.relevance_sum + self.confidence_sum) / (2 * self.response_count))
 
 
 class Category(Base):
@@ -78,6 +175,7 @@ class Category(Base):
     category_name = Column(String(100), nullable=False, unique=True)
 
     questions = relationship("Question", back_populates="category")
+    bank_questions = relationship("BankQuestion", back_populates="category")
 
 
 class Question(Base):
@@ -87,18 +185,49 @@ class Question(Base):
     interview_id = Column(Integer, ForeignKey("interviews.interview_id"), nullable=False)
     category_id = Column(Integer, ForeignKey("categories.category_id"), nullable=True)
     question_text = Column(Text, nullable=False)
+    # Set when this text is a near-duplicate of an earlier question (MinHash/LSH)
+    canonical_question_id = Column(Integer, ForeignKey("questions.question_id"), nullable=True, index=True)
 
     interview = relationship("Interview", back_populates="questions")
     category = relationship("Category", back_populates="questions")
     response = relationship("Response", back_populates="question", uselist=False, cascade="all, delete-orphan")
 
 
+class BankQuestion(Base):
+    """Reusable question in the local question bank (curated or previously generated)."""
+
+    __tablename__ = "question_bank"
+
+    bank_question_id = Column(Integer, primary_key=True, index=True)
+    category_id = Column(Integer, ForeignKey("categories.category_id"), nullable=True)
+    question_text = Column(Text, nullable=False)
+    # Comma-separated skill / role tags used as extra retrieval signal
+    tags = Column(Text, nullable=True)
+    source = Column(String(20), nullable=False, default="curated")  # "curated" or "generated"
+
+    category = relationship("Category", back_populates="bank_questions")
+
+
+class QuestionBand(Base):
+    """LSH band bucket of a canonical question's MinHash signature.
+
+    Near-duplicate lookups hash a new question into the same buckets and only
+    compare against the questions found there.
+    """
+
+    __tablename__ = "question_lsh_bands"
+
+    band = Column(Integer, primary_key=True)
+    bucket = Column(BigInteger, primary_key=True)
+    question_id = Column(Integer, ForeignKey("questions.question_id"), primary_key=True)
+
+
 class Response(Base):
     __tablename__ = "responses"
 
     response_id = Column(Integer, primary_key=True, index=True)
     question_id = Column(Integer, ForeignKey("questions.question_id"), nullable=False, unique=True)
-    answer_text = Column(Text, nullable=True)
+    answer_text = Column(CompressedText, nullable=True)
     relevance_score = Column(Integer, nullable=True)
     confidence_level = Column(Integer, nullable=True)
 
@@ -110,9 +239,40 @@ class Feedback(Base):
 
     feedback_id = Column(Integer, primary_key=True, index=True)
     interview_id = Column(Integer, ForeignKey("interviews.interview_id"), nullable=False, unique=True)
-    comments = Column(Text, nullable=True)
-    suggestions = Column(Text, nullable=True)
+    comments = Column(CompressedText, nullable=True)
+    suggestions = Column(CompressedText, nullable=True)
     report_url = Column(String(255), nullable=True)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     interview = relationship("Interview", back_populates="feedback")
 
+
+class TextDictionary(Base):
+    """Preset dictionary for CompressedText values (see services/text_codec.py).
+
+    Immutable: stored values name the dictionary they were compressed with.
+    """
+
+    __tablename__ = "text_dictionaries"
+
+    dict_id = Column(Integer, primary_key=True)
+    codec = Column(String(10), nullable=False)  # "zlib" or "zstd"
+    sample_count = Column(Integer, nullable=False, default=0)
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+
+
+class ScoreBucket(Base):
+    """Histogram bucket of current interview overall scores for one slice.
+
+    `dimension` is "type" (key = Interview.type) or "skill" (key = skill name).
+    Scores are small integers, so one bucket per score value is an exact
+    quantile sketch and percentile queries touch at most a dozen rows.
+    """
+
+    __tablename__ = "analytics_score_buckets"
+
+    dimension = Column(String(20), primary_key=True)
+    key = Column(String(100), primary_key=True)
+    score = Column(Integer, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,95 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from .. import models, schemas
+from ..services import analytics
+from ..services.read_routing import get_read_db
+
+
+router = APIRouter()
+
+
+def _distribution(db: Session, dimension: str, key: str) -> schemas.ScoreDistributionResponse:
+    buckets = analytics.distribution(db, dimension, key)
+    return schemas.ScoreDistributionResponse(
+        dimension=dimension,
+        key=key,
+        total=sum(count for _, count in buckets),
+        buckets=[schemas.ScoreBucket(score=score, count=count) for score, count in buckets],
+    )
+
+
+@router.get("/types/{interview_type}/distribution", response_model=schemas.ScoreDistributionResponse)
+def type_distribution(interview_type: str, db: Session = Depends(get_read_db)):
+    return _distribution(db, analytics.TYPE, analytics.type_key(interview_type))
+
+
+@router.get("/skills/top", response_model=List[schemas.TopSkill])
+def top_skills(
+    limit: int = Query(10, ge=1, le=100),
+    min_interviews: int = Query(1, ge=1),
+    db: Session = Depends(get_read_db),
+):
+    return [
+        schemas.TopSkill(skill=skill, interviews=n, average_score=avg)
+        for skill, n, avg in analytics.top_skills(db, limit=limit, min_interviews=min_interviews)
+    ]
+
+
+@router.get("/skills/{skill_name}/distribution", response_model=schemas.ScoreDistributionResponse)
+def skill_distribution(skill_name: str, db: Session = Depends(get_read_db)):
+    return _distribution(db, analytics.SKILL, analytics.skill_key(skill_name))
+
+
+@router.get("/percentile", response_model=schemas.PercentileRank)
+def score_percentile(
+    score: int,
+    interview_type: Optional[str] = None,
+    skill: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+):
+    """Percentile of an arbitrary score within an interview type or skill."""
+
+    if skill:
+        dimension, key = analytics.SKILL, analytics.skill_key(skill)
+    else:
+        dimension, key = analytics.TYPE, analytics.type_key(interview_type)
+    percentile, population = analytics.percentile_rank(db, dimension, key, score)
+    return schemas.PercentileRank(dimension=dimension, key=key, percentile=percentile, population=population)
+
+
+@router.get("/interviews/{interview_id}/percentile", response_model=schemas.InterviewPercentileResponse)
+def interview_percentile(interview_id: int, db: Session = Depends(get_read_db)):
+    """Where this interview's overall score sits vs. everyone of the same type and skills."""
+
+    interview = db.query(models.Interview).filter_by(interview_id=interview_id).first()
+    if not interview:
+        raise HTTPException(status_code=404, detail="Interview not found")
+
+    ranks: list[schemas.PercentileRank] = []
+    if interview.overall_score is not None:
+        # The buckets this interview is counted in, else its candidate's current skills
+        keys = interview.stats.analytics_keys if interview.stats is not None else None
+        if keys is None:
+            skill_names = (
+                db.query(models.Skill.skill_name)
+                .join(models.UserSkill, models.UserSkill.skill_id == models.Skill.skill_id)
+                .filter(models.UserSkill.user_id == interview.candidate_id)
+                .all()
+            )
+            keys = analytics.bucket_keys(interview.type, [name for (name,) in skill_names])
+        for dimension, key in keys:
+            percentile, population = analytics.percentile_rank(db, dimension, key, interview.overall_score)
+            ranks.append(
+                schemas.PercentileRank(
+                    dimension=dimension, key=key, percentile=percentile, population=population
+                )
+            )
+
+    return schemas.InterviewPercentileResponse(
+        interview_id=interview.interview_id,
+        overall_score=interview.overall_score,
+        ranks=ranks,
+    )
@@ -1,38 +1,27 @@
+import logging
+
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-import bcrypt
+from starlette.concurrency import run_in_threadpool
 
 from .. import models, schemas
 from ..db import get_db
+from ..services.auth_tokens import Principal, issue_token, principal_cache
+from ..services.passwords import (
+    HashingOverloaded,
+    hash_password_async,
+    needs_rehash,
+    verify_password_async,
+)
 
 
 router = APIRouter()
 
-
-def hash_password(password: str) -> str:
-    """Hash a password using bcrypt directly.
-
-    This avoids Passlib's backend self-tests, which can be flaky on some
-    Windows/Python combinations. The result is a UTF-8 string suitable for
-    storing in the database.
-    """
-
-    hashed = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
-    return hashed.decode("utf-8")
-
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    try:
-        return bcrypt.checkpw(
-            plain_password.encode("utf-8"), hashed_password.encode("utf-8")
-        )
-    except ValueError:
-        # If the stored hash is somehow invalid, treat as non-match
-        return False
+logger = logging.getLogger(__name__)
 
 
 @router.post("/auth/register_admin", response_model=schemas.User)
-def register_admin(db: Session = Depends(get_db)):
+async def register_admin(db: Session = Depends(get_db)):
     """One-time endpoint to create the admin user.
 
     Email and password are currently hardcoded as requested. If the user
@@ -42,36 +31,64 @@ def register_admin(db: Session = Depends(get_db)):
     email = "prajwalts.is23@rvce.edu.in"
     password = "1234"
 
-    user = db.query(models.User).filter_by(email=email).first()
+    user = await run_in_threadpool(lambda: db.query(models.User).filter_by(email=email).first())
     if user:
-        return user
+        return schemas.User.model_validate(user)
 
-    user = models.User(
-        name="Prajwal",
-        email=email,
-        password_hash=hash_password(password),
-        role="admin",
-    )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return user
+    # Hash on the bcrypt executor like login, not on the request thread pool
+    try:
+        password_hash = await hash_password_async(password)
+    except HashingOverloaded:
+        raise HTTPException(
+            status_code=503, detail="Too many logins in progress, retry shortly", headers={"Retry-After": "1"}
+        )
+
+    def create() -> schemas.User:
+        user = models.User(
+            name="Prajwal",
+            email=email,
+            password_hash=password_hash,
+            role="admin",
+        )
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        return schemas.User.model_validate(user)
+
+    return await run_in_threadpool(create)
 
 
 @router.post("/auth/login", response_model=schemas.AuthLoginResponse)
-def login(payload: schemas.AuthLoginRequest, db: Session = Depends(get_db)):
-    user = db.query(models.User).filter_by(email=payload.email).first()
+async def login(payload: schemas.AuthLoginRequest, db: Session = Depends(get_db)):
+    # bcrypt runs on the hashing executor; only the short DB calls use the
+    # request thread pool, so a login burst cannot occupy it
+    user = await run_in_threadpool(lambda: db.query(models.User).filter_by(email=payload.email).first())
     if not user or not user.password_hash:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    if not verify_password(payload.password, user.password_hash):
-        raise HTTPException(status_code=401, detail="Invalid credentials")
+    try:
+        if not await verify_password_async(payload.password, user.password_hash):
+            raise HTTPException(status_code=401, detail="Invalid credentials")
+
+        # Serialize before a commit expires the instance (reloading would hit the DB here)
+        principal = schemas.User.model_validate(user)
+
+        # Upgrade hashes made with a different BCRYPT_ROUNDS while the password is at hand
+        if needs_rehash(user.password_hash):
+            user.password_hash = await hash_password_async(payload.password)
+            await run_in_threadpool(db.commit)
+            logger.info("Rehashed password for user %s with the current bcrypt cost", principal.user_id)
+    except HashingOverloaded:
+        raise HTTPException(
+            status_code=503, detail="Too many logins in progress, retry shortly", headers={"Retry-After": "1"}
+        )
 
-    # Simple opaque token for now; replace with real JWT later
-    token = f"token-{user.user_id}"
+    token, expires_in = issue_token(principal.user_id)
+    principal_cache.put(Principal(principal.user_id, principal.role))
 
     return schemas.AuthLoginResponse(
         access_token=token,
         token_type="bearer",
-        user=schemas.User.model_validate(user),
+        expires_in=expires_in,
+        user=principal,
     )
@@ -3,6 +3,7 @@ from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from ..db import get_db
+from ..services.gemini_service import gemini_service
 
 
 router = APIRouter()
@@ -12,3 +13,10 @@ router = APIRouter()
 def db_health(db: Session = Depends(get_db)):
     db.execute(text("SELECT 1"))
     return {"status": "ok"}
+
+
+@router.get("/health/llm")
+def llm_health():
+    """Recent LLM latency percentiles and error counts per (task, provider, model)."""
+
+    return {"latency": gemini_service.latency.summary()}
@@ -1,121 +1,93 @@
+import asyncio
+import json
 import logging
-from typing import Optional
-
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Callable, Literal, Optional
+
+import anyio.from_thread
+from fastapi import APIRouter, Depends, HTTPException, Request, WebSocket, WebSocketDisconnect, status
+from fastapi import Response as HTTPResponse
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.orm import Session, joinedload, undefer
+from starlette.concurrency import run_in_threadpool
 
 from .. import models, schemas
-from ..db import get_db
+from ..core_config import get_settings
+from ..db import SessionLocal, get_db
+from ..services import analytics, archive, etags, export, metrics, profile_snapshot, question_dedupe
 from ..services.gemini_service import gemini_service
+from ..services.interview_engine import interview_engine
+from ..services.question_bank import question_bank
+from ..services.auth_tokens import InvalidToken, resolve_principal
+from ..services.read_routing import get_read_db
+from ..services.score_stats import record_response_scores
+from ..services.skills import attach_skills
 from ..services.tavus_service import tavus_service
 
 router = APIRouter()
+# Included without the bearer dependency; the channel checks its own token
+ws_router = APIRouter()
 
-logger = logging.getLogger(__name__)
-
+settings = get_settings()
 
-# --- Routes -------------------------------------------------------------------
+logger = logging.getLogger(__name__)
 
 
-@router.post("/start", response_model=schemas.InterviewStartResponse)
-def start_interview(payload: schemas.InterviewStartRequest, db: Session = Depends(get_db)):
-    # Create or reuse candidate user.
-    # If a user with this email already exists (e.g. the seeded admin), reuse
-    # that row instead of inserting a new one to avoid unique email conflicts.
-    cand_data = payload.candidate
+# --- Helpers ------------------------------------------------------------------
 
-    candidate = None
-    if cand_data.email:
-        candidate = db.query(models.User).filter_by(email=cand_data.email).first()
 
-    if candidate is None:
-        candidate = models.User(
-            name=cand_data.name,
-            email=cand_data.email,
-            password_hash=cand_data.password_hash,
-            role=cand_data.role or "candidate",
-            resume_summary=cand_data.resume_summary,
-        )
-        db.add(candidate)
-        db.commit()
-        db.refresh(candidate)
+def _candidate_profile(interview: models.Interview) -> dict:
+    candidate = interview.candidate
+    skills = [us.skill.skill_name for us in candidate.user_skills] if candidate else []
+    return {
+        "name": candidate.name if candidate else None,
+        "role": (candidate.role if candidate else None) or interview.type,
+        "interview_type": interview.type,
+        "resume_summary": candidate.resume_summary if candidate else None,
+        "skills": skills,
+    }
 
-    # Attach skills to candidate if provided
-    skill_names: list[str] = []
-    if payload.skills:
-        for skill_name in payload.skills:
-            normalized = (skill_name or "").strip()
-            if not normalized:
-                continue
-            existing_skill = (
-                db.query(models.Skill)
-                .filter(models.Skill.skill_name.ilike(normalized))
-                .first()
-            )
-            if existing_skill is None:
-                existing_skill = models.Skill(skill_name=normalized)
-                db.add(existing_skill)
-                db.commit()
-                db.refresh(existing_skill)
-
-            link_exists = (
-                db.query(models.UserSkill)
-                .filter_by(user_id=candidate.user_id, skill_id=existing_skill.skill_id)
-                .first()
-            )
-            if not link_exists:
-                user_skill = models.UserSkill(
-                    user_id=candidate.user_id,
-                    skill_id=existing_skill.skill_id,
-                    proficiency=None,
-                )
-                db.add(user_skill)
-                db.commit()
 
-            skill_names.append(existing_skill.skill_name)
+def _transcript(db: Session, interview_id: int) -> list[dict]:
+    questions = (
+        db.query(models.Question)
+        .options(joinedload(models.Question.response))
+        .filter_by(interview_id=interview_id)
+        .order_by(models.Question.question_id)
+        .all()
+    )
+    return [
+        {
+            "question_id": q.question_id,
+            "question": q.question_text,
+            "answer": q.response.answer_text if q.response else None,
+        }
+        for q in questions
+    ]
 
-    # For now, interviewer is not created dynamically; we require an interviewer_id
-    if payload.interviewer_id is None:
-        raise HTTPException(status_code=400, detail="interviewer_id is required")
 
-    interviewer = db.query(models.User).filter_by(user_id=payload.interviewer_id).first()
-    if not interviewer:
-        raise HTTPException(status_code=404, detail="Interviewer not found")
+def _add_question(
+    db: Session, interview_id: int, question_text: str, category_id: Optional[int] = None
+) -> models.Question:
+    """Insert a question (flushed, not committed), linking near-duplicates to a canonical one."""
 
-    interview = models.Interview(
-        candidate_id=candidate.user_id,
-        interviewer_id=interviewer.user_id,
-        date=payload.date,
-        time=payload.time,
-        type=payload.interview_type,
+    question = models.Question(
+        interview_id=interview_id,
+        category_id=category_id,
+        question_text=question_text,
     )
-    db.add(interview)
-    db.commit()
-    db.refresh(interview)
-
-    # Create Tavus CVI conversation for this interview
-    candidate_profile = {
-        "name": candidate.name,
-        "email": candidate.email,
-        "role": candidate.role,
-        "resume_summary": candidate.resume_summary,
-        "resume_raw": candidate.resume_raw,
-        "skills": skill_names,
-    }
+    db.add(question)
+    db.flush()
+    question_dedupe.index_question(db, question)
+    return question
 
-    skills_section = ", ".join(skill_names) if skill_names else "(skills not provided)"
-    resume_section = candidate.resume_summary or "No explicit resume summary was provided."
 
-    context_str = gemini_service.generate_tavus_interviewer_context(
-        {
-            "name": candidate_profile.get("name"),
-            "target_role": candidate_profile.get("role") or payload.interview_type,
-            "interview_type": payload.interview_type,
-            "skills": skill_names,
-            "resume_summary": candidate.resume_summary,
-            "resume_raw": candidate.resume_raw,
-        }
-    )
+def _create_tavus_conversation(
+    interview_id: int, context_str: str
+) -> tuple[Optional[str], Optional[str], Optional[str]]:
+    """Create the Tavus CVI conversation; returns (conversation_id, url, error)."""
 
     tavus_data: dict | None = None
     tavus_error: str | None = None
@@ -123,7 +95,7 @@ def start_interview(payload: schemas.InterviewStartRequest, db: Session = Depend
     conv_url: str | None = None
     try:
         tavus_data = tavus_service.create_conversation(
-            conversation_name=f"InterviewDost Interview {interview.interview_id}",
+            conversation_name=f"InterviewDost Interview {interview_id}",
             context=context_str,
         )
 
@@ -163,23 +135,100 @@ def start_interview(payload: schemas.InterviewStartRequest, db: Session = Depend
         conv_id = None
         conv_url = None
 
+    return conv_id, conv_url, tavus_error
+
+
+# --- Routes -------------------------------------------------------------------
+
+
+@router.post("/start", response_model=schemas.InterviewStartResponse)
+def start_interview(payload: schemas.InterviewStartRequest, db: Session = Depends(get_db)):
+    # Create or reuse candidate user.
+    # If a user with this email already exists (e.g. the seeded admin), reuse
+    # that row instead of inserting a new one to avoid unique email conflicts.
+    cand_data = payload.candidate
+
+    candidate = None
+    if cand_data.email:
+        # The profile snapshot fingerprints the resume, so load it with the row
+        candidate = (
+            db.query(models.User).options(undefer(models.User.resume_raw)).filter_by(email=cand_data.email).first()
+        )
+
+    if candidate is None:
+        candidate = models.User(
+            name=cand_data.name,
+            email=cand_data.email,
+            password_hash=cand_data.password_hash,
+            role=cand_data.role or "candidate",
+            resume_summary=cand_data.resume_summary,
+        )
+        db.add(candidate)
+        db.commit()
+        db.refresh(candidate)
+
+    # Attach skills to candidate if provided
+    if payload.skills:
+        attach_skills(db, candidate.user_id, payload.skills)
+        db.commit()
+
+    # For now, interviewer is not created dynamically; we require an interviewer_id
+    if payload.interviewer_id is None:
+        raise HTTPException(status_code=400, detail="interviewer_id is required")
+
+    interviewer = db.query(models.User).filter_by(user_id=payload.interviewer_id).first()
+    if not interviewer:
+        raise HTTPException(status_code=404, detail="Interviewer not found")
+
+    interview = models.Interview(
+        candidate_id=candidate.user_id,
+        interviewer_id=interviewer.user_id,
+        date=payload.date,
+        time=payload.time,
+        type=payload.interview_type,
+        stats=models.InterviewStats(),
+    )
+    db.add(interview)
+    db.commit()
+    db.refresh(interview)
+
+    # Interviewer context from the candidate's profile snapshot; only rendered
+    # by the LLM when the profile changed since it was last built
+    context_str, snapshot = profile_snapshot.interviewer_context(db, candidate, payload.interview_type)
+    candidate_profile = {
+        "name": candidate.name,
+        "email": candidate.email,
+        "role": candidate.role,
+        "resume_summary": candidate.resume_summary,
+        "resume_raw": snapshot.resume_digest,
+        "skills": list(snapshot.skills or []),
+        "interview_type": payload.interview_type,
+    }
+
+    conv_id, conv_url, tavus_error = _create_tavus_conversation(interview.interview_id, context_str)
+
     interview.tavus_conversation_id = conv_id
     interview.tavus_conversation_url = conv_url
     db.add(interview)
     db.commit()
     db.refresh(interview)
 
-    # First question via Gemini service (currently stubbed for scoring pipeline)
-    question_text = gemini_service.generate_question(candidate_profile)
+    # First question from the local question bank, falling back to Gemini
+    question_text, category_id = question_bank.first_question(db, candidate_profile)
 
-    question = models.Question(
-        interview_id=interview.interview_id,
-        question_text=question_text,
-    )
-    db.add(question)
+    question = _add_question(db, interview.interview_id, question_text, category_id)
     db.commit()
     db.refresh(question)
 
+    # Start drafting question 2 while the candidate answers question 1
+    if interview_engine.total_questions(interview.type) > 1:
+        interview_engine.prefetch(
+            interview.interview_id,
+            question.question_id,
+            candidate_profile,
+            [{"question": question.question_text, "answer": None}],
+        )
+
     return schemas.InterviewStartResponse(
         interview_id=interview.interview_id,
         question=schemas.Question(
@@ -191,15 +240,252 @@ def start_interview(payload: schemas.InterviewStartRequest, db: Session = Depend
     )
 
 
-@router.post("/{interview_id}/questions/{question_id}/answer", response_model=schemas.AnswerResponse)
-def submit_answer(
-    interview_id: int,
-    question_id: int,
-    payload: schemas.AnswerRequest,
-    db: Session = Depends(get_db),
+@router.post("/bulk_schedule", response_model=schemas.BulkScheduleResponse)
+def bulk_schedule(payload: schemas.BulkScheduleRequest, db: Session = Depends(get_db)):
+    """Schedule many interviews for one interviewer in a single call.
+
+    All candidates and `Interview` rows are written in one transaction, then
+    interviewer-context + Tavus creation and first-question generation run on a
+    bounded worker pool (the two chains in parallel per interview). A failure
+    for one candidate is reported in its result item and does not affect the
+    others. An interview whose question could not be generated is removed,
+    unless its Tavus conversation was created: then it is kept with status
+    "scheduled_without_question".
+    """
+
+    if len(payload.interviews) > settings.BULK_SCHEDULE_MAX_INTERVIEWS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.BULK_SCHEDULE_MAX_INTERVIEWS} interviews per request",
+        )
+
+    interviewer = db.query(models.User).filter_by(user_id=payload.interviewer_id).first()
+    if not interviewer:
+        raise HTTPException(status_code=404, detail="Interviewer not found")
+
+    results = [schemas.BulkScheduleItem(index=idx, status="failed") for idx in range(len(payload.interviews))]
+
+    # 1) One transaction for candidates, skills and interview rows
+    emails = {item.candidate.email for item in payload.interviews if item.candidate.email}
+    by_email = {
+        u.email: u
+        for u in db.query(models.User)
+        .options(undefer(models.User.resume_raw))
+        .filter(models.User.email.in_(emails))
+        .all()
+    } if emails else {}
+
+    # (index, interview, candidate profile, (candidate id, snapshot version, cached context, context payload))
+    jobs: list[tuple[int, models.Interview, dict, tuple[int, int, Optional[str], dict]]] = []
+    for idx, item in enumerate(payload.interviews):
+        cand_data = item.candidate
+        try:
+            with db.begin_nested():
+                candidate = by_email.get(cand_data.email) if cand_data.email else None
+                if candidate is None:
+                    candidate = models.User(
+                        name=cand_data.name,
+                        email=cand_data.email,
+                        password_hash=cand_data.password_hash,
+                        role=cand_data.role or "candidate",
+                        resume_summary=cand_data.resume_summary,
+                    )
+                    db.add(candidate)
+                    db.flush()
+
+                attach_skills(db, candidate.user_id, item.skills or [])
+                snapshot = profile_snapshot.sync_snapshot(db, candidate)
+                interview = models.Interview(
+                    candidate_id=candidate.user_id,
+                    interviewer_id=interviewer.user_id,
+                    date=item.date,
+                    time=item.time,
+                    type=item.interview_type,
+                    stats=models.InterviewStats(),
+                )
+                db.add(interview)
+                db.flush()
+        except Exception as e:
+            logger.exception("Bulk schedule failed for item %s", idx)
+            results[idx].error = str(e)
+            continue
+
+        # Only once the savepoint committed: a rolled-back candidate is transient
+        if cand_data.email:
+            by_email[cand_data.email] = candidate
+        results[idx].candidate_id = candidate.user_id
+        results[idx].interview_id = interview.interview_id
+        jobs.append(
+            (
+                idx,
+                interview,
+                {
+                    "name": candidate.name,
+                    "email": candidate.email,
+                    "role": candidate.role,
+                    "resume_summary": candidate.resume_summary,
+                    "resume_raw": snapshot.resume_digest,
+                    "skills": list(snapshot.skills or []),
+                    "interview_type": item.interview_type,
+                },
+                (
+                    candidate.user_id,
+                    snapshot.version,
+                    profile_snapshot.cached_context(snapshot, item.interview_type),
+                    profile_snapshot.context_payload(candidate, snapshot, item.interview_type),
+                ),
+            )
+        )
+    db.commit()
+
+    # 2) Context/Tavus and first question generated concurrently per interview
+    def conversation_job(interview_id: int, cached: Optional[str], context_payload: dict):
+        context_str = cached or gemini_service.generate_tavus_interviewer_context(context_payload)
+        return context_str, _create_tavus_conversation(interview_id, context_str)
+
+    with ThreadPoolExecutor(
+        max_workers=settings.BULK_SCHEDULE_WORKERS, thread_name_prefix="bulk-schedule"
+    ) as executor:
+        pending = []
+        for idx, interview, profile, (user_id, version, cached, context_payload) in jobs:
+            if payload.create_conversations:
+                metrics.record_cache("profile_context", cached is not None)
+            # Bank lookups are local; only misses (or personalization) hit the LLM
+            try:
+                matched = question_bank.match(db, profile)
+            except Exception:
+                logger.exception("Question bank lookup failed for interview %s", results[idx].interview_id)
+                matched = None
+            if matched is None:
+                question_future = executor.submit(gemini_service.generate_question, profile)
+            elif settings.QUESTION_BANK_PERSONALIZE:
+                question_future = executor.submit(gemini_service.personalize_question, matched[0], profile)
+            else:
+                question_future = None
+            conversation_future = (
+                executor.submit(conversation_job, results[idx].interview_id, cached, context_payload)
+                if payload.create_conversations
+                else None
+            )
+            pending.append((idx, interview, profile, user_id, version, matched, question_future, conversation_future))
+
+        # 3) Wait for every worker first, so no write is pending while calls run
+        outcomes = []
+        for idx, interview, profile, user_id, version, matched, question_future, conversation_future in pending:
+            interview_id = results[idx].interview_id
+            question_text = question_error = conversation = None
+            try:
+                question_text = question_future.result() if question_future else matched[0]
+            except Exception as e:
+                logger.exception("Bulk schedule question generation failed for interview %s", interview_id)
+                question_error = str(e)
+            if conversation_future is not None:
+                try:
+                    conversation = conversation_future.result()
+                except Exception as e:
+                    logger.exception("Bulk schedule conversation failed for interview %s", interview_id)
+                    results[idx].tavus_error = str(e)
+            outcomes.append((idx, interview, profile, user_id, version, matched, question_text, question_error, conversation))
+
+    # 4) Persist everything the workers produced in one more transaction
+    created_questions = []
+    for idx, interview, profile, user_id, version, matched, question_text, question_error, conversation in outcomes:
+        result = results[idx]
+        # A created conversation is paid for: always keep it, even without a question
+        if conversation is not None:
+            context_str, (conv_id, conv_url, tavus_error) = conversation
+            try:
+                with db.begin_nested():
+                    snapshot = db.get(models.ProfileSnapshot, user_id)
+                    if snapshot is not None:
+                        profile_snapshot.store_context(snapshot, profile.get("interview_type"), context_str, version)
+                    interview.tavus_conversation_id = conv_id
+                    interview.tavus_conversation_url = conv_url
+                    db.flush()
+                result.conversation_url = conv_url
+                result.tavus_error = tavus_error
+            except Exception as e:
+                logger.exception("Bulk schedule failed to store conversation for interview %s", result.interview_id)
+                result.tavus_error = str(e)
+
+        if question_text is not None:
+            try:
+                with db.begin_nested():
+                    category_id = matched[1] if matched else question_bank.remember(db, question_text, profile)
+                    question = _add_question(db, result.interview_id, question_text, category_id)
+                    db.flush()
+                created_questions.append((result, profile, question))
+                continue
+            except Exception as e:
+                logger.exception("Bulk schedule failed to store question for interview %s", result.interview_id)
+                question_error = str(e)
+
+        result.error = question_error
+        if interview.tavus_conversation_id:
+            result.status = "scheduled_without_question"
+        else:
+            # Nothing worth keeping: drop the interview row written in step 1
+            db.delete(interview)
+            result.interview_id = None
+    for result, profile, question in created_questions:
+        result.status = "scheduled"
+        result.question = schemas.Question(question_id=question.question_id, text=question.question_text)
+    db.commit()
+
+    for result, profile, question in created_questions:
+        if interview_engine.total_questions(profile.get("interview_type")) > 1:
+            interview_engine.prefetch(
+                result.interview_id,
+                result.question.question_id,
+                profile,
+                [{"question": result.question.text, "answer": None}],
+            )
+
+    return schemas.BulkScheduleResponse(
+        interviewer_id=interviewer.user_id,
+        scheduled=sum(1 for r in results if r.status == "scheduled"),
+        failed=sum(1 for r in results if r.status == "failed"),
+        results=results,
+    )
+
+
+@router.get("/export")
+def export_interviews(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    interview_type: Optional[str] = None,
 ):
+    """Stream all matching interviews with transcripts, scores and feedback.
+
+    NDJSON emits one nested record per interview; CSV emits one row per
+    question. The body is produced while the DB cursor is read, so the export
+    never materializes in memory.
+    """
+
+    def lines():
+        with SessionLocal() as db:
+            yield from export.export_lines(db, format, date_from, date_to, interview_type)
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"interviews.{'csv' if format == 'csv' else 'ndjson'}"
+    return StreamingResponse(
+        lines(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+def _load_turn(db: Session, interview_id: int, question_id: int) -> tuple[models.Interview, models.Question]:
     interview: Optional[models.Interview] = (
-        db.query(models.Interview).filter_by(interview_id=interview_id).first()
+        db.query(models.Interview)
+        .options(
+            joinedload(models.Interview.candidate)
+            .selectinload(models.User.user_skills)
+            .joinedload(models.UserSkill.skill)
+        )
+        .filter_by(interview_id=interview_id)
+        .first()
     )
     if not interview:
         raise HTTPException(status_code=404, detail="Interview not found")
@@ -211,31 +497,86 @@ def submit_answer(
     )
     if not question:
         raise HTTPException(status_code=404, detail="Question not found for this interview")
+    return interview, question
+
+
+def _record_answer(
+    db: Session, interview: models.Interview, question: models.Question, answer_text: str
+) -> tuple[dict, dict]:
+    """Score and store an answer; returns (scores, candidate_profile)."""
 
-    scores = gemini_service.evaluate_answer(question.question_text, payload.answer_text)
+    scores = gemini_service.evaluate_answer(question.question_text, answer_text)
 
     response = models.Response(
         question_id=question.question_id,
-        answer_text=payload.answer_text,
+        answer_text=answer_text,
         relevance_score=scores["relevance_score"],
         confidence_level=scores["confidence_level"],
     )
     db.add(response)
-    db.commit()
-    db.refresh(response)
+    db.flush()
 
-    # For now, compute overall_score from this single response
-    interview.overall_score = int(
-        (scores["relevance_score"] + scores["confidence_level"]) / 2
+    # Response, running aggregates, analytics and overall_score commit together
+    stats, previous_score = record_response_scores(
+        db, interview.interview_id, scores["relevance_score"], scores["confidence_level"]
+    )
+    candidate_profile = _candidate_profile(interview)
+    analytics.record_score_change(
+        db, stats, interview.type, candidate_profile["skills"], previous_score, stats.overall_score
     )
+    interview.overall_score = stats.overall_score
     db.add(interview)
     db.commit()
+    return scores, candidate_profile
+
+
+def _next_question(
+    db: Session, interview: models.Interview, question: models.Question, candidate_profile: dict
+) -> Optional[models.Question]:
+    """Add the follow-up to an answered question, or None when the interview is done."""
+
+    interview_id = interview.interview_id
+    history = _transcript(db, interview_id)
+    if len(history) >= interview_engine.total_questions(interview.type):
+        interview_engine.discard(interview_id)
+        return None
+
+    next_text = interview_engine.next_question(
+        interview_id, question.question_id, candidate_profile, history
+    )
+    next_question = _add_question(db, interview_id, next_text, question.category_id)
+    db.commit()
+    db.refresh(next_question)
+
+    interview_engine.prefetch(
+        interview_id,
+        next_question.question_id,
+        candidate_profile,
+        history + [{"question": next_question.question_text, "answer": None}],
+    )
+    return next_question
+
+
+@router.post("/{interview_id}/questions/{question_id}/answer", response_model=schemas.AnswerResponse)
+def submit_answer(
+    interview_id: int,
+    question_id: int,
+    payload: schemas.AnswerRequest,
+    db: Session = Depends(get_db),
+):
+    interview, question = _load_turn(db, interview_id, question_id)
+    _, candidate_profile = _record_answer(db, interview, question, payload.answer_text)
+    next_question = _next_question(db, interview, question, candidate_profile)
 
     return schemas.AnswerResponse(
-        interview_id=interview.interview_id,
-        question_id=question.question_id,
-        follow_up_question=None,
-        done=True,
+        interview_id=interview_id,
+        question_id=question_id,
+        follow_up_question=(
+            schemas.Question(question_id=next_question.question_id, text=next_question.question_text)
+            if next_question
+            else None
+        ),
+        done=next_question is None,
     )
 
 
@@ -260,15 +601,36 @@ def push_system_message(
 
 
 @router.get("/{interview_id}/summary", response_model=schemas.InterviewSummaryResponse)
-def get_summary(interview_id: int, db: Session = Depends(get_db)):
+def get_summary(interview_id: int, request: Request, response: HTTPResponse, db: Session = Depends(get_read_db)):
+    version = db.query(models.Interview.version).filter_by(interview_id=interview_id).scalar()
+    archived = archive.find_interview(db, interview_id) if version is None else None
+    if version is None and archived is None:
+        raise HTTPException(status_code=404, detail="Interview not found")
+    tag = etags.etag("summary", interview_id, version if archived is None else archived.version)
+    if etags.matches(request, tag):
+        return etags.not_modified(tag)
+
+    if archived is not None:
+        # Archived interviews never change, so the tag above is current
+        response.headers.update(etags.validators(tag))
+        return schemas.InterviewSummaryResponse(
+            interview_id=interview_id,
+            overall_score=archived.overall_score,
+            items=[schemas.InterviewSummaryItem(**row._mapping) for row in archive.transcript(db, interview_id)],
+            completed_at=None,
+        )
+
     interview: Optional[models.Interview] = (
         db.query(models.Interview).filter_by(interview_id=interview_id).first()
     )
     if not interview:
         raise HTTPException(status_code=404, detail="Interview not found")
+    # The version read above may be older than the row now; label with the loaded one
+    response.headers.update(etags.validators(etags.etag("summary", interview_id, interview.version)))
 
     questions = (
         db.query(models.Question)
+        .options(joinedload(models.Question.response))
         .filter_by(interview_id=interview_id)
         .order_by(models.Question.question_id)
         .all()
@@ -340,50 +702,85 @@ def create_feedback(
     }
 
 
-@router.get("/{interview_id}/feedback", response_model=dict)
-def get_feedback(interview_id: int, db: Session = Depends(get_db)):
+def _ensure_feedback(db: Session, interview_id: int) -> models.Feedback:
+    """The interview's feedback, generating and storing it on first use."""
+
     fb = db.query(models.Feedback).filter_by(interview_id=interview_id).first()
+    if fb:
+        return fb
 
-    if not fb:
-        interview = db.query(models.Interview).filter_by(interview_id=interview_id).first()
-        if not interview:
-            raise HTTPException(status_code=404, detail="Interview not found")
+    interview = db.query(models.Interview).filter_by(interview_id=interview_id).first()
+    if not interview:
+        raise HTTPException(status_code=404, detail="Interview not found")
 
-        # Build a simple structure for Gemini summary
-        interview_info = {
-            "candidate_name": interview.candidate.name if interview.candidate else None,
-            "role": interview.type,
-        }
+    # Build a simple structure for Gemini summary
+    interview_info = {
+        "candidate_name": interview.candidate.name if interview.candidate else None,
+        "role": interview.type,
+    }
 
-        questions = (
-            db.query(models.Question)
-            .filter_by(interview_id=interview_id)
-            .order_by(models.Question.question_id)
-            .all()
+    questions = (
+        db.query(models.Question)
+        .options(joinedload(models.Question.response))
+        .filter_by(interview_id=interview_id)
+        .order_by(models.Question.question_id)
+        .all()
+    )
+
+    qa_items: list[dict] = []
+    for q in questions:
+        resp = q.response
+        qa_items.append(
+            {
+                "question": q.question_text,
+                "answer": resp.answer_text if resp else None,
+            }
         )
 
-        qa_items: list[dict] = []
-        for q in questions:
-            resp = q.response
-            qa_items.append(
-                {
-                    "question": q.question_text,
-                    "answer": resp.answer_text if resp else None,
-                }
-            )
+    summary = gemini_service.summarize_interview(interview_info, qa_items)
+
+    fb = models.Feedback(
+        interview_id=interview_id,
+        comments=summary.get("comments"),
+        suggestions=summary.get("suggestions"),
+        report_url=None,
+    )
+    db.add(fb)
+    db.commit()
+    db.refresh(fb)
+    return fb
 
-        summary = gemini_service.summarize_interview(interview_info, qa_items)
 
-        fb = models.Feedback(
-            interview_id=interview_id,
-            comments=summary.get("comments"),
-            suggestions=summary.get("suggestions"),
-            report_url=None,
-        )
-        db.add(fb)
-        db.commit()
-        db.refresh(fb)
+@router.get("/{interview_id}/feedback", response_model=dict)
+def get_feedback(
+    interview_id: int,
+    request: Request,
+    response: HTTPResponse,
+    read_db: Session = Depends(get_read_db),
+    db: Session = Depends(get_db),
+):
+    current = (
+        read_db.query(models.Feedback.feedback_id, models.Feedback.version)
+        .filter_by(interview_id=interview_id)
+        .first()
+    )
+    # Feedback of an archived interview comes from the archive and never changes
+    archived = archive.find_feedback(read_db, interview_id) if current is None else None
+    if archived is not None:
+        current = archived
+    if current is not None:
+        tag = etags.etag("feedback", current.feedback_id, current.version)
+        if etags.matches(request, tag):
+            return etags.not_modified(tag)
+
+    fb = archived
+    if fb is None and current is not None:
+        fb = read_db.query(models.Feedback).filter_by(interview_id=interview_id).first()
+    if not fb:
+        # Generated on first read, so a miss (or replica lag) is settled on the primary
+        fb = _ensure_feedback(db, interview_id)
 
+    response.headers.update(etags.validators(etags.etag("feedback", fb.feedback_id, fb.version)))
     return {
         "feedback_id": fb.feedback_id,
         "interview_id": fb.interview_id,
@@ -391,3 +788,215 @@ def get_feedback(interview_id: int, db: Session = Depends(get_db)):
         "suggestions": fb.suggestions,
         "report_url": fb.report_url,
     }
+
+
+# --- WebSocket channel ------------------------------------------------------------
+
+
+def _ws_opening(interview_id: int) -> Optional[dict]:
+    """The "ready" message for a new connection, or None if there is no such interview."""
+
+    with SessionLocal() as db:
+        interview = db.query(models.Interview).filter_by(interview_id=interview_id).first()
+        if not interview:
+            return None
+        pending = (
+            db.query(models.Question)
+            .outerjoin(models.Question.response)
+            .filter(models.Question.interview_id == interview_id, models.Response.response_id.is_(None))
+            .order_by(models.Question.question_id.desc())
+            .first()
+        )
+        return {
+            "type": "ready",
+            "interview_id": interview_id,
+            "question": {"question_id": pending.question_id, "text": pending.question_text} if pending else None,
+            "conversation_id": interview.tavus_conversation_id,
+            "conversation_url": interview.tavus_conversation_url,
+        }
+
+
+def _ws_turn(interview_id: int, answer: schemas.AnswerMessage, emit: Callable[[dict], None]) -> bool:
+    """One answer turn: emits the scores as soon as they are stored, then the
+    follow-up question (or "done"). Returns True when the interview is over.
+    """
+
+    with SessionLocal() as db:
+        interview, question = _load_turn(db, interview_id, answer.question_id)
+        if db.query(models.Response.response_id).filter_by(question_id=question.question_id).first():
+            raise HTTPException(status_code=409, detail="Question already answered")
+
+        scores, candidate_profile = _record_answer(db, interview, question, answer.answer_text)
+        emit(
+            {
+                "type": "scores",
+                "question_id": question.question_id,
+                "relevance_score": scores["relevance_score"],
+                "confidence_level": scores["confidence_level"],
+                "overall_score": interview.overall_score,
+            }
+        )
+
+        next_question = _next_question(db, interview, question, candidate_profile)
+        if next_question is None:
+            emit({"type": "done", "interview_id": interview_id, "overall_score": interview.overall_score})
+            return True
+        emit(
+            {
+                "type": "question",
+                "question": {"question_id": next_question.question_id, "text": next_question.question_text},
+            }
+        )
+        return False
+
+
+def _ws_feedback(interview_id: int) -> dict:
+    with SessionLocal() as db:
+        fb = _ensure_feedback(db, interview_id)
+        return {
+            "type": "feedback",
+            "feedback_id": fb.feedback_id,
+            "interview_id": fb.interview_id,
+            "comments": fb.comments,
+            "suggestions": fb.suggestions,
+            "report_url": fb.report_url,
+        }
+
+
+WS_AUTH_SUBPROTOCOL = "bearer"
+
+
+def _ws_token(websocket: WebSocket) -> str:
+    # Browsers cannot set headers on a WebSocket handshake; they offer the
+    # subprotocols ["bearer", <token>] instead. Never the query string, which
+    # ends up in access logs.
+    scheme, _, token = (websocket.headers.get("authorization") or "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        return token
+    offered = websocket.scope.get("subprotocols") or []
+    if len(offered) == 2 and offered[0] == WS_AUTH_SUBPROTOCOL:
+        return offered[1]
+    return ""
+
+
+@ws_router.websocket("/{interview_id}/ws")
+async def interview_channel(websocket: WebSocket, interview_id: int):
+    """Low-latency channel for a running interview.
+
+    The client sends {"type": "answer", "question_id", "answer_text"} (or
+    {"type": "ping"}). The server sends "ready" on connect, then for each
+    answer "scores" as soon as it is graded and "question" or "done" once
+    the follow-up exists; "feedback" follows "done". Tavus conversation
+    status changes arrive as "tavus" events. Problems with a message
+    (binary frames included) are reported as "error" and leave the
+    connection open. Turns already received still complete, feedback
+    included, if the client disconnects.
+    """
+
+    if settings.AUTH_REQUIRED:
+        try:
+            await resolve_principal(_ws_token(websocket))
+        except InvalidToken:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+
+    opening = await run_in_threadpool(_ws_opening, interview_id)
+    if opening is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept(
+        subprotocol=WS_AUTH_SUBPROTOCOL if WS_AUTH_SUBPROTOCOL in (websocket.scope.get("subprotocols") or []) else None
+    )
+
+    send_lock = asyncio.Lock()
+    # Answers are handled one at a time, in the order they arrived
+    turn_lock = asyncio.Lock()
+    turns: set[asyncio.Task] = set()
+    watchers: set[asyncio.Task] = set()
+    connected = True
+
+    async def send(message: dict) -> None:
+        if not connected:
+            return
+        async with send_lock:
+            try:
+                await websocket.send_json(message)
+            except (WebSocketDisconnect, RuntimeError):
+                # Client went away; work already under way still completes
+                pass
+
+    def spawn(coro, tasks: set) -> None:
+        task = asyncio.create_task(coro)
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    def emit(message: dict) -> None:
+        anyio.from_thread.run(send, message)
+
+    async def run_turn(answer: schemas.AnswerMessage) -> None:
+        try:
+            async with turn_lock:
+                done = await run_in_threadpool(_ws_turn, interview_id, answer, emit)
+            if done:
+                await send(await run_in_threadpool(_ws_feedback, interview_id))
+        except HTTPException as e:
+            await send({"type": "error", "question_id": answer.question_id, "detail": e.detail})
+        except Exception:
+            logger.exception("Interview %s: WebSocket turn failed", interview_id)
+            await send({"type": "error", "question_id": answer.question_id, "detail": "Answer could not be processed"})
+
+    async def watch_tavus(conversation_id: str) -> None:
+        last = None
+        while True:
+            try:
+                data = await run_in_threadpool(tavus_service.get_conversation, conversation_id)
+            except RuntimeError as e:
+                logger.warning("Interview %s: Tavus status poll failed: %s", interview_id, e)
+            else:
+                state = data.get("status") if isinstance(data, dict) else None
+                if state != last:
+                    last = state
+                    await send({"type": "tavus", "conversation_id": conversation_id, "status": state})
+                if state == "ended":
+                    return
+            await asyncio.sleep(settings.TAVUS_STATUS_POLL_SECONDS)
+
+    await send(opening)
+    if opening["conversation_id"] and settings.TAVUS_API_KEY and settings.TAVUS_STATUS_POLL_SECONDS > 0:
+        spawn(watch_tavus(opening["conversation_id"]), watchers)
+
+    try:
+        while True:
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                break
+            if frame.get("text") is None:
+                await send({"type": "error", "detail": "Messages must be JSON text frames"})
+                continue
+            try:
+                message = json.loads(frame["text"])
+            except json.JSONDecodeError:
+                await send({"type": "error", "detail": "Messages must be JSON"})
+                continue
+            kind = message.get("type") if isinstance(message, dict) else None
+
+            if kind == "ping":
+                await send({"type": "pong"})
+            elif kind == "answer":
+                try:
+                    answer = schemas.AnswerMessage.model_validate(message)
+                except ValidationError as e:
+                    await send({"type": "error", "detail": e.errors(include_url=False, include_context=False)})
+                    continue
+                spawn(run_turn(answer), turns)
+            else:
+                await send({"type": "error", "detail": "Unknown message type"})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        connected = False
+        for task in list(watchers):
+            task.cancel()
+        # Answers already received are graded and stored even with nobody listening
+        if turns:
+            await asyncio.gather(*list(turns), return_exceptions=True)
@@ -1,4 +1,9 @@
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
+import io
+import json
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from .. import models, schemas
@@ -6,6 +11,9 @@ from ..db import get_db
 from io import BytesIO
 from PyPDF2 import PdfReader
 from ..services.gemini_service import gemini_service
+from ..services.bulk_import import detect_format, run_import
+from ..services import profile_snapshot
+from ..services.skills import attach_skills
 
 
 router = APIRouter()
@@ -18,6 +26,7 @@ def enrich_profile(payload: schemas.CandidateProfileInput, db: Session = Depends
     - Finds or creates a User by email
     - Calls GeminiService.summarize_candidate_profile to get resume_summary + skills
     - Stores resume_summary on User and skills in Skill/UserSkill tables
+    - Rebuilds the profile snapshot with interviewer contexts per interview type
     """
 
     # Find or create user by email
@@ -47,34 +56,11 @@ def enrich_profile(payload: schemas.CandidateProfileInput, db: Session = Depends
     db.refresh(user)
 
     # Persist skills
-    normalized_skills = []
-    for skill_name in skills:
-        normalized = (skill_name or "").strip()
-        if not normalized:
-            continue
-
-        skill = (
-            db.query(models.Skill)
-            .filter(models.Skill.skill_name.ilike(normalized))
-            .first()
-        )
-        if skill is None:
-            skill = models.Skill(skill_name=normalized)
-            db.add(skill)
-            db.commit()
-            db.refresh(skill)
-
-        link_exists = (
-            db.query(models.UserSkill)
-            .filter_by(user_id=user.user_id, skill_id=skill.skill_id)
-            .first()
-        )
-        if not link_exists:
-            link = models.UserSkill(user_id=user.user_id, skill_id=skill.skill_id)
-            db.add(link)
-            db.commit()
+    normalized_skills = attach_skills(db, user.user_id, skills)
+    db.commit()
 
-        normalized_skills.append(skill.skill_name)
+    # Pre-render interviewer contexts so /interview/start can skip that LLM call
+    profile_snapshot.prerender(db, user)
 
     return schemas.ProfileEnrichResponse(
         user_id=user.user_id,
@@ -113,3 +99,27 @@ async def upload_resume(file: UploadFile = File(...)) -> dict:
         full_text = full_text[:20000]
 
     return {"resume_text": full_text}
+
+
+@router.post("/profile/bulk_import")
+def bulk_import_profiles(
+    file: UploadFile = File(...),
+    format: Optional[Literal["csv", "jsonl"]] = None,
+    batch_size: Optional[int] = Query(None, ge=1, le=1000),
+    workers: Optional[int] = Query(None, ge=1, le=32),
+):
+    """Import many candidate profiles from a CSV or JSONL upload.
+
+    The upload is read line by line and results are streamed back as NDJSON
+    events (one per row, plus progress after every batch), so large cohorts
+    never sit in memory. CSV list columns use ";" as the separator.
+    """
+
+    fmt = format or detect_format(file.filename)
+    lines = io.TextIOWrapper(file.file, encoding="utf-8", errors="surrogateescape", newline="")
+
+    def events():
+        for event in run_import(lines, fmt, batch_size=batch_size, workers=workers):
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
@@ -0,0 +1,83 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from .. import models, schemas
+from ..db import get_db
+from ..services import question_dedupe
+from ..services.question_bank import find_category, question_bank
+
+
+router = APIRouter()
+
+
+@router.post("/bank", response_model=schemas.BankQuestion)
+def add_bank_question(payload: schemas.BankQuestionCreate, db: Session = Depends(get_db)):
+    """Add a curated question to the local question bank."""
+
+    bank_question = question_bank.add(
+        db,
+        payload.question_text.strip(),
+        category_name=payload.category,
+        tags=",".join(payload.tags) if payload.tags else None,
+        source="curated",
+    )
+    db.commit()
+    return schemas.BankQuestion(
+        bank_question_id=bank_question.bank_question_id,
+        question_text=bank_question.question_text,
+        category_id=bank_question.category_id,
+    )
+
+
+@router.get("/bank/search", response_model=List[schemas.BankQuestion])
+def search_bank(
+    q: str,
+    category: Optional[str] = None,
+    limit: int = Query(5, ge=1, le=50),
+    db: Session = Depends(get_db),
+):
+    """Retrieve the best-matching bank questions for free text (skills, role...)."""
+
+    category_row = find_category(db, category) if category else None
+    hits = question_bank.search(
+        db, q, k=limit, category_id=category_row.category_id if category_row else None
+    )
+    return [
+        schemas.BankQuestion(
+            bank_question_id=row["bank_question_id"],
+            question_text=row["question_text"],
+            category_id=row["category_id"],
+            score=round(score, 4),
+        )
+        for row, score in hits
+    ]
+
+
+def _similar(db: Session, text: str, limit: int, exclude_id: Optional[int] = None):
+    matches = question_dedupe.find_similar(db, text, limit=limit, exclude_id=exclude_id)
+    texts = dict(
+        db.query(models.Question.question_id, models.Question.question_text)
+        .filter(models.Question.question_id.in_([qid for qid, _ in matches]))
+        .all()
+    ) if matches else {}
+    return [
+        schemas.SimilarQuestion(question_id=qid, question_text=texts[qid], similarity=round(sim, 4))
+        for qid, sim in matches
+    ]
+
+
+@router.get("/similar", response_model=List[schemas.SimilarQuestion])
+def similar_to_text(text: str, limit: int = Query(10, ge=1, le=100), db: Session = Depends(get_db)):
+    """Canonical questions that are near-duplicates of arbitrary text."""
+
+    return _similar(db, text, limit)
+
+
+@router.get("/{question_id}/similar", response_model=List[schemas.SimilarQuestion])
+def similar_to_question(question_id: int, limit: int = Query(10, ge=1, le=100), db: Session = Depends(get_db)):
+    question = db.query(models.Question).filter_by(question_id=question_id).first()
+    if not question:
+        raise HTTPException(status_code=404, detail="Question not found")
+    return _similar(db, question.question_text, limit, exclude_id=question.question_id)
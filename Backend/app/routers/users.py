@@ -1,10 +1,16 @@
-from typing import List, Optional
+import base64
+from datetime import date
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import Table, and_, or_, select
+from sqlalchemy.orm import Session, selectinload
 
-from .. import models
+from .. import models, schemas
 from ..db import get_db
+from ..services import archive, candidate_search, etags, profile_snapshot
+from ..services.read_routing import get_read_db
+from ..services.skills import get_or_create_skill
 
 router = APIRouter()
 
@@ -34,11 +40,71 @@ def create_user(
     return {"user_id": user.user_id}
 
 
+@router.get("/search", response_model=schemas.CandidateSearchPage)
+def search_candidates(
+    skills: List[str] = Query(default=[]),
+    q: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10000),
+    db: Session = Depends(get_read_db),
+):
+    """Find users having all `skills` whose resume text matches `q`.
+
+    Example: /api/users/search?skills=Python&skills=React&q=kafka
+    """
+
+    hits, has_more = candidate_search.search(db, skills, q, limit=limit, offset=offset)
+    ids = [user_id for user_id, _ in hits]
+
+    users = {
+        row.user_id: row
+        for row in db.query(
+            models.User.user_id, models.User.name, models.User.email, models.User.role, models.User.resume_summary
+        ).filter(models.User.user_id.in_(ids))
+    } if ids else {}
+    skill_map: dict[int, list[str]] = {user_id: [] for user_id in ids}
+    if ids:
+        for user_id, skill_name in (
+            db.query(models.UserSkill.user_id, models.Skill.skill_name)
+            .join(models.Skill, models.Skill.skill_id == models.UserSkill.skill_id)
+            .filter(models.UserSkill.user_id.in_(ids))
+        ):
+            skill_map[user_id].append(skill_name)
+
+    items = [
+        schemas.CandidateSearchItem(
+            user_id=user_id,
+            name=users[user_id].name,
+            email=users[user_id].email,
+            role=users[user_id].role,
+            resume_summary=users[user_id].resume_summary,
+            skills=skill_map[user_id],
+            score=round(score, 4),
+        )
+        for user_id, score in hits
+        if user_id in users
+    ]
+    return schemas.CandidateSearchPage(items=items, offset=offset, limit=limit, has_more=has_more)
+
+
 @router.get("/{user_id}", response_model=dict)
-def get_user(user_id: int, db: Session = Depends(get_db)):
-    user = db.query(models.User).filter_by(user_id=user_id).first()
+def get_user(user_id: int, request: Request, response: Response, db: Session = Depends(get_read_db)):
+    version = db.query(models.User.version).filter_by(user_id=user_id).scalar()
+    if version is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    tag = etags.etag("user", user_id, version)
+    if etags.matches(request, tag):
+        return etags.not_modified(tag)
+
+    user = (
+        db.query(models.User)
+        .options(selectinload(models.User.user_skills).joinedload(models.UserSkill.skill))
+        .filter_by(user_id=user_id)
+        .first()
+    )
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    response.headers.update(etags.validators(etags.etag("user", user_id, user.version)))
 
     skills = [
         {"skill_id": us.skill_id, "skill_name": us.skill.skill_name, "proficiency": us.proficiency}
@@ -75,26 +141,139 @@ def add_skills_to_user(
         raise HTTPException(status_code=400, detail="proficiencies length must match skill_names length")
 
     created = []
+    links: dict[int, models.UserSkill] = {}
     for idx, name in enumerate(skill_names):
-        skill = db.query(models.Skill).filter_by(skill_name=name).first()
-        if not skill:
-            skill = models.Skill(skill_name=name)
-            db.add(skill)
-            db.commit()
-            db.refresh(skill)
+        skill = get_or_create_skill(db, name)
+        if skill is None:
+            continue
 
         proficiency = None
         if proficiencies:
             proficiency = proficiencies[idx]
 
-        link = db.query(models.UserSkill).filter_by(user_id=user_id, skill_id=skill.skill_id).first()
+        # Spelling variants resolve to the same skill: keep one link and one entry
+        link = links.get(skill.skill_id)
+        if link is None:
+            link = db.query(models.UserSkill).filter_by(user_id=user_id, skill_id=skill.skill_id).first()
         if not link:
             link = models.UserSkill(user_id=user_id, skill_id=skill.skill_id, proficiency=proficiency)
             db.add(link)
+            profile_snapshot.invalidate(db, user_id)
         else:
             link.proficiency = proficiency
+        links[skill.skill_id] = link
+        created = [entry for entry in created if entry["skill_id"] != skill.skill_id]
         created.append({"skill_id": skill.skill_id, "skill_name": skill.skill_name, "proficiency": proficiency})
 
     db.commit()
 
     return {"user_id": user_id, "skills": created}
+
+
+# --- Interview history --------------------------------------------------------
+
+
+def _encode_cursor(item: schemas.InterviewHistoryItem) -> str:
+    raw = f"{item.date.isoformat() if item.date else ''}|{item.interview_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple[Optional[date], int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        date_part, _, id_part = raw.partition("|")
+        return (date.fromisoformat(date_part) if date_part else None), int(id_part)
+    except (ValueError, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _history_slice(
+    db: Session,
+    table: Table,
+    user_column: str,
+    role: str,
+    user_id: int,
+    interview_type: Optional[str],
+    after: Optional[tuple[Optional[date], int]],
+    limit: int,
+) -> list[schemas.InterviewHistoryItem]:
+    """One keyset page for a single role from `table`, newest first.
+
+    `table` is the live interviews table or its archive copy. Dated
+    interviews come first ordered by (date, id) descending, then undated
+    ones by id descending. Each phase is a range scan on the history index.
+    """
+
+    c = table.c
+
+    def base():
+        q = select(
+            c.interview_id, c.date, c.time, c.type, c.overall_score, c.candidate_id, c.interviewer_id
+        ).where(c[user_column] == user_id)
+        if interview_type:
+            q = q.where(c.type == interview_type)
+        return q
+
+    rows: list = []
+    after_date, after_id = after if after else (None, None)
+
+    if after is None or after_date is not None:
+        q = base().where(c.date.isnot(None))
+        if after_date is not None:
+            q = q.where(or_(c.date < after_date, and_(c.date == after_date, c.interview_id < after_id)))
+        rows = db.execute(q.order_by(c.date.desc(), c.interview_id.desc()).limit(limit)).all()
+
+    if len(rows) < limit:
+        q = base().where(c.date.is_(None))
+        if after is not None and after_date is None:
+            q = q.where(c.interview_id < after_id)
+        rows += db.execute(q.order_by(c.interview_id.desc()).limit(limit - len(rows))).all()
+
+    return [schemas.InterviewHistoryItem(**r._mapping, role=role) for r in rows]
+
+
+def _history_sort_key(item: schemas.InterviewHistoryItem) -> tuple:
+    # Mirrors the SQL order: dated before undated, then (date, id) descending
+    return (item.date is not None, item.date or date.min, item.interview_id)
+
+
+@router.get("/{user_id}/interviews", response_model=schemas.InterviewHistoryPage)
+def list_user_interviews(
+    user_id: int,
+    role: Literal["candidate", "interviewer", "any"] = "any",
+    interview_type: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+):
+    """Past interviews for a user, archived ones included, newest first, with keyset pagination.
+
+    Pass the returned `next_cursor` back as `cursor` to fetch the next page.
+    """
+
+    if db.get(models.User, user_id) is None:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    after = _decode_cursor(cursor) if cursor else None
+
+    roles = ("candidate", "interviewer") if role == "any" else (role,)
+    items: list[schemas.InterviewHistoryItem] = []
+    # Archived interviews (see services/archive.py) continue the history
+    for table in (models.Interview.__table__, archive.interviews):
+        for slice_role in roles:
+            items += _history_slice(
+                db, table, f"{slice_role}_id", slice_role, user_id, interview_type, after, limit + 1
+            )
+
+    # Self-interviews appear in both role slices; keep the candidate row once
+    seen: set[int] = set()
+    merged = []
+    for item in items:
+        if item.interview_id not in seen:
+            seen.add(item.interview_id)
+            merged.append(item)
+    items = sorted(merged, key=_history_sort_key, reverse=True)
+
+    page = items[:limit]
+    next_cursor = _encode_cursor(page[-1]) if len(items) > limit else None
+    return schemas.InterviewHistoryPage(items=page, next_cursor=next_cursor)
@@ -1,4 +1,4 @@
-from datetime import datetime, date, time as time_type
+from datetime import datetime, date as date_type, time as time_type
 from typing import Optional, List
 
 from pydantic import BaseModel
@@ -24,7 +24,7 @@ class InterviewStartRequest(BaseModel):
     candidate_id: Optional[int] = None
     interviewer_id: Optional[int] = None
     interview_type: Optional[str] = None
-    date: Optional[date] = None
+    date: Optional[date_type] = None
     time: Optional[time_type] = None
     skills: Optional[List[str]] = None
 
@@ -55,6 +55,7 @@ class AuthLoginRequest(BaseModel):
 class AuthLoginResponse(BaseModel):
     access_token: str
     token_type: str
+    expires_in: Optional[int] = None
     user: User
 
 
@@ -74,6 +75,12 @@ class AnswerRequest(BaseModel):
     answer_text: str
 
 
+class AnswerMessage(AnswerRequest):
+    """An answer sent over the interview WebSocket channel."""
+
+    question_id: int
+
+
 class AnswerResponse(BaseModel):
     interview_id: int
     question_id: int
@@ -98,3 +105,118 @@ class InterviewSummaryResponse(BaseModel):
 class SystemMessageRequest(BaseModel):
     message: str
 
+
+
+class ScoreBucket(BaseModel):
+    score: int
+    count: int
+
+
+class ScoreDistributionResponse(BaseModel):
+    dimension: str
+    key: str
+    total: int
+    buckets: List[ScoreBucket]
+
+
+class PercentileRank(BaseModel):
+    dimension: str
+    key: str
+    percentile: float
+    population: int
+
+
+class InterviewPercentileResponse(BaseModel):
+    interview_id: int
+    overall_score: Optional[int]
+    ranks: List[PercentileRank]
+
+
+class TopSkill(BaseModel):
+    skill: str
+    interviews: int
+    average_score: float
+
+
+class InterviewHistoryItem(BaseModel):
+    interview_id: int
+    date: Optional[date_type]
+    time: Optional[time_type]
+    type: Optional[str]
+    overall_score: Optional[int]
+    candidate_id: int
+    interviewer_id: int
+    role: str
+
+
+class InterviewHistoryPage(BaseModel):
+    items: List[InterviewHistoryItem]
+    next_cursor: Optional[str] = None
+
+
+class ScheduledInterview(BaseModel):
+    candidate: UserBase
+    interview_type: Optional[str] = None
+    date: Optional[date_type] = None
+    time: Optional[time_type] = None
+    skills: Optional[List[str]] = None
+
+
+class BulkScheduleRequest(BaseModel):
+    interviewer_id: int
+    interviews: List[ScheduledInterview]
+    create_conversations: bool = True
+
+
+class BulkScheduleItem(BaseModel):
+    index: int
+    status: str  # "scheduled", "scheduled_without_question" (conversation kept) or "failed"
+    candidate_id: Optional[int] = None
+    interview_id: Optional[int] = None
+    question: Optional[Question] = None
+    conversation_url: Optional[str] = None
+    tavus_error: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BulkScheduleResponse(BaseModel):
+    interviewer_id: int
+    scheduled: int
+    failed: int
+    results: List[BulkScheduleItem]
+
+
+class BankQuestionCreate(BaseModel):
+    question_text: str
+    category: Optional[str] = None
+    tags: Optional[List[str]] = None
+
+
+class BankQuestion(BaseModel):
+    bank_question_id: int
+    question_text: str
+    category_id: Optional[int] = None
+    score: Optional[float] = None
+
+
+class SimilarQuestion(BaseModel):
+    question_id: int
+    question_text: str
+    similarity: float
+
+
+class CandidateSearchItem(BaseModel):
+    user_id: int
+    name: Optional[str] = None
+    email: Optional[str] = None
+    role: Optional[str] = None
+    resume_summary: Optional[str] = None
+    skills: List[str]
+    score: float
+
+
+class CandidateSearchPage(BaseModel):
+    items: List[CandidateSearchItem]
+    offset: int
+    limit: int
+    has_more: bool
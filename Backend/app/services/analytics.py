@@ -0,0 +1,122 @@
+from typing import Iterable, Optional
+
+from sqlalchemy import func, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .. import models
+
+
+TYPE = "type"
+SKILL = "skill"
+
+
+def type_key(interview_type: Optional[str]) -> str:
+    return (interview_type or "unspecified").strip().lower()[:100] or "unspecified"
+
+
+def skill_key(skill_name: str) -> str:
+    return skill_name.strip().lower()[:100]
+
+
+def _bump(db: Session, dimension: str, key: str, score: int, delta: int) -> None:
+    table = models.ScoreBucket.__table__
+    c = table.c
+    result = db.execute(
+        update(table)
+        .where(c.dimension == dimension, c.key == key, c.score == score)
+        .values(count=c.count + delta)
+    )
+    if result.rowcount:
+        return
+    if delta < 0:
+        # Nothing recorded for the old score (e.g. it predates analytics).
+        return
+    try:
+        with db.begin_nested():
+            db.add(models.ScoreBucket(dimension=dimension, key=key, score=score, count=delta))
+    except IntegrityError:
+        _bump(db, dimension, key, score, delta)
+
+
+def bucket_keys(interview_type: Optional[str], skill_names: Iterable[str]) -> list[list[str]]:
+    """[dimension, key] pairs an interview with this type and these skills is counted under."""
+
+    skills = sorted({skill_key(name) for name in skill_names if name and name.strip()})
+    return [[TYPE, type_key(interview_type)]] + [[SKILL, key] for key in skills]
+
+
+def record_score_change(
+    db: Session,
+    stats: models.InterviewStats,
+    interview_type: Optional[str],
+    skill_names: Iterable[str],
+    old_score: Optional[int],
+    new_score: Optional[int],
+) -> None:
+    """Move one interview from its old overall-score bucket to the new one.
+
+    Called in the answer transaction whenever overall_score changes, so the
+    histograms always reflect each interview's latest score exactly once.
+    The old score leaves the buckets recorded in `stats.analytics_keys`, not
+    those of the candidate's current skills, which may have changed since;
+    the new score goes under the current ones, which are then recorded.
+    """
+
+    keys = bucket_keys(interview_type, skill_names)
+    # Interviews counted before the keys were recorded: assume they still match
+    counted = stats.analytics_keys if stats.analytics_keys is not None else keys
+    if old_score == new_score and counted == keys:
+        return
+
+    if old_score is not None:
+        for dimension, key in counted:
+            _bump(db, dimension, key, old_score, -1)
+    if new_score is not None:
+        for dimension, key in keys:
+            _bump(db, dimension, key, new_score, 1)
+    stats.analytics_keys = keys if new_score is not None else None
+
+
+def distribution(db: Session, dimension: str, key: str) -> list[tuple[int, int]]:
+    rows = (
+        db.query(models.ScoreBucket.score, models.ScoreBucket.count)
+        .filter_by(dimension=dimension, key=key)
+        .filter(models.ScoreBucket.count > 0)
+        .order_by(models.ScoreBucket.score)
+        .all()
+    )
+    return [(score, count) for score, count in rows]
+
+
+def percentile_rank(db: Session, dimension: str, key: str, score: int) -> tuple[float, int]:
+    """Return (percentile, population) for `score` within one slice.
+
+    Uses the mid-rank convention: everyone below counts fully, ties count half.
+    """
+
+    buckets = distribution(db, dimension, key)
+    total = sum(count for _, count in buckets)
+    if not total:
+        return 0.0, 0
+    below = sum(count for s, count in buckets if s < score)
+    equal = sum(count for s, count in buckets if s == score)
+    return round(100.0 * (below + 0.5 * equal) / total, 1), total
+
+
+def top_skills(db: Session, limit: int = 10, min_interviews: int = 1) -> list[tuple[str, int, float]]:
+    """Skills ranked by mean overall score, as (skill_key, interviews, average)."""
+
+    B = models.ScoreBucket
+    interviews = func.sum(B.count)
+    average = func.sum(B.score * B.count) * 1.0 / interviews
+    rows = (
+        db.query(B.key, interviews, average)
+        .filter(B.dimension == SKILL, B.count > 0)
+        .group_by(B.key)
+        .having(interviews >= min_interviews)
+        .order_by(average.desc(), interviews.desc())
+        .limit(limit)
+        .all()
+    )
+    return [(key, int(n), round(float(avg), 2)) for key, n, avg in rows]
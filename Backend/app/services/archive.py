@@ -0,0 +1,344 @@
+"""Archival of completed interviews.
+
+Interviews that have feedback and are dated more than ARCHIVE_AFTER_DAYS
+ago are moved, together with their stats, questions, responses and
+feedback, into tables of the same shape in the `archive` schema. On SQLite
+that schema is a separate database file ATTACHed to every connection; on
+PostgreSQL it is a schema in the same database. The live tables and their
+indexes then only hold recent interviews.
+
+Moves run in batches of ARCHIVE_BATCH_SIZE interviews, one transaction
+each, from the CLI or a background thread (every ARCHIVE_INTERVAL_SECONDS;
+0 disables it). Rows are copied with INSERT ... SELECT, so compressed text
+moves as stored. Summary and feedback reads fall back to the archive when
+an interview is no longer live, and user history pages include it. Archived interviews are read-only.
+
+CLI usage (from the Backend directory):
+
+    python -m app.services.archive --older-than-days 365 --batch-size 200
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import weakref
+from datetime import date, timedelta
+from typing import Iterator, List, Optional
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Index,
+    MetaData,
+    Table,
+    delete,
+    event,
+    func,
+    insert,
+    select,
+    text,
+    union_all,
+    update,
+)
+from sqlalchemy.engine import Engine, Row
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..core_config import get_settings
+from . import schema_upgrade
+from .metrics import Counter
+
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SCHEMA = "archive"
+
+archived_interviews = Counter("archived_interviews_total", "Interviews moved to the archive tables.")
+
+archive_metadata = MetaData()
+
+
+def _archive_table(table: Table, *extra) -> Table:
+    # Same columns without foreign keys: archived rows outlive their live parents
+    columns = [Column(c.name, c.type, primary_key=c.primary_key, nullable=c.nullable) for c in table.columns]
+    return Table(table.name, archive_metadata, *columns, *extra, schema=ARCHIVE_SCHEMA)
+
+
+interviews = _archive_table(
+    models.Interview.__table__,
+    Column("archived_at", DateTime, nullable=False),
+    # Same history indexes as the live table (GET /api/users/{id}/interviews)
+    *(
+        Index(index.name.replace("ix_interviews_", "ix_archive_interviews_"), *index.columns.keys())
+        for index in models.Interview.__table__.indexes
+        if index.name.endswith("_history")
+    ),
+)
+interview_stats = _archive_table(models.InterviewStats.__table__)
+questions = _archive_table(
+    models.Question.__table__, Index("ix_archive_questions_interview", "interview_id", "question_id")
+)
+responses = _archive_table(models.Response.__table__, Index("ix_archive_responses_question", "question_id", unique=True))
+feedbacks = _archive_table(models.Feedback.__table__, Index("ix_archive_feedbacks_interview", "interview_id", unique=True))
+
+# (live table, archive table, how its rows are selected for a batch), parents first
+_MOVES = [
+    (models.Interview.__table__, interviews, "interview_id"),
+    (models.InterviewStats.__table__, interview_stats, "interview_id"),
+    (models.Question.__table__, questions, "interview_id"),
+    (models.Response.__table__, responses, "question_id"),
+    (models.Feedback.__table__, feedbacks, "interview_id"),
+]
+
+_installed: "weakref.WeakSet[Engine]" = weakref.WeakSet()
+
+
+def archive_path(database: Optional[str]) -> str:
+    """SQLite file holding the archive, next to the main database by default."""
+
+    if settings.ARCHIVE_DATABASE_PATH:
+        return settings.ARCHIVE_DATABASE_PATH
+    if not database or database == ":memory:":
+        return ":memory:"
+    stem, ext = os.path.splitext(database)
+    return f"{stem}_archive{ext or '.db'}"
+
+
+def install(engine: Engine, create: bool = True) -> None:
+    """Make the archive schema available on `engine` (idempotent).
+
+    `create` creates the PostgreSQL schema and tables; a replica receives
+    them by replication instead. An attached SQLite file always gets its
+    tables, since no other process creates them.
+    """
+
+    if engine in _installed:
+        return
+    _installed.add(engine)
+    dialect = engine.dialect.name
+
+    if dialect == "sqlite":
+        path = archive_path(engine.url.database)
+
+        @event.listens_for(engine, "connect")
+        def _attach(dbapi_connection, connection_record) -> None:
+            dbapi_connection.execute(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (path,))
+
+        # Connections pooled before now were opened without the archive attached
+        engine.dispose()
+        archive_metadata.create_all(bind=engine)
+        schema_upgrade.upgrade(engine, archive_metadata)
+    elif create:
+        if dialect == "postgresql":
+            with engine.begin() as conn:
+                conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+        archive_metadata.create_all(bind=engine)
+        schema_upgrade.upgrade(engine, archive_metadata)
+
+
+# --- Moving ---------------------------------------------------------------------
+
+
+def _candidates(db: Session, cutoff: date, limit: int) -> List[int]:
+    """Oldest ids of completed interviews dated before `cutoff`."""
+
+    I, Q, R, F = models.Interview, models.Question, models.Response, models.Feedback
+    # SQLite hands out max(id) + 1 again once the newest row is gone, which would
+    # collide with the archived copy; interviews owning a table's newest row wait
+    newest = union_all(
+        select(func.max(I.interview_id)),
+        select(Q.interview_id).where(Q.question_id == select(func.max(Q.question_id)).scalar_subquery()),
+        select(Q.interview_id)
+        .join(R, R.question_id == Q.question_id)
+        .where(R.response_id == select(func.max(R.response_id)).scalar_subquery()),
+        select(F.interview_id).where(F.feedback_id == select(func.max(F.feedback_id)).scalar_subquery()),
+    )
+    held = {interview_id for (interview_id,) in db.execute(newest) if interview_id is not None}
+
+    stmt = (
+        select(I.interview_id)
+        .join(F, F.interview_id == I.interview_id)
+        .where(I.date < cutoff)
+        .order_by(I.interview_id)
+        .limit(limit + len(held))
+    )
+    return [interview_id for interview_id in db.scalars(stmt) if interview_id not in held][:limit]
+
+
+def _retire_canonical_questions(db: Session, ids: List[int]) -> None:
+    """Keep the near-duplicate index pointing at live questions.
+
+    A canonical question that is archived hands its LSH bands to its oldest
+    live duplicate, which becomes canonical for the others; bands of
+    archived canonicals without live duplicates are dropped.
+    """
+
+    Q, B = models.Question.__table__.c, models.QuestionBand.__table__
+    archived_questions = select(Q.question_id).where(Q.interview_id.in_(ids))
+    canonical = list(db.scalars(select(B.c.question_id).distinct().where(B.c.question_id.in_(archived_questions))))
+    if not canonical:
+        return
+
+    successors = db.execute(
+        select(Q.canonical_question_id, func.min(Q.question_id))
+        .where(Q.canonical_question_id.in_(canonical), Q.interview_id.not_in(ids))
+        .group_by(Q.canonical_question_id)
+    ).all()
+    question_table = models.Question.__table__
+    for old, new in successors:
+        db.execute(
+            update(question_table)
+            .where(Q.canonical_question_id == old, Q.interview_id.not_in(ids), Q.question_id != new)
+            .values(canonical_question_id=new)
+        )
+        db.execute(update(question_table).where(Q.question_id == new).values(canonical_question_id=None))
+        db.execute(update(B).where(B.c.question_id == old).values(question_id=new))
+    db.execute(delete(B).where(B.c.question_id.in_(archived_questions)))
+
+
+def archive_batch(db: Session, cutoff: date, batch_size: int) -> int:
+    """Move up to `batch_size` completed interviews dated before `cutoff`. Commits.
+
+    Returns the number of interviews moved.
+    """
+
+    ids = _candidates(db, cutoff, batch_size)
+    if not ids:
+        return 0
+
+    Q = models.Question.__table__.c
+    archived_questions = select(Q.question_id).where(Q.interview_id.in_(ids))
+    _retire_canonical_questions(db, ids)
+
+    for live, archived, key in _MOVES:
+        owned = live.c[key].in_(archived_questions if key == "question_id" else ids)
+        names = [c.name for c in live.columns]
+        source = select(*live.columns).where(owned)
+        if archived is interviews:
+            names.append("archived_at")
+            source = source.add_columns(func.current_timestamp())
+        db.execute(insert(archived).from_select(names, source))
+
+    # Children first, so no live row ever points at a deleted parent
+    for live, _archived, key in reversed(_MOVES):
+        owned = live.c[key].in_(archived_questions if key == "question_id" else ids)
+        db.execute(delete(live).where(owned))
+
+    db.commit()
+    archived_interviews.inc(len(ids))
+    return len(ids)
+
+
+def run(
+    older_than_days: Optional[int] = None, batch_size: Optional[int] = None, max_batches: Optional[int] = None
+) -> Iterator[int]:
+    """Archive in batches until nothing qualifies; yields the size of each batch."""
+
+    from ..db import SessionLocal
+
+    cutoff = date.today() - timedelta(days=older_than_days or settings.ARCHIVE_AFTER_DAYS)
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        with SessionLocal() as db:
+            moved = archive_batch(db, cutoff, batch_size)
+        if not moved:
+            return
+        batches += 1
+        yield moved
+
+
+class Archiver:
+    """Background thread running `run()` every ARCHIVE_INTERVAL_SECONDS."""
+
+    def __init__(self) -> None:
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if settings.ARCHIVE_INTERVAL_SECONDS <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="interview-archiver", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=30)
+            self._thread = None
+
+    def _loop(self) -> None:
+        while not self._stop.wait(settings.ARCHIVE_INTERVAL_SECONDS):
+            try:
+                moved = 0
+                for count in run():
+                    moved += count
+                    if self._stop.is_set():
+                        break
+                if moved:
+                    logger.info("Archived %s interviews", moved)
+            except Exception:
+                logger.exception("Interview archival run failed")
+
+
+archiver = Archiver()
+
+
+# --- Reading --------------------------------------------------------------------
+
+
+def find_interview(db: Session, interview_id: int) -> Optional[Row]:
+    return db.execute(
+        select(interviews.c.interview_id, interviews.c.version, interviews.c.overall_score, interviews.c.archived_at)
+        .where(interviews.c.interview_id == interview_id)
+    ).first()
+
+
+def transcript(db: Session, interview_id: int) -> List[Row]:
+    """(question, answer, relevance_score, confidence_level) rows of an archived interview."""
+
+    return db.execute(
+        select(
+            questions.c.question_text.label("question"),
+            responses.c.answer_text.label("answer"),
+            responses.c.relevance_score,
+            responses.c.confidence_level,
+        )
+        .outerjoin(responses, responses.c.question_id == questions.c.question_id)
+        .where(questions.c.interview_id == interview_id)
+        .order_by(questions.c.question_id)
+    ).all()
+
+
+def find_feedback(db: Session, interview_id: int) -> Optional[Row]:
+    return db.execute(select(feedbacks).where(feedbacks.c.interview_id == interview_id)).first()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Move completed interviews older than a cutoff to the archive.")
+    parser.add_argument("--older-than-days", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--max-batches", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    from ..db import Base, engine
+
+    Base.metadata.create_all(bind=engine)
+    schema_upgrade.upgrade(engine, Base.metadata)
+    install(engine)
+    total = 0
+    for moved in run(args.older_than_days, args.batch_size, args.max_batches):
+        total += moved
+        print(json.dumps({"event": "batch", "archived": moved, "total": total}), flush=True)
+    print(json.dumps({"event": "done", "total": total}))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
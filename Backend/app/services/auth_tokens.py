@@ -0,0 +1,185 @@
+"""HMAC-signed access tokens and the principal resolved from them.
+
+A token is "v1.<payload>.<signature>": the payload is base64url JSON with
+the user id (`sub`), issue and expiry times, signed with HMAC-SHA256 under
+AUTH_TOKEN_SECRET. Verifying it needs no DB access. The caller's role is
+needed for authorization checks, so principals (id, role) are kept in a
+small TTL cache and only a miss reads the users table.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, NamedTuple, Optional, Tuple
+
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from starlette.concurrency import run_in_threadpool
+
+from .. import models
+from ..core_config import get_settings
+from ..db import SessionLocal
+from .metrics import record_cache
+
+
+settings = get_settings()
+
+TOKEN_VERSION = "v1"
+
+DEV_TOKEN_SECRET = "dev-insecure-token-secret"
+
+# Anyone can sign tokens with the built-in secret, so refuse to run with it
+if not settings.AUTH_TOKEN_SECRET or (settings.ENV != "development" and settings.AUTH_TOKEN_SECRET == DEV_TOKEN_SECRET):
+    raise RuntimeError(f"AUTH_TOKEN_SECRET must be set to a private value when ENV={settings.ENV}")
+
+
+class InvalidToken(ValueError):
+    """Malformed, tampered with or expired token."""
+
+
+class Principal(NamedTuple):
+    user_id: int
+    role: Optional[str]
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _sign(message: str) -> str:
+    digest = hmac.new(settings.AUTH_TOKEN_SECRET.encode("utf-8"), message.encode("ascii"), hashlib.sha256).digest()
+    return _b64encode(digest)
+
+
+def issue_token(user_id: int, ttl_seconds: Optional[int] = None) -> Tuple[str, int]:
+    """Signed token for `user_id` and its lifetime in seconds."""
+
+    ttl = ttl_seconds or settings.AUTH_TOKEN_TTL_SECONDS
+    now = int(time.time())
+    claims = {"sub": user_id, "iat": now, "exp": now + ttl}
+    payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+    message = f"{TOKEN_VERSION}.{payload}"
+    return f"{message}.{_sign(message)}", ttl
+
+
+def verify_token(token: str) -> int:
+    """User id of a valid token; raises InvalidToken otherwise."""
+
+    version, _, rest = (token or "").partition(".")
+    payload, _, signature = rest.partition(".")
+    if version != TOKEN_VERSION or not payload or not signature:
+        raise InvalidToken("Malformed token")
+    if not hmac.compare_digest(signature, _sign(f"{version}.{payload}")):
+        raise InvalidToken("Bad token signature")
+    try:
+        claims = json.loads(_b64decode(payload))
+        user_id, expires = int(claims["sub"]), int(claims["exp"])
+    except (ValueError, KeyError, TypeError):
+        raise InvalidToken("Malformed token payload") from None
+    if expires <= time.time():
+        raise InvalidToken("Token expired")
+    return user_id
+
+
+class PrincipalCache:
+    """LRU of user principals with a time-to-live per entry."""
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_size: Optional[int] = None) -> None:
+        self.ttl = ttl_seconds if ttl_seconds is not None else settings.PRINCIPAL_CACHE_TTL_SECONDS
+        self.max_size = max_size or settings.PRINCIPAL_CACHE_SIZE
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[int, Tuple[float, Principal]]" = OrderedDict()
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return entry[1]
+
+    def put(self, principal: Principal) -> None:
+        with self._lock:
+            self._entries[principal.user_id] = (time.monotonic() + self.ttl, principal)
+            self._entries.move_to_end(principal.user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+
+principal_cache = PrincipalCache()
+
+
+def _load_principal(user_id: int) -> Optional[Principal]:
+    with SessionLocal() as db:
+        row = db.query(models.User.user_id, models.User.role).filter_by(user_id=user_id).first()
+    return Principal(row.user_id, row.role) if row else None
+
+
+async def resolve_principal(token: str) -> Principal:
+    """Principal for a bearer token: signature check, then the TTL cache.
+
+    Only a cache miss leaves the event loop (for the users lookup).
+    """
+
+    user_id = verify_token(token)
+    principal = principal_cache.get(user_id)
+    record_cache("principal", principal is not None)
+    if principal is None:
+        principal = await run_in_threadpool(_load_principal, user_id)
+        if principal is None:
+            raise InvalidToken("Unknown user")
+        principal_cache.put(principal)
+    return principal
+
+
+_bearer = HTTPBearer(auto_error=False)
+
+
+async def optional_principal(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(_bearer),
+) -> Optional[Principal]:
+    """The caller if a valid bearer token was sent, else None."""
+
+    if credentials is None:
+        return None
+    try:
+        return await resolve_principal(credentials.credentials)
+    except InvalidToken:
+        return None
+
+
+async def require_principal(credentials: Optional[HTTPAuthorizationCredentials] = Depends(_bearer)) -> Principal:
+    """FastAPI dependency: the authenticated caller, or 401."""
+
+    if credentials is None:
+        raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+    try:
+        return await resolve_principal(credentials.credentials)
+    except InvalidToken as e:
+        raise HTTPException(status_code=401, detail=str(e), headers={"WWW-Authenticate": "Bearer"}) from None
+
+
+def require_role(*roles: str) -> Callable[..., Principal]:
+    """Dependency factory: the caller must have one of `roles`, else 403."""
+
+    async def dependency(principal: Principal = Depends(require_principal)) -> Principal:
+        if principal.role not in roles:
+            raise HTTPException(status_code=403, detail="Not allowed for this role")
+        return principal
+
+    return dependency
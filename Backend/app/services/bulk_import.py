@@ -0,0 +1,246 @@
+"""Streaming bulk import of candidate profiles (CSV or JSONL).
+
+Records are read lazily, upserted as `User` rows one batch at a time and
+enriched through `summarize_candidate_profile` on a bounded thread pool, so
+memory use depends on the batch size rather than the file size. Each stored
+row also gets its profile snapshot in the batch transaction; interviewer
+contexts are not pre-rendered (one LLM call per type and candidate) and are
+filled in by the first /interview/start instead.
+
+CLI usage (from the Backend directory):
+
+    python -m app.services.bulk_import candidates.jsonl --workers 8
+"""
+
+import argparse
+import csv
+import json
+import logging
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from pydantic import ValidationError
+
+from .. import models, schemas
+from ..core_config import get_settings
+from ..db import SessionLocal
+from . import profile_snapshot, schema_upgrade
+from .gemini_service import gemini_service
+from .skills import attach_skills
+
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+LIST_FIELDS = ("tech_stack", "work_experiences", "projects", "companies_worked")
+
+# Input is decoded with errors="surrogateescape": bytes that are not UTF-8
+# become lone surrogates, so one bad row is rejected instead of the stream
+_UNDECODABLE_RE = re.compile("[\udc80-\udcff]")
+
+# (row number, parsed record or None, error message or None)
+ParsedRow = Tuple[int, Optional[schemas.CandidateProfileInput], Optional[str]]
+
+
+def detect_format(filename: Optional[str]) -> str:
+    name = (filename or "").lower()
+    return "csv" if name.endswith(".csv") else "jsonl"
+
+
+def _csv_record(row: Dict[str, Any]) -> Dict[str, Any]:
+    record: Dict[str, Any] = {}
+    for key, value in row.items():
+        if key is None:
+            continue
+        value = (value or "").strip()
+        if not value:
+            continue
+        if key in LIST_FIELDS:
+            record[key] = [part.strip() for part in value.split(";") if part.strip()]
+        else:
+            record[key] = value
+    return record
+
+
+def parse_records(lines: Iterable[str], fmt: str) -> Iterator[ParsedRow]:
+    """Yield one parsed row at a time; bad rows carry an error instead of raising.
+
+    Rows with bytes that are not UTF-8 are rejected one by one when `lines`
+    was decoded with errors="surrogateescape". Input that cannot be read at
+    all (strict decoding errors, CSV the reader gives up on) ends the file
+    with an error for the row it was found in.
+    """
+
+    if fmt == "csv":
+        # Row 1 is the header, so data rows start at 2 like in a spreadsheet
+        first = 2
+        source: Iterator[Tuple[int, Any]] = enumerate(csv.DictReader(lines), start=first)
+    else:
+        first = 1
+        source = enumerate(lines, start=first)
+
+    row_number = first - 1
+    while True:
+        try:
+            row_number, raw = next(source)
+        except StopIteration:
+            return
+        except (UnicodeDecodeError, csv.Error) as e:
+            yield row_number + 1, None, f"Unreadable input, import stopped: {e}"
+            return
+        try:
+            if fmt == "csv":
+                if any(_UNDECODABLE_RE.search(value or "") for value in raw.values() if isinstance(value, str)):
+                    yield row_number, None, "Invalid UTF-8"
+                    continue
+                data = _csv_record(raw)
+            else:
+                if _UNDECODABLE_RE.search(raw):
+                    yield row_number, None, "Invalid UTF-8"
+                    continue
+                if not raw.strip():
+                    continue
+                data = json.loads(raw)
+            yield row_number, schemas.CandidateProfileInput.model_validate(data), None
+        except json.JSONDecodeError as e:
+            yield row_number, None, f"Invalid JSON: {e.msg}"
+        except ValidationError as e:
+            fields = ", ".join(".".join(str(p) for p in err["loc"]) or "record" for err in e.errors())
+            yield row_number, None, f"Invalid record ({fields})"
+
+
+def _upsert_users(db, records: list[schemas.CandidateProfileInput]) -> Dict[str, int]:
+    """Find or create users for a batch by email with a single lookup query."""
+
+    emails = {r.email for r in records}
+    existing = db.query(models.User).filter(models.User.email.in_(emails)).all()
+    by_email = {u.email: u for u in existing}
+    for record in records:
+        if record.email not in by_email:
+            user = models.User(name=record.name, email=record.email, role="candidate")
+            db.add(user)
+            by_email[record.email] = user
+    db.flush()
+    return {email: user.user_id for email, user in by_email.items()}
+
+
+def _enrich(record: schemas.CandidateProfileInput) -> Dict[str, Any]:
+    return gemini_service.summarize_candidate_profile(record.model_dump())
+
+
+def run_import(
+    lines: Iterable[str],
+    fmt: str = "jsonl",
+    *,
+    batch_size: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Import candidates and yield progress events as plain dicts.
+
+    Events: {"event": "row", ...} per imported record, {"event": "error", ...}
+    per rejected record, {"event": "progress", ...} after each batch and a final
+    {"event": "done", ...}.
+    """
+
+    batch_size = batch_size or settings.BULK_IMPORT_BATCH_SIZE
+    workers = workers or settings.BULK_IMPORT_WORKERS
+    processed = succeeded = failed = 0
+
+    rows = parse_records(lines, fmt)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bulk-import") as executor:
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+
+            valid: list[Tuple[int, schemas.CandidateProfileInput]] = []
+            for row_number, record, error in batch:
+                if record is None:
+                    failed += 1
+                    yield {"event": "error", "row": row_number, "error": error}
+                else:
+                    valid.append((row_number, record))
+
+            if valid:
+                with SessionLocal() as db:
+                    user_ids = _upsert_users(db, [record for _, record in valid])
+                    db.commit()
+
+                futures = {executor.submit(_enrich, record): (row_number, record) for row_number, record in valid}
+                enriched: list[Tuple[int, schemas.CandidateProfileInput, Dict[str, Any]]] = []
+                for future in as_completed(futures):
+                    row_number, record = futures[future]
+                    try:
+                        enriched.append((row_number, record, future.result()))
+                    except Exception as e:
+                        failed += 1
+                        yield {"event": "error", "row": row_number, "email": record.email, "error": str(e)}
+
+                with SessionLocal() as db:
+                    for row_number, record, result in sorted(enriched, key=lambda item: item[0]):
+                        user_id = user_ids[record.email]
+                        try:
+                            with db.begin_nested():
+                                user = db.get(models.User, user_id)
+                                user.resume_summary = result.get("resume_summary") or ""
+                                if record.resume_text:
+                                    user.resume_raw = record.resume_text
+                                skill_names = attach_skills(db, user_id, result.get("skills") or [])
+                                profile_snapshot.sync_snapshot(db, user)
+                        except Exception as e:
+                            logger.exception("Bulk import failed to store row %s", row_number)
+                            failed += 1
+                            yield {"event": "error", "row": row_number, "email": record.email, "error": str(e)}
+                            continue
+                        succeeded += 1
+                        yield {
+                            "event": "row",
+                            "row": row_number,
+                            "user_id": user_id,
+                            "email": record.email,
+                            "skills": skill_names,
+                        }
+                    db.commit()
+
+            processed += len(batch)
+            yield {"event": "progress", "processed": processed, "succeeded": succeeded, "failed": failed}
+
+    yield {"event": "done", "processed": processed, "succeeded": succeeded, "failed": failed}
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk import candidate profiles from CSV or JSONL.")
+    parser.add_argument("path", help="CSV or JSONL file, or '-' for JSONL on stdin")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default=None)
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+    if (args.batch_size is not None and args.batch_size < 1) or (args.workers is not None and args.workers < 1):
+        parser.error("--batch-size and --workers must be at least 1")
+
+    from ..db import Base, engine
+
+    Base.metadata.create_all(bind=engine)
+    schema_upgrade.upgrade(engine, Base.metadata)
+
+    fmt = args.format or detect_format(args.path)
+    failed = 0
+    if args.path == "-":
+        sys.stdin.reconfigure(errors="surrogateescape")
+        stream = sys.stdin
+    else:
+        stream = open(args.path, encoding="utf-8", errors="surrogateescape", newline="")
+    with stream:
+        for event in run_import(stream, fmt, batch_size=args.batch_size, workers=args.workers):
+            print(json.dumps(event), flush=True)
+            if event["event"] == "done":
+                failed = event["failed"]
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,362 @@
+import argparse
+import heapq
+import re
+import sys
+import weakref
+from itertools import islice
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event, func, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from .. import models
+from . import schema_upgrade
+from .skills import normalize_key, skill_index
+
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+# Probing a posting list with IN (...) is done in chunks to stay under
+# SQLite's bound-parameter limit.
+_CHUNK = 900
+# Probe survivors one chunk at a time only while they are at least this many
+# times rarer than the next posting list; otherwise read the list in one go.
+_PROBE_RATIO = 8
+
+# resume_raw is stored compressed (services/text_codec.py), so the index reads
+# it through a view over text_decompress(), a function only app connections
+# have. The index is therefore kept in sync by ORM events below rather than
+# by triggers, which would make plain sqlite3 writes to users fail.
+_SQLITE_FTS_DDL = [
+    """
+    CREATE VIEW IF NOT EXISTS user_search_source AS
+    SELECT user_id, resume_summary, text_decompress(resume_raw) AS resume_raw FROM users
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS user_search_fts USING fts5(
+        resume_summary, resume_raw, content='user_search_source', content_rowid='user_id'
+    )
+    """,
+]
+# Triggers used by earlier versions of the index; dropped on install
+_SQLITE_FTS_TRIGGERS = ("users_fts_ai", "users_fts_ad", "users_fts_au")
+_SQLITE_FTS_ADD = text(
+    "INSERT INTO user_search_fts(rowid, resume_summary, resume_raw) VALUES (:user_id, :summary, :raw)"
+)
+_SQLITE_FTS_REMOVE = text(
+    "INSERT INTO user_search_fts(user_search_fts, rowid, resume_summary, resume_raw) "
+    "VALUES ('delete', :user_id, :summary, :raw)"
+)
+_SQLITE_FTS_REBUILD = text("INSERT INTO user_search_fts(user_search_fts) VALUES ('rebuild')")
+
+_fts_engines: "weakref.WeakSet[Engine]" = weakref.WeakSet()
+
+_PG_TSVECTOR = "to_tsvector('english', coalesce(resume_summary, '') || ' ' || coalesce(resume_raw, ''))"
+
+
+def install(engine: Engine) -> None:
+    """Create the full-text index for the current backend (idempotent).
+
+    SQLite gets an external-content FTS5 table kept in sync by the app on
+    ORM inserts, updates and deletes of users; rows changed otherwise are
+    picked up by `rebuild`. PostgreSQL (where resume_raw stays
+    plain TEXT) gets a GIN expression index over a tsvector.
+    """
+
+    dialect = engine.dialect.name
+    with engine.begin() as conn:
+        if dialect == "sqlite":
+            existing = conn.execute(
+                text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'user_search_fts'")
+            ).scalar()
+            stale = existing is not None and "user_search_source" not in existing
+            if stale:
+                # Built over users directly, before resume_raw was compressed
+                conn.execute(text("DROP TABLE user_search_fts"))
+            for trigger in _SQLITE_FTS_TRIGGERS:
+                conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+            for ddl in _SQLITE_FTS_DDL:
+                conn.execute(text(ddl))
+            if existing is None or stale:
+                conn.execute(_SQLITE_FTS_REBUILD)
+            _fts_engines.add(engine)
+        elif dialect == "postgresql":
+            conn.execute(
+                text(f"CREATE INDEX IF NOT EXISTS ix_users_resume_fts ON users USING GIN ({_PG_TSVECTOR})")
+            )
+
+
+def rebuild(engine: Engine) -> None:
+    """Re-index every user (SQLite only).
+
+    The app keeps the index in sync for ORM writes to users: unit-of-work
+    flushes and session.execute() of insert/update/delete on models.User
+    (see below). Anything else leaves it stale until this runs: Core
+    statements on a Connection, raw SQL and other tools. Use the CLI:
+    `python -m app.services.candidate_search rebuild`.
+    """
+
+    if engine.dialect.name == "sqlite":
+        with engine.begin() as conn:
+            conn.execute(_SQLITE_FTS_REBUILD)
+
+
+# --- Index maintenance (SQLite) ---------------------------------------------------
+
+
+def _stored_text(connection: Connection, user_id: int) -> Tuple[Optional[str], Optional[str]]:
+    users = models.User.__table__
+    row = connection.execute(
+        select(users.c.resume_summary, users.c.resume_raw).where(users.c.user_id == user_id)
+    ).first()
+    return (row[0], row[1]) if row else (None, None)
+
+
+def _new_value(target: models.User, attribute: str, old: Optional[str]) -> Optional[str]:
+    history = inspect(target).attrs[attribute].history
+    return history.added[0] if history.added else old
+
+
+@event.listens_for(models.User, "after_insert")
+def _index_new_user(mapper, connection: Connection, target: models.User) -> None:
+    if connection.engine in _fts_engines:
+        connection.execute(
+            _SQLITE_FTS_ADD,
+            {"user_id": target.user_id, "summary": target.resume_summary, "raw": target.__dict__.get("resume_raw")},
+        )
+
+
+@event.listens_for(models.User, "before_update")
+def _reindex_user(mapper, connection: Connection, target: models.User) -> None:
+    if connection.engine not in _fts_engines:
+        return
+    state = inspect(target)
+    if not (state.attrs.resume_summary.history.has_changes() or state.attrs.resume_raw.history.has_changes()):
+        return
+    # The 'delete' command needs exactly the indexed values, i.e. what is stored now
+    summary, raw = _stored_text(connection, target.user_id)
+    connection.execute(_SQLITE_FTS_REMOVE, {"user_id": target.user_id, "summary": summary, "raw": raw})
+    connection.execute(
+        _SQLITE_FTS_ADD,
+        {
+            "user_id": target.user_id,
+            "summary": _new_value(target, "resume_summary", summary),
+            "raw": _new_value(target, "resume_raw", raw),
+        },
+    )
+
+
+@event.listens_for(models.User, "before_delete")
+def _unindex_user(mapper, connection: Connection, target: models.User) -> None:
+    if connection.engine in _fts_engines:
+        summary, raw = _stored_text(connection, target.user_id)
+        connection.execute(_SQLITE_FTS_REMOVE, {"user_id": target.user_id, "summary": summary, "raw": raw})
+
+
+_INDEXED_COLUMNS = {"resume_summary", "resume_raw"}
+
+
+def _changes_indexed_text(orm_execute_state) -> bool:
+    if orm_execute_state.is_insert or orm_execute_state.is_delete:
+        return True
+    # SET columns of an UPDATE, given by .values() or per-row parameters
+    keys = set(orm_execute_state.statement.compile().params)
+    parameters = orm_execute_state.parameters
+    for row in parameters if isinstance(parameters, list) else [parameters or {}]:
+        keys.update(row)
+    return bool(keys & _INDEXED_COLUMNS)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _reindex_after_bulk_write(orm_execute_state):
+    """Bulk insert/update/delete of users bypasses the mapper events above.
+
+    Which rows they touch is only known to the database, so the index is
+    rebuilt in the same transaction. This is O(users), but bulk writes to
+    users are rare; per-row version bumps (etags) do not touch resume text
+    and are skipped.
+    """
+
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return None
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or mapper.class_ is not models.User or not _changes_indexed_text(orm_execute_state):
+        return None
+    connection = orm_execute_state.session.connection(bind_arguments={"mapper": mapper})
+    if connection.engine not in _fts_engines:
+        return None
+    result = orm_execute_state.invoke_statement()
+    connection.execute(_SQLITE_FTS_REBUILD)
+    return result
+
+
+def resolve_skill_ids(db: Session, skill_names: Iterable[str]) -> Optional[List[int]]:
+    """Map names to canonical skill ids; None if any requested skill is unknown."""
+
+    ids: List[int] = []
+    for name in skill_names:
+        if not normalize_key(name):
+            continue
+        skill = skill_index.resolve(db, name)
+        if skill is None:
+            return None
+        if skill.skill_id not in ids:
+            ids.append(skill.skill_id)
+    return ids
+
+
+def users_with_all_skills(db: Session, skill_ids: Sequence[int]) -> set[int]:
+    """Intersect skill posting lists, starting from the rarest skill.
+
+    The rarest list is loaded once; every further skill only probes the
+    surviving candidates through the (skill_id, user_id) index, so the cost
+    tracks the smallest posting list rather than the most popular skill.
+    """
+
+    US = models.UserSkill
+    counts = dict(
+        db.query(US.skill_id, func.count(US.user_id))
+        .filter(US.skill_id.in_(set(skill_ids)))
+        .group_by(US.skill_id)
+        .all()
+    )
+    ordered = sorted(set(skill_ids), key=lambda sid: counts.get(sid, 0))
+    if not ordered or counts.get(ordered[0], 0) == 0:
+        return set()
+
+    candidates = set(db.scalars(select(US.user_id).where(US.skill_id == ordered[0])))
+    for skill_id in ordered[1:]:
+        if not candidates:
+            break
+        if len(candidates) * _PROBE_RATIO >= counts[skill_id]:
+            # Survivors are not much rarer than this list: one sequential index
+            # range read beats many probe queries
+            candidates &= set(db.scalars(select(US.user_id).where(US.skill_id == skill_id)))
+            continue
+        survivors: set[int] = set()
+        pool = sorted(candidates)
+        for i in range(0, len(pool), _CHUNK):
+            chunk = pool[i : i + _CHUNK]
+            survivors.update(
+                db.scalars(select(US.user_id).where(US.skill_id == skill_id, US.user_id.in_(chunk)))
+            )
+        candidates = survivors
+    return candidates
+
+
+def _fts_matches(
+    db: Session, query: str, limit: int, within: Optional[set[int]] = None
+) -> List[Tuple[int, float]]:
+    """Top (user_id, score) resume-text matches, best first.
+
+    `within` restricts results to users that already passed the skill filter.
+    """
+
+    words = _WORD_RE.findall(query)
+    if not words:
+        return []
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "sqlite":
+        match = " ".join('"' + w.replace('"', "") + '"' for w in words)
+        if within is None:
+            rows = db.execute(
+                text(
+                    "SELECT rowid, bm25(user_search_fts) AS rank FROM user_search_fts "
+                    "WHERE user_search_fts MATCH :match ORDER BY rank LIMIT :limit"
+                ),
+                {"match": match, "limit": limit},
+            )
+            return [(user_id, -float(rank)) for user_id, rank in rows]
+        # A rowid constraint would make FTS5 re-run the MATCH per id, so stream
+        # the unordered matches once and keep the best ones that qualify.
+        rows = db.execute(
+            text("SELECT rowid, bm25(user_search_fts) FROM user_search_fts WHERE user_search_fts MATCH :match"),
+            {"match": match},
+        )
+        best = heapq.nsmallest(limit, ((rank, uid) for uid, rank in rows if uid in within))
+        return [(user_id, -float(rank)) for rank, user_id in best]
+
+    if dialect == "postgresql":
+        id_filter = ""
+        params: dict = {"q": " ".join(words), "limit": limit}
+        if within is not None:
+            id_filter = " AND user_id = ANY(:ids)"
+            params["ids"] = list(within)
+        rows = db.execute(
+            text(
+                f"SELECT user_id, ts_rank({_PG_TSVECTOR}, plainto_tsquery('english', :q)) AS rank "
+                f"FROM users WHERE {_PG_TSVECTOR} @@ plainto_tsquery('english', :q)"
+                + id_filter + " ORDER BY rank DESC LIMIT :limit"
+            ),
+            params,
+        )
+        return [(user_id, float(rank)) for user_id, rank in rows]
+
+    # resume_raw is stored compressed on other backends, so only the summary is matched
+    q = db.query(models.User.user_id)
+    for word in words:
+        q = q.filter(models.User.resume_summary.ilike(f"%{word}%"))
+    matches = (user_id for (user_id,) in q.order_by(models.User.user_id.desc()))
+    if within is not None:
+        matches = (user_id for user_id in matches if user_id in within)
+    return [(user_id, 0.0) for user_id in islice(matches, limit)]
+
+
+def search(
+    db: Session,
+    skills: Sequence[str] = (),
+    query: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> Tuple[List[Tuple[int, float]], bool]:
+    """Ranked candidate ids for a skills + resume-text search.
+
+    Returns ([(user_id, score)], has_more). Skill filters are exact (all must
+    match); text relevance orders the results. Without text, newest users
+    come first.
+    """
+
+    wanted = offset + limit + 1
+    candidates: Optional[set[int]] = None
+    if skills:
+        skill_ids = resolve_skill_ids(db, skills)
+        if skill_ids is None:
+            return [], False
+        if skill_ids:
+            candidates = users_with_all_skills(db, skill_ids)
+            if not candidates:
+                return [], False
+
+    hits: List[Tuple[int, float]] = []
+    if query and query.strip():
+        hits = _fts_matches(db, query, wanted, within=candidates)
+    elif candidates is not None:
+        hits = [(uid, 0.0) for uid in sorted(candidates, reverse=True)[:wanted]]
+    else:
+        hits = [
+            (uid, 0.0)
+            for (uid,) in db.query(models.User.user_id).order_by(models.User.user_id.desc()).limit(wanted)
+        ]
+
+    page = hits[offset : offset + limit]
+    return page, len(hits) > offset + limit
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Maintain the candidate full-text index.")
+    parser.add_argument("command", choices=["rebuild"], help="re-index all users (after edits made outside the app)")
+    parser.parse_args(argv)
+
+    from ..db import Base, engine
+
+    Base.metadata.create_all(bind=engine)
+    schema_upgrade.upgrade(engine, Base.metadata)
+    install(engine)
+    rebuild(engine)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""Resource versions and conditional GET helpers.
+
+Users, interviews and feedback carry a `version` column that is bumped in
+the same flush as any change to them or to the rows their read endpoints
+render (a user's skills; an interview's questions and responses). Read
+endpoints fetch just that column, derive an ETag from it and answer a
+matching If-None-Match with 304 before loading anything else.
+"""
+
+from itertools import chain
+from typing import Dict, Optional, Set, Type
+
+from fastapi import Request
+from fastapi.responses import Response
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
+
+from .. import models
+
+
+# Clients may keep a copy but must revalidate it; the data is per candidate
+CACHE_CONTROL = "private, no-cache"
+
+
+def etag(kind: str, key, version: Optional[int]) -> str:
+    return f'"{kind}-{key}-v{version or 0}"'
+
+
+def validators(tag: str) -> Dict[str, str]:
+    return {"ETag": tag, "Cache-Control": CACHE_CONTROL}
+
+
+def matches(request: Request, tag: str) -> bool:
+    """True if the request's If-None-Match covers `tag` (weak comparison)."""
+
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {item.strip().removeprefix("W/") for item in header.split(",")}
+    return tag in candidates
+
+
+def not_modified(tag: str) -> Response:
+    return Response(status_code=304, headers=validators(tag))
+
+
+# --- Version bumps -----------------------------------------------------------------
+
+
+def _changed_owners(session: Session) -> Dict[Type, Set[int]]:
+    owners: Dict[Type, Set[int]] = {models.User: set(), models.Interview: set(), models.Feedback: set()}
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        created = obj in session.new
+        if isinstance(obj, models.User) and not created:
+            owners[models.User].add(obj.user_id)
+        elif isinstance(obj, models.UserSkill):
+            owners[models.User].add(obj.user_id)
+        elif isinstance(obj, models.Interview) and not created:
+            owners[models.Interview].add(obj.interview_id)
+        elif isinstance(obj, models.Question):
+            owners[models.Interview].add(obj.interview_id)
+        elif isinstance(obj, models.Response):
+            question = obj.__dict__.get("question")
+            if question is None and obj.question_id is not None:
+                question = session.get(models.Question, obj.question_id)
+            if question is not None:
+                owners[models.Interview].add(question.interview_id)
+        elif isinstance(obj, models.Feedback) and not created:
+            owners[models.Feedback].add(obj.feedback_id)
+    return owners
+
+
+@event.listens_for(Session, "before_flush")
+def _bump_versions(session: Session, flush_context, instances) -> None:
+    for model, ids in _changed_owners(session).items():
+        ids.discard(None)
+        if not ids:
+            continue
+        # Incremented in SQL so concurrent writers never produce the same version
+        bump = model.version + 1
+        unloaded = []
+        for pk in ids:
+            obj = session.identity_map.get(identity_key(model, pk))
+            if obj is None:
+                unloaded.append(pk)
+            elif obj not in session.deleted:
+                obj.version = bump
+        if unloaded:
+            pk_col = model.__mapper__.primary_key[0]
+            stmt = update(model).where(pk_col.in_(unloaded)).values(version=bump)
+            session.execute(stmt.execution_options(synchronize_session=False))
@@ -0,0 +1,182 @@
+"""Streaming export of interviews with their transcript, scores and feedback.
+
+One ordered outer-join query is read through a server-side cursor
+(`yield_per`) and regrouped on the fly, so exports take a single pass over the
+database and constant memory regardless of table size.
+
+CLI usage (from the Backend directory):
+
+    python -m app.services.export --format csv --from 2025-01-01 > interviews.csv
+"""
+
+import argparse
+import csv
+import io
+import json
+import sys
+from datetime import date
+from typing import Any, Dict, Iterator, Optional
+
+from sqlalchemy.orm import Session
+
+from .. import models
+
+
+CSV_COLUMNS = [
+    "interview_id",
+    "date",
+    "time",
+    "type",
+    "candidate_id",
+    "interviewer_id",
+    "overall_score",
+    "question_id",
+    "question",
+    "answer",
+    "relevance_score",
+    "confidence_level",
+    "feedback_comments",
+    "feedback_suggestions",
+]
+
+CHUNK_SIZE = 500
+
+
+def iter_rows(
+    db: Session,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    interview_type: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield one flat dict per (interview, question), interviews in id order.
+
+    Interviews without questions still produce one row with empty question
+    fields so they are not lost from the export.
+    """
+
+    I, Q, R, F = models.Interview, models.Question, models.Response, models.Feedback
+    query = (
+        db.query(
+            I.interview_id,
+            I.date,
+            I.time,
+            I.type,
+            I.candidate_id,
+            I.interviewer_id,
+            I.overall_score,
+            Q.question_id,
+            Q.question_text,
+            R.answer_text,
+            R.relevance_score,
+            R.confidence_level,
+            F.comments,
+            F.suggestions,
+        )
+        .outerjoin(Q, Q.interview_id == I.interview_id)
+        .outerjoin(R, R.question_id == Q.question_id)
+        .outerjoin(F, F.interview_id == I.interview_id)
+    )
+    if date_from is not None:
+        query = query.filter(I.date >= date_from)
+    if date_to is not None:
+        query = query.filter(I.date <= date_to)
+    if interview_type:
+        query = query.filter(I.type == interview_type)
+
+    query = query.order_by(I.interview_id, Q.question_id).execution_options(yield_per=CHUNK_SIZE)
+    for row in query:
+        yield dict(zip(CSV_COLUMNS, row))
+
+
+def iter_interviews(rows: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Regroup consecutive flat rows into one nested record per interview."""
+
+    current: Optional[Dict[str, Any]] = None
+    for row in rows:
+        if current is None or current["interview_id"] != row["interview_id"]:
+            if current is not None:
+                yield current
+            current = {
+                "interview_id": row["interview_id"],
+                "date": row["date"],
+                "time": row["time"],
+                "type": row["type"],
+                "candidate_id": row["candidate_id"],
+                "interviewer_id": row["interviewer_id"],
+                "overall_score": row["overall_score"],
+                "feedback": (
+                    {"comments": row["feedback_comments"], "suggestions": row["feedback_suggestions"]}
+                    if row["feedback_comments"] is not None or row["feedback_suggestions"] is not None
+                    else None
+                ),
+                "items": [],
+            }
+        if row["question_id"] is not None:
+            current["items"].append(
+                {
+                    "question_id": row["question_id"],
+                    "question": row["question"],
+                    "answer": row["answer"],
+                    "relevance_score": row["relevance_score"],
+                    "confidence_level": row["confidence_level"],
+                }
+            )
+    if current is not None:
+        yield current
+
+
+def _json_default(value: Any) -> str:
+    return value.isoformat()
+
+
+def ndjson_lines(rows: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    for record in iter_interviews(rows):
+        yield json.dumps(record, default=_json_default) + "\n"
+
+
+def csv_lines(rows: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def export_lines(
+    db: Session,
+    fmt: str = "ndjson",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    interview_type: Optional[str] = None,
+) -> Iterator[str]:
+    rows = iter_rows(db, date_from, date_to, interview_type)
+    return csv_lines(rows) if fmt == "csv" else ndjson_lines(rows)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export interviews with transcripts and scores.")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat, default=None)
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat, default=None)
+    parser.add_argument("--type", dest="interview_type", default=None)
+    parser.add_argument("--output", "-o", default="-", help="Output file, '-' for stdout")
+    args = parser.parse_args(argv)
+
+    from ..db import SessionLocal
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    with SessionLocal() as db:
+        for line in export_lines(db, args.format, args.date_from, args.date_to, args.interview_type):
+            out.write(line)
+    if out is not sys.stdout:
+        out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
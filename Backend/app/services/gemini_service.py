@@ -1,8 +1,9 @@
 from typing import Any, Dict, List
 
-import requests
-
 from ..core_config import get_settings
+from .llm_providers import LLMRouter
+from .metrics import mark_fallback, track_external
+from .prompt_budget import fit_resume
 
 
 settings = get_settings()
@@ -11,38 +12,25 @@ settings = get_settings()
 class GeminiService:
     """Wrapper around Gemini API for question generation and answer evaluation."""
 
-    def __init__(self) -> None:
-        self.api_key = settings.GEMINI_API_KEY
-        # You can change the model name here if needed.
-        self.model = "gemini-1.5-flash"
-        self.base_url = "https://generativelanguage.googleapis.com/v1beta"
-
-    def _generate(self, prompt: str, system_instruction: str | None = None) -> str:
-        if not self.api_key:
-            raise RuntimeError("GEMINI_API_KEY is not configured")
-
-        url = f"{self.base_url}/models/{self.model}:generateContent?key={self.api_key}"
+    def __init__(self, router: LLMRouter | None = None) -> None:
+        # Calls go through the provider router (Gemini, OpenRouter, fake) with
+        # per-task models from settings; latency is tracked per (task, provider, model)
+        self.router = router or LLMRouter()
+        self.latency = self.router.latency
 
+    def _generate(self, task: str, prompt: str, system_instruction: str | None = None) -> str:
         contents: List[Dict[str, Any]] = []
         if system_instruction:
             contents.append({"role": "user", "parts": [{"text": system_instruction}]})
         contents.append({"role": "user", "parts": [{"text": prompt}]})
 
-        payload = {"contents": contents}
-
-        resp = requests.post(url, json=payload, timeout=60)
-        if resp.status_code >= 400:
-            raise RuntimeError(f"Gemini error {resp.status_code}: {resp.text}")
-
-        data = resp.json()
-        candidates = data.get("candidates") or []
-        if not candidates:
-            return ""
-
-        parts = (candidates[0].get("content") or {}).get("parts") or []
-        texts = [p.get("text", "") for p in parts]
-        return " ".join(texts).strip()
+        try:
+            return self.router.generate(task, contents)
+        except Exception:
+            mark_fallback()
+            raise
 
+    @track_external("gemini")
     def extract_resume_text_from_pdf(self, pdf_bytes: bytes) -> str:
         """Use Gemini to extract plain text from a PDF resume.
 
@@ -51,15 +39,10 @@ class GeminiService:
         basic PDF parsing.
         """
 
-        if not self.api_key:
-            raise RuntimeError("GEMINI_API_KEY is not configured")
-
         import base64
 
         b64 = base64.b64encode(pdf_bytes).decode("utf-8")
 
-        url = f"{self.base_url}/models/{self.model}:generateContent?key={self.api_key}"
-
         contents: List[Dict[str, Any]] = [
             {
                 "role": "user",
@@ -80,18 +63,9 @@ class GeminiService:
             }
         ]
 
-        resp = requests.post(url, json={"contents": contents}, timeout=90)
-        if resp.status_code >= 400:
-            raise RuntimeError(f"Gemini PDF error {resp.status_code}: {resp.text}")
-
-        data = resp.json()
-        candidates = data.get("candidates") or []
-        if not candidates:
-            return ""
-        parts = (candidates[0].get("content") or {}).get("parts") or []
-        texts = [p.get("text", "") for p in parts]
-        return " ".join(texts).strip()
+        return self.router.generate("extract_resume", contents)
 
+    @track_external("gemini")
     def generate_question(self, candidate_profile: Dict[str, Any]) -> str:
         role = candidate_profile.get("role") or "this role"
         name = candidate_profile.get("name") or "the candidate"
@@ -109,11 +83,122 @@ class GeminiService:
         )
 
         try:
-            text = self._generate(prompt)
+            text = self._generate("generate_question", prompt)
             return text or "To start, could you briefly introduce yourself and explain why you are a good fit for this role?"
         except RuntimeError:
+            mark_fallback()
             return "To start, could you briefly introduce yourself and explain why you are a good fit for this role?"
 
+    @track_external("gemini")
+    def personalize_question(self, question: str, candidate_profile: Dict[str, Any]) -> str:
+        """Lightly adapt a question-bank question to this candidate."""
+
+        role = candidate_profile.get("role") or "this role"
+        name = candidate_profile.get("name") or "the candidate"
+        skills = candidate_profile.get("skills") or []
+        skills_str = ", ".join(skills) if skills else "unspecified skills"
+
+        prompt = (
+            f"Rewrite this interview question so it feels tailored to {name}, who is targeting "
+            f"'{role}' with skills {skills_str}. Keep the intent and difficulty the same and keep "
+            f"it to one question.\n\nQuestion: {question}\n\nReturn only the question text."
+        )
+
+        try:
+            return self._generate("personalize_question", prompt) or question
+        except RuntimeError:
+            mark_fallback()
+            return question
+
+    @track_external("gemini")
+    def generate_follow_up_candidates(
+        self,
+        candidate_profile: Dict[str, Any],
+        history: list[Dict[str, Any]],
+        count: int = 3,
+    ) -> List[str]:
+        """Draft several possible next questions before the current answer arrives.
+
+        `history` holds the transcript so far; the last item is the question the
+        candidate is currently answering (its answer may still be missing). The
+        drafts deliberately branch in different directions so the caller can
+        pick whichever fits the answer best once it is known.
+        """
+
+        role = candidate_profile.get("role") or "this role"
+        interview_type = candidate_profile.get("interview_type") or "general"
+        skills = candidate_profile.get("skills") or []
+        skills_str = ", ".join(skills) if skills else "unspecified skills"
+
+        prompt = (
+            f"You are an AI interviewer running a {interview_type} mock interview for the role "
+            f"'{role}'. Candidate skills: {skills_str}.\n\n"
+            f"Transcript so far:\n{_format_transcript(history)}\n\n"
+            f"The candidate is still answering the last question. Draft {count} distinct, "
+            "open-ended next questions that each explore a different direction (a deeper "
+            "follow-up, a new skill area, a behavioral angle). Do not repeat earlier questions. "
+            "Respond strictly as a JSON array of strings."
+        )
+
+        try:
+            raw = self._generate("follow_up_candidates", prompt)
+            import json
+
+            data = json.loads(raw)
+            drafts = [str(q).strip() for q in data if str(q).strip()] if isinstance(data, list) else []
+            if drafts:
+                return drafts[:count]
+        except Exception:
+            mark_fallback()
+            pass
+        return _fallback_follow_ups(candidate_profile, history)[:count]
+
+    @track_external("gemini")
+    def generate_follow_up_question(
+        self, candidate_profile: Dict[str, Any], history: list[Dict[str, Any]]
+    ) -> str:
+        """Generate the next question directly from the full transcript (no prefetch)."""
+
+        role = candidate_profile.get("role") or "this role"
+        interview_type = candidate_profile.get("interview_type") or "general"
+
+        prompt = (
+            f"You are an AI interviewer running a {interview_type} mock interview for the role "
+            f"'{role}'.\n\nTranscript so far:\n{_format_transcript(history)}\n\n"
+            "Ask the single best next question, building on the last answer where it makes "
+            "sense. Do not repeat earlier questions. Return only the question text."
+        )
+
+        try:
+            text = self._generate("follow_up_question", prompt)
+            if text:
+                return text
+        except RuntimeError:
+            mark_fallback()
+            pass
+        return _fallback_follow_ups(candidate_profile, history)[0]
+
+    @track_external("gemini")
+    def refine_follow_up(self, draft: str, history: list[Dict[str, Any]]) -> str:
+        """Adjust a prefetched draft so it builds on the answer just given."""
+
+        last = history[-1] if history else {}
+        prompt = (
+            "You prepared the next interview question before hearing the candidate's answer. "
+            "Adjust it so it follows naturally from the answer, keeping its topic and keeping "
+            "it to one question.\n\n"
+            f"Previous question: {last.get('question') or ''}\n"
+            f"Answer: {last.get('answer') or ''}\n\n"
+            f"Prepared question: {draft}\n\nReturn only the question text."
+        )
+
+        try:
+            return self._generate("refine_follow_up", prompt) or draft
+        except RuntimeError:
+            mark_fallback()
+            return draft
+
+    @track_external("gemini")
     def evaluate_answer(self, question: str, answer: str) -> Dict[str, int]:
         prompt = (
             "You are evaluating a candidate's answer in a mock interview. "
@@ -124,7 +209,7 @@ class GeminiService:
         )
 
         try:
-            raw = self._generate(prompt)
+            raw = self._generate("evaluate_answer", prompt)
             import json
 
             data = json.loads(raw)
@@ -134,8 +219,10 @@ class GeminiService:
             conf = max(1, min(10, conf))
             return {"relevance_score": rel, "confidence_level": conf}
         except Exception:
+            mark_fallback()
             return {"relevance_score": 8, "confidence_level": 7}
 
+    @track_external("gemini")
     def summarize_candidate_profile(self, raw_profile: Dict[str, Any]) -> Dict[str, Any]:
         name = raw_profile.get("name") or "The candidate"
         target_role = raw_profile.get("target_role") or "the desired role"
@@ -158,16 +245,24 @@ class GeminiService:
             f"Companies worked: {companies_str or 'N/A'}\n"
             f"Tech stack: {tech_str or 'N/A'}\n\n"
         )
-        if resume_text:
-            prompt += f"Resume text:\n{resume_text}\n\n"
-
-        prompt += (
+        instructions = (
             "Return your answer strictly as JSON with two fields: "
             "`resume_summary` (string) and `skills` (array of strings)."
         )
+        resume_text = fit_resume(
+            "profile_summary",
+            resume_text,
+            system_instruction + prompt + instructions,
+            role=raw_profile.get("target_role"),
+            skills=tech_stack,
+        )
+        if resume_text:
+            prompt += f"Resume text:\n{resume_text}\n\n"
+
+        prompt += instructions
 
         try:
-            raw = self._generate(prompt, system_instruction)
+            raw = self._generate("summarize_profile", prompt, system_instruction)
             import json
 
             data = json.loads(raw)
@@ -176,6 +271,7 @@ class GeminiService:
             skills = [str(s).strip() for s in skills if str(s).strip()]
             return {"resume_summary": summary, "skills": skills}
         except Exception:
+            mark_fallback()
             # Fallback: simple heuristic if Gemini fails
             base_summary = (
                 f"{name} is aiming for {target_role}. They have worked at {companies_str or 'various organizations'} "
@@ -183,6 +279,7 @@ class GeminiService:
             )
             return {"resume_summary": base_summary, "skills": tech_stack}
 
+    @track_external("gemini")
     def summarize_interview(self, interview: Dict[str, Any], qa_items: list[Dict[str, Any]]) -> Dict[str, str]:
         candidate_name = interview.get("candidate_name") or "The candidate"
         role = interview.get("role") or "the target role"
@@ -210,7 +307,7 @@ class GeminiService:
         )
 
         try:
-            raw = self._generate(prompt, system_instruction)
+            raw = self._generate("summarize_interview", prompt, system_instruction)
             import json
 
             data = json.loads(raw)
@@ -218,6 +315,7 @@ class GeminiService:
             suggestions = str(data.get("suggestions") or "")
             return {"comments": comments, "suggestions": suggestions}
         except Exception:
+            mark_fallback()
             fallback_comments = (
                 f"{candidate_name} completed a mock interview for {role}. This is fallback feedback "
                 "used when the Gemini API response could not be parsed."
@@ -227,6 +325,7 @@ class GeminiService:
             )
             return {"comments": fallback_comments, "suggestions": fallback_suggestions}
 
+    @track_external("gemini")
     def generate_tavus_interviewer_context(self, payload: Dict[str, Any]) -> str:
         """Generate compact Tavus conversation context from stored profile + resume.
 
@@ -246,9 +345,6 @@ class GeminiService:
         else:
             skills_str = str(skills)
 
-        if resume_raw and len(resume_raw) > 12000:
-            resume_raw = resume_raw[:12000]
-
         system_instruction = (
             "You are preparing context for an AI interviewer avatar. "
             "Write a clear, compact conversational_context that will be appended to a system prompt. "
@@ -264,24 +360,34 @@ class GeminiService:
         )
         if resume_summary:
             prompt += f"Resume summary:\n{resume_summary}\n\n"
-        if resume_raw:
-            prompt += f"Resume raw text (may be noisy):\n{resume_raw}\n\n"
-
-        prompt += (
+        instructions = (
             "Now produce the interviewer context. Include:\n"
             "- a short candidate briefing\n"
             "- what to probe (projects, skills, gaps)\n"
             "- interview structure (intro, technical, behavioral, closing)\n"
             "- tone and constraints (professional, friendly, ask one question at a time)"
         )
+        # Keep the most relevant resume sentences within the prompt budget
+        resume_raw = fit_resume(
+            "interviewer_context",
+            resume_raw,
+            system_instruction + prompt + instructions,
+            role=target_role,
+            skills=skills if isinstance(skills, list) else [skills_str],
+        )
+        if resume_raw:
+            prompt += f"Resume raw text (may be noisy):\n{resume_raw}\n\n"
+
+        prompt += instructions
 
         try:
-            ctx = self._generate(prompt, system_instruction)
+            ctx = self._generate("interviewer_context", prompt, system_instruction)
             ctx = (ctx or "").strip()
             if len(ctx) > 1800:
                 ctx = ctx[:1800]
             return ctx
         except Exception:
+            mark_fallback()
             fallback = (
                 "You are an AI interviewer. Interview the candidate for "
                 f"{target_role}. Candidate: {name}. "
@@ -294,4 +400,28 @@ class GeminiService:
             return fallback[:1800]
 
 
+def _format_transcript(history: list[Dict[str, Any]]) -> str:
+    lines = []
+    for idx, item in enumerate(history, start=1):
+        lines.append(f"Q{idx}: {item.get('question') or ''}")
+        lines.append(f"A{idx}: {item.get('answer') or '(answer pending)'}")
+    return "\n".join(lines)
+
+
+def _fallback_follow_ups(candidate_profile: Dict[str, Any], history: list[Dict[str, Any]]) -> List[str]:
+    asked = {(item.get("question") or "").strip() for item in history}
+    skills = candidate_profile.get("skills") or []
+    pool = [
+        f"Can you walk me through a project where you relied heavily on {skill}? What was your role?"
+        for skill in skills
+    ]
+    pool += [
+        "Tell me about a challenging problem you solved recently. How did you approach it?",
+        "Describe a time you disagreed with a teammate. How did you resolve it?",
+        "What is a technical decision you made that you would do differently today, and why?",
+        "How do you make sure the code or work you deliver is reliable and maintainable?",
+    ]
+    return [q for q in pool if q not in asked] or pool
+
+
 gemini_service = GeminiService()
@@ -0,0 +1,155 @@
+import logging
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core_config import get_settings
+from .gemini_service import gemini_service
+from .metrics import record_cache
+
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+
+
+class InterviewEngine:
+    """Multi-turn interview driver with speculative next-question prefetch.
+
+    As soon as question N is shown to the candidate we draft a few possible
+    questions for N+1 on a background pool. When the answer arrives we pick the
+    draft that best matches it, so the LLM round-trip overlaps with the time the
+    candidate spends answering instead of adding to the turn latency. A draft
+    that barely relates to the answer is refined against it with one short call.
+
+    Drafts are kept per (interview, question) until the answer consumes them,
+    the interview finishes, or they expire (FOLLOW_UP_PREFETCH_TTL_SECONDS);
+    at most FOLLOW_UP_PREFETCH_MAX_PENDING are kept.
+    """
+
+    def __init__(self) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.FOLLOW_UP_PREFETCH_WORKERS,
+            thread_name_prefix="follow-up-prefetch",
+        )
+        # (interview_id, question_id) -> (expiry, drafts); oldest first
+        self._pending: Dict[Tuple[int, int], Tuple[float, Future]] = {}
+        self._lock = threading.Lock()
+
+    def total_questions(self, interview_type: Optional[str]) -> int:
+        return settings.question_count_for(interview_type)
+
+    def prefetch(
+        self,
+        interview_id: int,
+        question_id: int,
+        candidate_profile: Dict[str, Any],
+        history: List[Dict[str, Any]],
+    ) -> None:
+        """Start drafting follow-ups for the question the candidate is answering."""
+
+        future = self._executor.submit(
+            gemini_service.generate_follow_up_candidates,
+            candidate_profile,
+            list(history),
+            settings.FOLLOW_UP_CANDIDATES,
+        )
+        expires = time.monotonic() + settings.FOLLOW_UP_PREFETCH_TTL_SECONDS
+        with self._lock:
+            dropped = self._evict()
+            previous = self._pending.pop((interview_id, question_id), None)
+            if previous is not None:
+                dropped.append(previous[1])
+            self._pending[(interview_id, question_id)] = (expires, future)
+        for stale in dropped:
+            stale.cancel()
+
+    def _evict(self) -> List[Future]:
+        """Remove expired entries and the oldest ones beyond the cap (lock held)."""
+
+        now = time.monotonic()
+        limit = max(0, settings.FOLLOW_UP_PREFETCH_MAX_PENDING - 1)
+        dropped = []
+        for key, (expires, future) in list(self._pending.items()):
+            if expires > now and len(self._pending) <= limit:
+                break
+            del self._pending[key]
+            dropped.append(future)
+        return dropped
+
+    def next_question(
+        self,
+        interview_id: int,
+        question_id: int,
+        candidate_profile: Dict[str, Any],
+        history: List[Dict[str, Any]],
+    ) -> str:
+        """Return the next question once the answer to `question_id` is known.
+
+        Uses the prefetched drafts when available; otherwise (process restart,
+        prefetch failure or timeout) falls back to a direct generation call.
+        """
+
+        with self._lock:
+            entry = self._pending.pop((interview_id, question_id), None)
+        future = entry[1] if entry is not None else None
+
+        drafts: List[str] = []
+        if future is not None:
+            try:
+                drafts = future.result(timeout=settings.FOLLOW_UP_WAIT_SECONDS)
+            except FutureTimeoutError:
+                logger.warning("Follow-up prefetch timed out for interview %s", interview_id)
+                future.cancel()
+            except Exception as e:
+                logger.warning("Follow-up prefetch failed for interview %s: %s", interview_id, e)
+
+        asked = {(item.get("question") or "").strip() for item in history}
+        answer = (history[-1].get("answer") if history else None) or ""
+        picked, overlap = self._pick(drafts, answer, asked)
+        record_cache("follow_up_prefetch", bool(picked))
+        if picked:
+            if overlap < settings.FOLLOW_UP_REFINE_BELOW and _WORD_RE.search(answer.lower()):
+                return gemini_service.refine_follow_up(picked, history)
+            return picked
+
+        return gemini_service.generate_follow_up_question(candidate_profile, history)
+
+    def discard(self, interview_id: int) -> None:
+        """Drop any outstanding prefetch for a finished interview."""
+
+        with self._lock:
+            keys = [key for key in self._pending if key[0] == interview_id]
+            futures = [self._pending.pop(key)[1] for key in keys]
+        for future in futures:
+            future.cancel()
+
+    @staticmethod
+    def _pick(drafts: List[str], answer: str, asked: set[str]) -> Tuple[Optional[str], float]:
+        """Choose the draft with the highest word overlap with the answer.
+
+        Returns the draft and the share of its words found in the answer. Ties
+        keep the LLM's own ordering, so an empty or very short answer simply
+        takes the first draft.
+        """
+
+        answer_words = set(_WORD_RE.findall(answer.lower()))
+        best: Optional[str] = None
+        best_score = -1.0
+        for draft in drafts:
+            text = (draft or "").strip()
+            if not text or text in asked:
+                continue
+            words = set(_WORD_RE.findall(text.lower()))
+            score = len(words & answer_words) / (len(words) or 1)
+            if score > best_score:
+                best, best_score = text, score
+        return best, max(best_score, 0.0)
+
+
+interview_engine = InterviewEngine()
@@ -0,0 +1,87 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, Optional, Tuple
+
+from ..core_config import get_settings
+
+
+settings = get_settings()
+
+Key = Tuple[str, ...]
+
+
+def _percentile(sorted_values: list, q: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+class LatencyTracker:
+    """Recent call latencies and error counts per key, e.g. (task, model).
+
+    Only the last LLM_LATENCY_WINDOW samples per key are kept, so percentiles
+    follow the current behaviour of a model or provider rather than its
+    lifetime average. Failed calls are counted but not sampled: a provider
+    that errors out quickly must not look fast.
+    """
+
+    def __init__(self, window: Optional[int] = None) -> None:
+        self._window = window or settings.LLM_LATENCY_WINDOW
+        self._lock = threading.Lock()
+        self._samples: Dict[Key, Deque[float]] = {}
+        self._calls: Dict[Key, int] = {}
+        self._errors: Dict[Key, int] = {}
+
+    def record(self, key: Key, seconds: float, ok: bool = True) -> None:
+        with self._lock:
+            samples = self._samples.setdefault(key, deque(maxlen=self._window))
+            self._calls[key] = self._calls.get(key, 0) + 1
+            if ok:
+                samples.append(seconds)
+            else:
+                self._errors[key] = self._errors.get(key, 0) + 1
+
+    @contextmanager
+    def measure(self, key: Key) -> Iterator[None]:
+        """Time the wrapped block; exceptions are recorded as errors and re-raised."""
+
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.record(key, time.perf_counter() - started, ok=False)
+            raise
+        self.record(key, time.perf_counter() - started)
+
+    def percentile(self, key: Key, q: float) -> Optional[float]:
+        """Percentile of successful calls, or None before the first success."""
+
+        with self._lock:
+            values = sorted(self._samples.get(key, ()))
+        return _percentile(values, q)
+
+    def errors(self, key: Key) -> int:
+        with self._lock:
+            return self._errors.get(key, 0)
+
+    def summary(self) -> list[Dict[str, Any]]:
+        with self._lock:
+            items = [(key, sorted(values), self._calls[key], self._errors.get(key, 0)) for key, values in self._samples.items()]
+        return [
+            {
+                "key": list(key),
+                "calls": calls,
+                "errors": errors,
+                "p50_ms": _ms(_percentile(values, 0.5)),
+                "p95_ms": _ms(_percentile(values, 0.95)),
+                "max_ms": _ms(values[-1] if values else None),
+            }
+            for key, values, calls, errors in sorted(items)
+        ]
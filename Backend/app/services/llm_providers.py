@@ -0,0 +1,324 @@
+"""LLM backends behind GeminiService and the router that picks between them.
+
+Requests are expressed in Gemini's `contents` format; other providers
+translate them. The router orders healthy providers by their recent p95
+latency for the task, fails over on errors and can hedge slow calls with a
+second provider.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FuturesTimeout
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from ..core_config import get_settings
+from .llm_latency import LatencyTracker
+
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+Contents = List[Dict[str, Any]]
+
+
+class UnsupportedRequest(RuntimeError):
+    """The provider cannot serve this request (e.g. inline file parts)."""
+
+
+class LLMProvider:
+    name = "base"
+
+    def available(self) -> bool:
+        return True
+
+    def model_for(self, task: str) -> str:
+        raise NotImplementedError
+
+    def generate(self, task: str, contents: Contents) -> str:
+        """Return the response text; raise RuntimeError on any failure."""
+
+        raise NotImplementedError
+
+
+class GeminiProvider(LLMProvider):
+    name = "gemini"
+
+    def __init__(self) -> None:
+        self.api_key = settings.GEMINI_API_KEY
+        self.base_url = settings.GEMINI_BASE_URL.rstrip("/")
+
+    def available(self) -> bool:
+        return bool(self.api_key)
+
+    def model_for(self, task: str) -> str:
+        return settings.model_for(task)
+
+    def generate(self, task: str, contents: Contents) -> str:
+        url = f"{self.base_url}/models/{self.model_for(task)}:generateContent?key={self.api_key}"
+        payload = {
+            "contents": contents,
+            "generationConfig": {"maxOutputTokens": settings.llm_max_tokens_for(task)},
+        }
+        try:
+            resp = requests.post(url, json=payload, timeout=settings.llm_timeout_for(task))
+        except requests.RequestException as e:
+            raise RuntimeError(f"Gemini request failed ({task}): {e}") from e
+        if resp.status_code >= 400:
+            raise RuntimeError(f"Gemini error {resp.status_code}: {resp.text}")
+
+        candidates = resp.json().get("candidates") or []
+        if not candidates:
+            return ""
+        parts = (candidates[0].get("content") or {}).get("parts") or []
+        return " ".join(p.get("text", "") for p in parts).strip()
+
+
+class OpenRouterProvider(LLMProvider):
+    """OpenAI-compatible chat completions through OpenRouter (text only)."""
+
+    name = "openrouter"
+
+    def __init__(self) -> None:
+        self.api_key = settings.OPENROUTER_API_KEY
+        self.base_url = settings.OPENROUTER_BASE_URL.rstrip("/")
+
+    def available(self) -> bool:
+        return bool(self.api_key)
+
+    def model_for(self, task: str) -> str:
+        return settings.OPENROUTER_TASK_MODELS.get(task.lower(), settings.OPENROUTER_MODEL)
+
+    @staticmethod
+    def _messages(contents: Contents) -> List[Dict[str, str]]:
+        messages = []
+        for item in contents:
+            texts = []
+            for part in item.get("parts") or []:
+                if "text" not in part:
+                    raise UnsupportedRequest("OpenRouter provider only handles text parts")
+                texts.append(part["text"])
+            messages.append({"role": item.get("role") or "user", "content": "\n".join(texts)})
+        return messages
+
+    def generate(self, task: str, contents: Contents) -> str:
+        payload = {
+            "model": self.model_for(task),
+            "messages": self._messages(contents),
+            "max_tokens": settings.llm_max_tokens_for(task),
+        }
+        try:
+            resp = requests.post(
+                f"{self.base_url}/chat/completions",
+                json=payload,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                timeout=settings.llm_timeout_for(task),
+            )
+        except requests.RequestException as e:
+            raise RuntimeError(f"OpenRouter request failed ({task}): {e}") from e
+        if resp.status_code >= 400:
+            raise RuntimeError(f"OpenRouter error {resp.status_code}: {resp.text}")
+
+        choices = resp.json().get("choices") or []
+        if not choices:
+            return ""
+        return ((choices[0].get("message") or {}).get("content") or "").strip()
+
+
+class FakeProvider(LLMProvider):
+    """Deterministic offline responses shaped like each task expects.
+
+    Used for local development, load tests and tests; enable it with
+    LLM_PROVIDERS=fake.
+    """
+
+    name = "fake"
+
+    def model_for(self, task: str) -> str:
+        return "fake"
+
+    def generate(self, task: str, contents: Contents) -> str:
+        if settings.FAKE_LLM_LATENCY_MS:
+            time.sleep(settings.FAKE_LLM_LATENCY_MS / 1000)
+        prompt = "\n".join(p.get("text", "") for item in contents for p in item.get("parts") or [])
+        seed = int(hashlib.md5(prompt.encode("utf-8")).hexdigest()[:8], 16)
+
+        if task == "evaluate_answer":
+            return json.dumps({"relevance_score": 5 + seed % 5, "confidence_level": 5 + (seed >> 4) % 5})
+        if task == "follow_up_candidates":
+            return json.dumps(
+                [
+                    "Can you go deeper into the hardest technical decision in that work?",
+                    "Which skill from your background would you apply first in this role, and how?",
+                    "Tell me about a time you had to resolve a disagreement within your team.",
+                ]
+            )
+        if task == "summarize_profile":
+            stack = re.search(r"^Tech stack: (.*)$", prompt, re.MULTILINE)
+            skills = [s.strip() for s in (stack.group(1) if stack else "").split(",") if s.strip() and s.strip() != "N/A"]
+            return json.dumps({"resume_summary": "Candidate with hands-on project experience.", "skills": skills})
+        if task == "summarize_interview":
+            return json.dumps(
+                {
+                    "comments": "Clear answers with relevant examples.",
+                    "suggestions": "Quantify impact and structure answers with STAR.",
+                }
+            )
+        if task == "interviewer_context":
+            return "You are a friendly, professional interviewer. Ask one question at a time about the candidate's projects and skills."
+        if task == "refine_follow_up":
+            draft = re.search(r"^Prepared question: (.*)$", prompt, re.MULTILINE)
+            return f"Building on your answer: {draft.group(1)}" if draft else ""
+        if task == "extract_resume":
+            raise UnsupportedRequest("Fake provider does not read files")
+        return "Tell me about a recent project you are proud of and the role you played in it."
+
+
+PROVIDERS = {
+    "gemini": GeminiProvider,
+    "openrouter": OpenRouterProvider,
+    "fake": FakeProvider,
+}
+
+
+class LLMRouter:
+    """Health-scored routing, failover and hedging across providers."""
+
+    def __init__(self, providers: Optional[List[LLMProvider]] = None) -> None:
+        if providers is None:
+            providers = [PROVIDERS[name]() for name in settings.LLM_PROVIDERS if name in PROVIDERS]
+        self.providers = providers
+        self.latency = LatencyTracker()
+        self._lock = threading.Lock()
+        self._failures: Dict[str, int] = {}
+        self._cooldown_until: Dict[str, float] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    # -- health ------------------------------------------------------------
+
+    def _key(self, provider: LLMProvider, task: str) -> tuple:
+        return (task, provider.name, provider.model_for(task))
+
+    def _healthy(self, provider: LLMProvider) -> bool:
+        return time.monotonic() >= self._cooldown_until.get(provider.name, 0.0)
+
+    def _mark(self, provider: LLMProvider, ok: bool) -> None:
+        with self._lock:
+            if ok:
+                self._failures[provider.name] = 0
+                return
+            failures = self._failures.get(provider.name, 0) + 1
+            self._failures[provider.name] = failures
+            if failures >= settings.LLM_PROVIDER_FAILURE_THRESHOLD:
+                self._cooldown_until[provider.name] = time.monotonic() + settings.LLM_PROVIDER_COOLDOWN_SECONDS
+                self._failures[provider.name] = 0
+                logger.warning("LLM provider %s cooling down after repeated failures", provider.name)
+
+    def ranked(self, task: str) -> List[LLMProvider]:
+        """Available providers, healthy ones first, lowest recent p95 first.
+
+        Latency is that of successful calls only. Providers that just failed
+        go after the ones that did not, and providers that have only ever
+        failed for the task go after measured ones. Providers not tried yet
+        keep their configured order ahead of measured ones, so every provider
+        gets measured.
+        """
+
+        candidates = [p for p in self.providers if p.available()]
+        healthy = [p for p in candidates if self._healthy(p)]
+        cooling = [p for p in candidates if not self._healthy(p)]
+
+        def score(item):
+            position, provider = item
+            key = self._key(provider, task)
+            p95 = self.latency.percentile(key, 0.95)
+            if p95 is None:
+                tier = 2 if self.latency.errors(key) else 0
+            else:
+                tier = 1
+            return (self._failures.get(provider.name, 0) > 0, tier, p95 or 0.0, position)
+
+        ordered = [p for _, p in sorted(enumerate(healthy), key=score)]
+        # Cooling providers are a last resort rather than dropped entirely
+        return ordered + cooling
+
+    # -- calls -------------------------------------------------------------
+
+    def _call(self, provider: LLMProvider, task: str, contents: Contents) -> str:
+        key = self._key(provider, task)
+        started = time.perf_counter()
+        try:
+            text = provider.generate(task, contents)
+        except UnsupportedRequest:
+            raise
+        except Exception:
+            self.latency.record(key, time.perf_counter() - started, ok=False)
+            self._mark(provider, ok=False)
+            raise
+        self.latency.record(key, time.perf_counter() - started)
+        self._mark(provider, ok=True)
+        return text
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=settings.LLM_HEDGE_WORKERS, thread_name_prefix="llm-hedge"
+                )
+            return self._executor
+
+    def _hedge_delay(self, provider: LLMProvider, task: str) -> float:
+        p95 = self.latency.percentile(self._key(provider, task), 0.95)
+        return max(settings.LLM_HEDGE_AFTER_MS / 1000, p95 or 0.0)
+
+    def _hedged(self, first: LLMProvider, second: LLMProvider, task: str, contents: Contents) -> str:
+        pool = self._pool()
+        primary = pool.submit(self._call, first, task, contents)
+        try:
+            return primary.result(timeout=self._hedge_delay(first, task))
+        except FuturesTimeout:
+            logger.info("Hedging %s: %s exceeded its latency budget, also asking %s", task, first.name, second.name)
+        except Exception as e:
+            # Failed before the hedge was due: plain failover
+            logger.warning("LLM provider %s failed for %s: %s", first.name, task, e)
+            return self._call(second, task, contents)
+
+        # Whichever answers first wins; the slower call finishes in the background
+        pending = {primary, pool.submit(self._call, second, task, contents)}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def generate(self, task: str, contents: Contents) -> str:
+        providers = self.ranked(task)
+        if not providers:
+            raise RuntimeError("No LLM provider is configured")
+
+        errors: List[str] = []
+        remaining = list(providers)
+        while remaining:
+            provider = remaining.pop(0)
+            try:
+                if settings.LLM_HEDGE_ENABLED and remaining:
+                    return self._hedged(provider, remaining.pop(0), task, contents)
+                return self._call(provider, task, contents)
+            except UnsupportedRequest:
+                continue
+            except Exception as e:
+                errors.append(f"{provider.name}: {e}")
+                logger.warning("LLM call for %s failed on %s: %s", task, provider.name, e)
+        if not errors:
+            raise RuntimeError(f"No LLM provider supports this {task} request")
+        raise RuntimeError("All LLM providers failed: " + "; ".join(errors))
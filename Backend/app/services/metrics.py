@@ -0,0 +1,351 @@
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+Covers HTTP routes (latency, status, in-flight), external calls (Gemini/Tavus per
+method and outcome), DB statements and pool checkouts, and cache hit/miss
+counters. Values are per process; with several workers, scrape each one (or
+run a single worker behind the scraper).
+"""
+
+import functools
+import math
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from starlette.requests import HTTPConnection
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", *self._samples()]
+
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()) -> None:
+        super().__init__(name, help_text, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help_text: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> None:
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [count per bucket..., +Inf count], sum
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+            counts[index] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def count(self, **labels: str) -> int:
+        return sum(self._counts.get(self._key(labels), ()))
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            items = sorted((key, list(counts), self._sums[key]) for key, counts in self._counts.items())
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.label_names, key)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.label_names, key)} {cumulative}"
+
+
+REGISTRY: List[_Metric] = []
+
+
+def render() -> str:
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
+
+
+# --- Metric definitions ---------------------------------------------------------
+
+http_requests = Counter("http_requests_total", "HTTP requests by route and status.", ["method", "route", "status"])
+http_duration = Histogram("http_request_duration_seconds", "HTTP request latency.", ["method", "route"])
+http_in_flight = Gauge("http_requests_in_flight", "HTTP requests currently being served.", ["method", "route"])
+
+external_duration = Histogram(
+    "external_call_duration_seconds",
+    "Gemini/Tavus service method latency by outcome (success, fallback, error).",
+    ["service", "method", "outcome"],
+)
+
+db_statements = Counter("db_statements_total", "SQL statements executed.", ["operation"])
+db_duration = Histogram("db_statement_duration_seconds", "SQL statement latency.", ["operation"], DB_BUCKETS)
+db_pool_wait = Histogram("db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection.", [], DB_BUCKETS)
+db_pool_checked_out = Gauge("db_pool_connections_checked_out", "Pooled connections currently in use.")
+
+cache_requests = Counter("cache_requests_total", "Cache lookups by cache and result (hit, miss).", ["cache", "result"])
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    cache_requests.inc(cache=cache, result="hit" if hit else "miss")
+
+
+# --- External calls ---------------------------------------------------------------
+
+_call_outcome: ContextVar[Optional[list]] = ContextVar("external_call_outcome", default=None)
+
+
+def mark_fallback() -> None:
+    """Flag the current tracked call as answered by its fallback path."""
+
+    holder = _call_outcome.get()
+    if holder is not None:
+        holder[0] = "fallback"
+
+
+def track_external(service: str) -> Callable:
+    """Decorator timing a service method, labelled with its outcome."""
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            holder = ["success"]
+            token = _call_outcome.set(holder)
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                holder[0] = "error"
+                raise
+            finally:
+                _call_outcome.reset(token)
+                external_duration.observe(
+                    time.perf_counter() - started, service=service, method=fn.__name__, outcome=holder[0]
+                )
+
+        return wrapper
+
+    return decorator
+
+
+# --- Database ---------------------------------------------------------------------
+
+# Called with (statement, seconds) after every statement, e.g. by query_stats
+statement_hooks: List[Callable[[str, float], None]] = []
+
+_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE"}
+
+
+def statement_operation(statement: str) -> str:
+    word = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return word if word in _OPERATIONS else "OTHER"
+
+
+class _TimedCheckout:
+    """Pool mixin timing connect(), i.e. the wait for a pooled connection.
+
+    Pools expose no "waiting" event. Being the pool's class, the timing
+    survives engine.dispose(), which recreates the pool from its class.
+    """
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            db_pool_wait.observe(time.perf_counter() - started)
+
+
+_timed_pools: Dict[type, type] = {}
+
+
+def timed_pool_class(url: str) -> type:
+    """The pool class create_engine would pick for `url`, with checkouts timed.
+
+    Pass it as create_engine(url, poolclass=...).
+    """
+
+    parsed = make_url(url)
+    base = parsed.get_dialect().get_pool_class(parsed)
+    if base not in _timed_pools:
+        _timed_pools[base] = type(f"Timed{base.__name__}", (_TimedCheckout, base), {})
+    return _timed_pools[base]
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count and time statements and count pool checkouts for `engine`.
+
+    Checkout waits are timed by the pool class (see timed_pool_class).
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["metrics_started"].pop()
+        operation = statement_operation(statement)
+        db_statements.inc(operation=operation)
+        db_duration.observe(elapsed, operation=operation)
+        for hook in statement_hooks:
+            hook(statement, elapsed)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        stack = context.connection.info.get("metrics_started") if context.connection is not None else None
+        if stack:
+            stack.pop()
+
+    @event.listens_for(engine.pool, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        db_pool_checked_out.inc()
+
+    @event.listens_for(engine.pool, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        db_pool_checked_out.dec()
+
+
+# --- HTTP -------------------------------------------------------------------------
+
+
+_PARAM_RE = re.compile(r"{(\w+)(?::\w+)?}")
+
+
+def route_template(scope) -> str:
+    """Path template of the matched route, e.g. /api/users/{user_id}.
+
+    Included routers may only carry their own part of the path, so the
+    prefix is recovered from the concrete request path.
+    """
+
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if not template:
+        return "unmatched"
+    params = scope.get("path_params") or {}
+    rendered = _PARAM_RE.sub(lambda m: str(params.get(m.group(1), m.group(0))), template)
+    path = scope.get("path", "")
+    if rendered and path.endswith(rendered):
+        return path[: len(path) - len(rendered)] + template
+    return template
+
+
+async def track_in_flight(connection: HTTPConnection):
+    """App-wide dependency: per-route in-flight gauge (the route is known by now).
+
+    WebSocket sessions count as in flight for as long as they stay open.
+    """
+
+    method, route = connection.scope.get("method", "WEBSOCKET"), route_template(connection.scope)
+    http_in_flight.inc(method=method, route=route)
+    try:
+        yield
+    finally:
+        http_in_flight.dec(method=method, route=route)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route latency and status counts.
+
+    Routes are labelled with their path template so label cardinality stays
+    bounded; unknown paths share the "unmatched" label.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            method, route = scope["method"], route_template(scope)
+            http_duration.observe(time.perf_counter() - started, method=method, route=route)
+            http_requests.inc(method=method, route=route, status=str(status["code"]))
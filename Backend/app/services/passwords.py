@@ -0,0 +1,102 @@
+"""bcrypt hashing on a dedicated, bounded executor.
+
+bcrypt is deliberately slow CPU work. Running it on the request thread pool
+lets a login burst occupy every worker thread, stalling unrelated requests.
+The async helpers here queue it on a small executor of its own
+(PASSWORD_HASH_WORKERS threads; bcrypt releases the GIL while hashing) and
+reject work beyond PASSWORD_HASH_MAX_PENDING instead of queueing
+indefinitely.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+import bcrypt
+
+from ..core_config import get_settings
+
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+
+class HashingOverloaded(RuntimeError):
+    """Too many hashing jobs are already queued."""
+
+
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
+    """Hash a password using bcrypt directly (blocking).
+
+    This avoids Passlib's backend self-tests, which can be flaky on some
+    Windows/Python combinations. The result is a UTF-8 string suitable for
+    storing in the database.
+    """
+
+    hashed = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds or settings.BCRYPT_ROUNDS))
+    return hashed.decode("utf-8")
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    try:
+        return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
+    except ValueError:
+        # If the stored hash is somehow invalid, treat as non-match
+        return False
+
+
+def hash_rounds(hashed_password: str) -> Optional[int]:
+    """Cost factor of a "$2b$12$..." hash, or None if it is not bcrypt."""
+
+    parts = (hashed_password or "").split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    return hash_rounds(hashed_password) != settings.BCRYPT_ROUNDS
+
+
+class HashingExecutor:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max(1, settings.PASSWORD_HASH_WORKERS), thread_name_prefix="password-hash"
+            )
+        return self._executor
+
+    def _done(self, _future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        with self._lock:
+            if self._pending >= settings.PASSWORD_HASH_MAX_PENDING:
+                raise HashingOverloaded("Password hashing queue is full")
+            self._pending += 1
+            future = self._pool().submit(fn, *args)
+        future.add_done_callback(self._done)
+        return await asyncio.wrap_future(future)
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+
+hashing_executor = HashingExecutor()
+
+
+async def hash_password_async(password: str) -> str:
+    return await hashing_executor.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await hashing_executor.run(verify_password, plain_password, hashed_password)
@@ -0,0 +1,176 @@
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..core_config import get_settings
+from .gemini_service import gemini_service
+from .metrics import record_cache
+from .prompt_budget import compress_resume
+
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+def context_key(interview_type: Optional[str]) -> str:
+    return (interview_type or "").strip().lower()
+
+
+def _user_skills(db: Session, user_id: int) -> List[str]:
+    return [
+        name
+        for (name,) in db.query(models.Skill.skill_name)
+        .join(models.UserSkill, models.UserSkill.skill_id == models.Skill.skill_id)
+        .filter(models.UserSkill.user_id == user_id)
+        .order_by(models.Skill.skill_name)
+    ]
+
+
+def fingerprint(user: models.User, skills: Iterable[str]) -> str:
+    parts = [user.name, user.role, user.resume_summary, user.resume_raw, *sorted(skills)]
+    return hashlib.sha256("\x1f".join(p or "" for p in parts).encode("utf-8")).hexdigest()
+
+
+def resume_digest(user: models.User, skills: List[str]) -> Optional[str]:
+    """Resume compressed to the interviewer-context budget for this profile."""
+
+    if not user.resume_raw:
+        return None
+    max_tokens = settings.prompt_budget_for("interviewer_context")
+    return compress_resume(user.resume_raw, max_tokens, role=user.role, skills=skills).text
+
+
+def invalidate(db: Session, user_id: int) -> None:
+    """Force a rebuild on next use, e.g. after the user's skills changed."""
+
+    db.query(models.ProfileSnapshot).filter_by(user_id=user_id).update(
+        {"fingerprint": ""}, synchronize_session="fetch"
+    )
+
+
+def sync_snapshot(db: Session, user: models.User) -> models.ProfileSnapshot:
+    """Return the user's snapshot, rebuilding it if the profile changed.
+
+    A rebuild reloads the canonical skills, refreshes the resume digest,
+    bumps `version` and clears the rendered contexts. Flushed, not committed.
+    """
+
+    snapshot = db.get(models.ProfileSnapshot, user.user_id)
+    if snapshot is not None and snapshot.fingerprint == fingerprint(user, snapshot.skills or []):
+        return snapshot
+
+    # Sessions do not autoflush: skill links added by the caller must be visible
+    db.flush()
+    skills = _user_skills(db, user.user_id)
+    values = {
+        "fingerprint": fingerprint(user, skills),
+        "resume_digest": resume_digest(user, skills),
+        "skills": skills,
+        "contexts": {},
+    }
+    if snapshot is None:
+        try:
+            with db.begin_nested():
+                snapshot = models.ProfileSnapshot(user_id=user.user_id, version=1, **values)
+                db.add(snapshot)
+                db.flush()
+            return snapshot
+        except IntegrityError:
+            # Built concurrently by another request: update that row instead
+            snapshot = db.get(models.ProfileSnapshot, user.user_id)
+            if snapshot.fingerprint == values["fingerprint"]:
+                return snapshot
+
+    for name, value in values.items():
+        setattr(snapshot, name, value)
+    snapshot.version = (snapshot.version or 0) + 1
+    db.flush()
+    return snapshot
+
+
+def context_payload(user: models.User, snapshot: models.ProfileSnapshot, interview_type: Optional[str]) -> Dict[str, Any]:
+    return {
+        "name": user.name,
+        "target_role": user.role or interview_type,
+        "interview_type": interview_type,
+        "skills": list(snapshot.skills or []),
+        "resume_summary": user.resume_summary,
+        "resume_raw": snapshot.resume_digest,
+    }
+
+
+def cached_context(snapshot: models.ProfileSnapshot, interview_type: Optional[str]) -> Optional[str]:
+    return (snapshot.contexts or {}).get(context_key(interview_type))
+
+
+def store_context(
+    snapshot: models.ProfileSnapshot, interview_type: Optional[str], context: str, version: int
+) -> None:
+    """Keep a rendered context unless the snapshot moved to a newer version meanwhile."""
+
+    if context and snapshot.version == version:
+        # Reassign (not mutate) so the JSON column is marked dirty
+        snapshot.contexts = {**(snapshot.contexts or {}), context_key(interview_type): context}
+
+
+def interviewer_context(
+    db: Session, user: models.User, interview_type: Optional[str]
+) -> Tuple[str, models.ProfileSnapshot]:
+    """Interviewer context for /start: cached when the profile is unchanged.
+
+    Commits. The snapshot is committed before the LLM call, so no write is
+    held open while it runs; the rendered context is saved in a second
+    short transaction.
+    """
+
+    snapshot = sync_snapshot(db, user)
+    context = cached_context(snapshot, interview_type)
+    record_cache("profile_context", context is not None)
+    if context is not None:
+        db.commit()
+        return context, snapshot
+
+    version = snapshot.version
+    payload = context_payload(user, snapshot, interview_type)
+    db.commit()
+    context = gemini_service.generate_tavus_interviewer_context(payload)
+    store_context(snapshot, interview_type, context, version)
+    db.commit()
+    return context, snapshot
+
+
+def prerender(db: Session, user: models.User, interview_types: Optional[List[str]] = None) -> models.ProfileSnapshot:
+    """Rebuild the snapshot and render missing contexts in parallel.
+
+    Commits, like `interviewer_context`: the LLM calls run with no write
+    pending.
+    """
+
+    snapshot = sync_snapshot(db, user)
+    types = [t for t in (interview_types or settings.PROFILE_CONTEXT_TYPES) if cached_context(snapshot, t) is None]
+    if not types:
+        db.commit()
+        return snapshot
+
+    version = snapshot.version
+    payloads = {t: context_payload(user, snapshot, t) for t in types}
+    db.commit()
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(settings.PROFILE_CONTEXT_WORKERS, len(types))), thread_name_prefix="profile-context"
+    ) as executor:
+        futures = {
+            t: executor.submit(gemini_service.generate_tavus_interviewer_context, payload)
+            for t, payload in payloads.items()
+        }
+    for interview_type, future in futures.items():
+        try:
+            store_context(snapshot, interview_type, future.result(), version)
+        except Exception:
+            logger.exception("Could not pre-render %s context for user %s", interview_type, user.user_id)
+    db.commit()
+    return snapshot
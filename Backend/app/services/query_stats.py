@@ -0,0 +1,165 @@
+"""Per-request SQL statement accounting and N+1 detection.
+
+Every statement the engine runs is passed through `metrics.statement_hooks`
+and added to the stats of the request currently being served. Sync endpoints
+run in a thread pool that copies the request context, so their statements
+are counted too; work handed to other executors is not.
+
+In dev mode the totals are returned as X-DB-Statements / X-DB-Time-Ms
+headers. Requests over the configured limits, or repeating one SELECT at
+least SQL_REPEATED_STATEMENT_THRESHOLD times (the lazy-load-in-a-loop
+pattern), are logged.
+"""
+
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from ..core_config import get_settings
+from . import metrics
+from .metrics import route_template, statement_operation
+
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """Statements and DB time accumulated for one request (or capture block)."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Dict[str, int] = {}
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        key = " ".join(statement.split())
+        self.statements[key] = self.statements.get(key, 0) + 1
+
+    @property
+    def milliseconds(self) -> float:
+        return self.seconds * 1000
+
+    def repeated(self, threshold: Optional[int] = None) -> List[Tuple[str, int]]:
+        """SELECTs issued at least `threshold` times, most repeated first.
+
+        Only reads are considered: flushes legitimately repeat one INSERT or
+        UPDATE per row, while a repeated SELECT is a lazy load in a loop.
+        """
+
+        threshold = threshold or settings.SQL_REPEATED_STATEMENT_THRESHOLD
+        hits = [
+            (statement, count)
+            for statement, count in self.statements.items()
+            if count >= threshold and statement_operation(statement) == "SELECT"
+        ]
+        return sorted(hits, key=lambda item: -item[1])
+
+    def assert_no_repeats(self, threshold: Optional[int] = None) -> None:
+        hits = self.repeated(threshold)
+        if hits:
+            details = "\n".join(f"  {count}x {statement}" for statement, count in hits)
+            raise AssertionError(f"Repeated identical statements (likely N+1):\n{details}")
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+_observers: List[Callable[[str, QueryStats], None]] = []
+
+
+def record(statement: str, seconds: float) -> None:
+    """Called for every executed statement; a no-op outside a tracked request."""
+
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, seconds)
+
+
+metrics.statement_hooks.append(record)
+
+
+@contextmanager
+def capture() -> Iterator[QueryStats]:
+    """Collect statements issued by code running in the current context."""
+
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def captured_requests() -> Iterator[List[Tuple[str, QueryStats]]]:
+    """Collect (route, stats) for every request completed inside the block."""
+
+    captured: List[Tuple[str, QueryStats]] = []
+    observer = lambda route, stats: captured.append((route, stats))
+    _observers.append(observer)
+    try:
+        yield captured
+    finally:
+        _observers.remove(observer)
+
+
+def assert_no_n_plus_one(client, method: str, url: str, threshold: Optional[int] = None, **kwargs):
+    """Test helper: issue a request and fail if it repeats an identical SELECT.
+
+    `client` is a TestClient (or anything with a compatible `request`).
+    Returns the response for further assertions.
+    """
+
+    with captured_requests() as captured:
+        response = client.request(method, url, **kwargs)
+    for route, stats in captured:
+        try:
+            stats.assert_no_repeats(threshold)
+        except AssertionError as e:
+            raise AssertionError(f"{method} {route}: {e}") from None
+    return response
+
+
+def _report(method: str, route: str, stats: QueryStats) -> None:
+    for observer in list(_observers):
+        observer(route, stats)
+
+    if stats.count > settings.SQL_REQUEST_MAX_STATEMENTS or stats.milliseconds > settings.SQL_REQUEST_MAX_DB_MS:
+        logger.warning(
+            "%s %s issued %d SQL statements taking %.1f ms", method, route, stats.count, stats.milliseconds
+        )
+    for statement, count in stats.repeated()[:3]:
+        logger.warning("%s %s repeated a statement %d times (N+1?): %s", method, route, count, statement[:300])
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware giving each HTTP request its own QueryStats."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current.set(stats)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and settings.SQL_STATS_HEADERS:
+                # Statements issued while a streaming body is sent are logged but not in the headers
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-statements", str(stats.count).encode()))
+                headers.append((b"x-db-time-ms", f"{stats.milliseconds:.1f}".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            _report(scope["method"], route_template(scope), stats)
@@ -0,0 +1,369 @@
+import logging
+import re
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..core_config import get_settings
+from .gemini_service import gemini_service
+from .metrics import record_cache
+from .question_dedupe import jaccard
+
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+# session.info key for bank rows flushed in the current transaction
+_PENDING = "question_bank_pending"
+
+# Ids skipped over by a refresh may still be committed by a transaction that
+# was open at the time (sequences hand out ids before commit). They are
+# re-checked on every refresh for this long; at most _MAX_GAP_IDS are tracked.
+_GAP_TTL_SECONDS = 600.0
+_MAX_GAP_IDS = 1000
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "did", "do", "for", "from", "how",
+    "i", "in", "is", "it", "me", "of", "on", "or", "that", "the", "this", "to", "was", "we",
+    "what", "when", "where", "which", "who", "why", "with", "you", "your",
+}
+
+# Small curated starter set, inserted on first startup when the bank is empty.
+SEED_QUESTIONS: List[Tuple[str, str, str]] = [
+    ("Technical", "Walk me through the architecture of a backend service you built. What trade-offs did you make?", "backend,python,java,api,system design"),
+    ("Technical", "How would you design a REST API for a feature with heavy read traffic? How would you cache it?", "api,rest,backend,caching"),
+    ("Technical", "Tell me about a React component you built that had tricky state management. How did you structure it?", "react,javascript,frontend,typescript"),
+    ("Technical", "How do you find and fix a slow SQL query in production?", "sql,database,postgresql,performance"),
+    ("Technical", "Describe how you would train, validate and deploy a machine learning model for a real product.", "machine learning,python,data science,ml"),
+    ("Technical", "How do you structure automated tests for a Python codebase so they stay fast and reliable?", "python,testing,pytest"),
+    ("Technical", "Explain how you would containerize and deploy a web application with zero downtime.", "docker,kubernetes,devops,cloud,aws"),
+    ("Technical", "What data structure would you use to implement an LRU cache, and why?", "data structures,algorithms,dsa"),
+    ("Behavioral", "Tell me about a time you disagreed with a teammate on a technical decision. How did you resolve it?", "teamwork,communication"),
+    ("Behavioral", "Describe a project that did not go as planned. What did you learn from it?", "ownership,learning"),
+    ("Behavioral", "Tell me about a time you had to deliver under a tight deadline. How did you prioritize?", "prioritization,deadlines"),
+    ("HR", "Why are you interested in this role, and where do you see yourself in the next few years?", "motivation,career"),
+    ("HR", "To start, could you briefly introduce yourself and explain why you are a good fit for this role?", "introduction"),
+]
+
+
+def _tokens(text: str) -> List[str]:
+    return [w for w in _TOKEN_RE.findall(text.lower()) if w not in _STOPWORDS]
+
+
+class HashingTfidfIndex:
+    """Dense TF-IDF over hashed features, searched with one matrix-vector product.
+
+    Terms are hashed into a fixed number of signed buckets, so the vocabulary
+    never needs to be stored and new documents can be appended at any time.
+    IDF weighting and row normalization are recomputed lazily on the first
+    search after an insert.
+    """
+
+    def __init__(self, dims: int) -> None:
+        self.dims = dims
+        self._tf = np.zeros((0, dims), dtype=np.float32)
+        self._df = np.zeros(dims, dtype=np.float32)
+        self._size = 0
+        self._weighted: Optional[np.ndarray] = None
+        self._idf: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def vectorize(self, text: str) -> np.ndarray:
+        vec = np.zeros(self.dims, dtype=np.float32)
+        for token in _tokens(text):
+            h = zlib.crc32(token.encode("utf-8"))
+            vec[h % self.dims] += 1.0 if (h >> 31) & 1 else -1.0
+        # Sublinear term frequency keeps repeated words from dominating
+        return np.sign(vec) * np.log1p(np.abs(vec))
+
+    def add(self, text: str) -> int:
+        self.add_many([text])
+        return self._size - 1
+
+    def add_many(self, texts: Sequence[str]) -> None:
+        """Append documents in one block; the matrix grows geometrically."""
+
+        if not texts:
+            return
+        rows = np.vstack([self.vectorize(text) for text in texts])
+        end = self._size + len(rows)
+        if end > self._tf.shape[0]:
+            grown = np.zeros((max(64, end, self._size * 2), self.dims), dtype=np.float32)
+            grown[: self._size] = self._tf[: self._size]
+            self._tf = grown
+        self._tf[self._size : end] = rows
+        self._df += np.count_nonzero(rows, axis=0)
+        self._size = end
+        self._weighted = None
+
+    def _prepare(self) -> None:
+        n = self._size
+        self._idf = np.log((1.0 + n) / (1.0 + self._df)).astype(np.float32) + 1.0
+        weighted = self._tf[:n] * self._idf
+        norms = np.linalg.norm(weighted, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self._weighted = weighted / norms
+
+    def search(self, text: str, k: int = 5, mask: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """Return up to k (row, cosine score) pairs, best first."""
+
+        if not self._size:
+            return []
+        if self._weighted is None:
+            self._prepare()
+        query = self.vectorize(text) * self._idf
+        norm = float(np.linalg.norm(query))
+        if norm == 0:
+            return []
+        scores = self._weighted @ (query / norm)
+        if mask is not None:
+            scores = np.where(mask[: self._size], scores, -1.0)
+        k = min(k, self._size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(i), float(scores[i])) for i in top if scores[i] > 0]
+
+
+class QuestionBank:
+    """Process-local retrieval index over the `question_bank` table.
+
+    Loaded at startup and topped up incrementally: a refresh reads the rows
+    above the highest id seen so far, plus ids it skipped over recently that
+    may still be committed late, so questions added by other workers appear
+    within QUESTION_BANK_REFRESH_SECONDS without rescanning the table.
+    Questions added through `add()` are indexed when their transaction
+    commits; a rollback leaves the index untouched.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._index = HashingTfidfIndex(settings.QUESTION_BANK_DIMENSIONS)
+        self._rows: List[Dict[str, Any]] = []
+        # Category id per row; a buffer that grows like the index matrix
+        self._categories = np.zeros(0, dtype=np.int64)
+        self._known: set = set()
+        self._max_seen = 0
+        self._gaps: Dict[int, float] = {}  # skipped id -> when it was first skipped
+        self._last_refresh = 0.0
+
+    def seed_if_empty(self, db: Session) -> None:
+        if db.query(models.BankQuestion.bank_question_id).first() is not None:
+            return
+        for category_name, text, tags in SEED_QUESTIONS:
+            db.add(
+                models.BankQuestion(
+                    category_id=get_or_create_category(db, category_name).category_id,
+                    question_text=text,
+                    tags=tags,
+                    source="curated",
+                )
+            )
+        db.commit()
+
+    def refresh(self, db: Session, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._last_refresh < settings.QUESTION_BANK_REFRESH_SECONDS:
+            return
+        BQ = models.BankQuestion
+        with self._lock:
+            max_seen, gaps = self._max_seen, list(self._gaps)
+        columns = (BQ.bank_question_id, BQ.question_text, BQ.tags, BQ.category_id)
+        rows = db.query(*columns).filter(BQ.bank_question_id > max_seen).order_by(BQ.bank_question_id).all()
+        if gaps:
+            rows += db.query(*columns).filter(BQ.bank_question_id.in_(gaps)).all()
+        with self._lock:
+            self._append_many(rows)
+            self._track_gaps(max_seen, [row[0] for row in rows], now)
+            self._last_refresh = now
+
+    def _track_gaps(self, max_seen: int, loaded: List[int], now: float) -> None:
+        for pk in loaded:
+            self._gaps.pop(pk, None)
+        newest = max(loaded, default=max_seen)
+        if newest > max_seen:
+            loaded_set = set(loaded)
+            first = max(max_seen + 1, newest - _MAX_GAP_IDS)
+            for pk in range(first, newest):
+                if pk not in loaded_set and pk not in self._known:
+                    self._gaps.setdefault(pk, now)
+        self._max_seen = max(self._max_seen, newest)
+        expired = [pk for pk, since in self._gaps.items() if now - since > _GAP_TTL_SECONDS]
+        for pk in expired:
+            del self._gaps[pk]
+        if len(self._gaps) > _MAX_GAP_IDS:
+            for pk in sorted(self._gaps)[: len(self._gaps) - _MAX_GAP_IDS]:
+                del self._gaps[pk]
+
+    def _append_many(self, rows: Iterable[Tuple[int, str, Optional[str], Optional[int]]]) -> None:
+        """Index (id, text, tags, category_id) rows not indexed yet, as one block."""
+
+        fresh: Dict[int, Tuple[int, str, Optional[str], Optional[int]]] = {}
+        for row in rows:
+            if row[0] not in self._known:
+                fresh.setdefault(row[0], tuple(row))
+        if not fresh:
+            return
+        batch = list(fresh.values())
+        self._index.add_many([f"{text} {tags or ''}" for _, text, tags, _ in batch])
+
+        start, end = len(self._rows), len(self._rows) + len(batch)
+        if end > len(self._categories):
+            grown = np.zeros(max(64, end, start * 2), dtype=np.int64)
+            grown[:start] = self._categories[:start]
+            self._categories = grown
+        self._categories[start:end] = [category_id or 0 for *_, category_id in batch]
+        self._rows.extend(
+            {"bank_question_id": pk, "question_text": text, "category_id": category_id}
+            for pk, text, _, category_id in batch
+        )
+        self._known.update(fresh)
+
+    def _index_committed(self, session: Session) -> None:
+        pending = session.info.pop(_PENDING, None)
+        if pending:
+            with self._lock:
+                # Rows flushed inside a savepoint that rolled back are transient again
+                self._append_many(row for state, *row in pending if not state.transient)
+
+    def search(
+        self, db: Session, query: str, k: int = 5, category_id: Optional[int] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        self.refresh(db)
+        with self._lock:
+            mask = None
+            categories = self._categories[: len(self._rows)]
+            if category_id is not None and bool((categories == category_id).any()):
+                mask = categories == category_id
+            hits = self._index.search(query, k, mask)
+            return [(self._rows[i], score) for i, score in hits]
+
+    def add(
+        self,
+        db: Session,
+        question_text: str,
+        category_name: Optional[str] = None,
+        tags: Optional[str] = None,
+        source: str = "curated",
+    ) -> models.BankQuestion:
+        """Insert a question into the bank (flushed, not committed).
+
+        It is indexed once the session commits.
+        """
+
+        category = get_or_create_category(db, category_name) if category_name else None
+        bank_question = models.BankQuestion(
+            category_id=category.category_id if category else None,
+            question_text=question_text,
+            tags=tags,
+            source=source,
+        )
+        db.add(bank_question)
+        db.flush()
+        db.info.setdefault(_PENDING, []).append(
+            (inspect(bank_question), bank_question.bank_question_id, question_text, tags, bank_question.category_id)
+        )
+        return bank_question
+
+    def match(self, db: Session, candidate_profile: Dict[str, Any]) -> Optional[Tuple[str, Optional[int]]]:
+        """Best bank question for this candidate, or None when confidence is low.
+
+        Returns (question_text, category_id). No LLM calls are made here.
+        """
+
+        interview_type = candidate_profile.get("interview_type")
+        role = candidate_profile.get("role") or ""
+        skills = candidate_profile.get("skills") or []
+        category = find_category(db, interview_type) if interview_type else None
+        category_id = category.category_id if category else None
+
+        # The interview type is applied as a category filter, not as query text
+        query = " ".join([role, " ".join(skills)])
+        hits = self.search(db, query, k=1, category_id=category_id) if query.strip() else []
+        if not hits or hits[0][1] < settings.QUESTION_BANK_MIN_SCORE:
+            record_cache("question_bank", False)
+            return None
+        record_cache("question_bank", True)
+        row, score = hits[0]
+        logger.info("Question bank hit %s (score %.2f)", row["bank_question_id"], score)
+        return row["question_text"], row["category_id"] or category_id
+
+    def remember(self, db: Session, question_text: str, candidate_profile: Dict[str, Any]) -> Optional[int]:
+        """Store a freshly generated question for reuse; returns its category_id."""
+
+        interview_type = candidate_profile.get("interview_type")
+        role = candidate_profile.get("role") or ""
+        skills = candidate_profile.get("skills") or []
+
+        # Skip near-duplicates of what the bank already holds
+        for row, _ in self.search(db, question_text, k=3):
+            if jaccard(question_text, row["question_text"]) >= settings.QUESTION_DEDUPE_THRESHOLD:
+                return row["category_id"]
+        # ...and of questions added earlier in this transaction, not indexed yet
+        for state, _, text, _, category_id in db.info.get(_PENDING, ()):
+            if not state.transient and jaccard(question_text, text) >= settings.QUESTION_DEDUPE_THRESHOLD:
+                return category_id
+
+        bank_question = self.add(
+            db,
+            question_text,
+            category_name=interview_type,
+            tags=",".join([role] + list(skills)) if role or skills else None,
+            source="generated",
+        )
+        return bank_question.category_id
+
+    def first_question(self, db: Session, candidate_profile: Dict[str, Any]) -> Tuple[str, Optional[int]]:
+        """Pick the opening question, preferring the bank over a live LLM call.
+
+        Returns (question_text, category_id). Generated questions are stored
+        back into the bank so the next similar candidate can reuse them.
+        """
+
+        matched = self.match(db, candidate_profile)
+        if matched:
+            text, category_id = matched
+            if settings.QUESTION_BANK_PERSONALIZE:
+                text = gemini_service.personalize_question(text, candidate_profile)
+            return text, category_id
+
+        text = gemini_service.generate_question(candidate_profile)
+        return text, self.remember(db, text, candidate_profile)
+
+
+def find_category(db: Session, name: str) -> Optional[models.Category]:
+    return db.query(models.Category).filter(models.Category.category_name.ilike(name.strip())).first()
+
+
+def get_or_create_category(db: Session, name: str) -> models.Category:
+    category = find_category(db, name)
+    if category is None:
+        category = models.Category(category_name=name.strip())
+        db.add(category)
+        db.flush()
+    return category
+
+
+question_bank = QuestionBank()
+
+
+@event.listens_for(Session, "after_commit")
+def _index_committed(session: Session) -> None:
+    question_bank._index_committed(session)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_pending(session: Session) -> None:
+    session.info.pop(_PENDING, None)
@@ -0,0 +1,120 @@
+import re
+import zlib
+from typing import List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..core_config import get_settings
+
+
+settings = get_settings()
+
+SHINGLE_SIZE = 5
+_MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+
+_rng = np.random.RandomState(1)
+_NUM_PERM = settings.QUESTION_LSH_BANDS * settings.QUESTION_LSH_ROWS
+_PERM_A = _rng.randint(1, (1 << 31) - 1, size=_NUM_PERM).astype(np.uint64)
+_PERM_B = _rng.randint(0, (1 << 31) - 1, size=_NUM_PERM).astype(np.uint64)
+
+
+def shingles(text: str) -> Set[str]:
+    """Character shingles of the normalized text (case and punctuation ignored)."""
+
+    normalized = " ".join(_NON_WORD_RE.sub(" ", (text or "").lower()).split())
+    if len(normalized) <= SHINGLE_SIZE:
+        return {normalized} if normalized else set()
+    return {normalized[i : i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+
+
+def jaccard(a: str, b: str) -> float:
+    sa, sb = shingles(a), shingles(b)
+    if not sa or not sb:
+        return 0.0
+    return len(sa & sb) / len(sa | sb)
+
+
+def signature(text: str) -> np.ndarray:
+    """MinHash signature using universal hashing (a*x + b) mod p per permutation."""
+
+    hashed = np.fromiter(
+        (zlib.crc32(s.encode("utf-8")) for s in shingles(text)), dtype=np.uint64
+    ) % _MERSENNE_PRIME
+    if hashed.size == 0:
+        return np.full(_NUM_PERM, _MERSENNE_PRIME, dtype=np.uint64)
+    return ((np.outer(hashed, _PERM_A) + _PERM_B) % _MERSENNE_PRIME).min(axis=0)
+
+
+def band_keys(sig: np.ndarray) -> List[Tuple[int, int]]:
+    rows = settings.QUESTION_LSH_ROWS
+    return [
+        (band, zlib.crc32(sig[band * rows : (band + 1) * rows].tobytes()))
+        for band in range(settings.QUESTION_LSH_BANDS)
+    ]
+
+
+def find_similar(
+    db: Session,
+    text: str,
+    limit: int = 10,
+    threshold: float = 0.0,
+    exclude_id: Optional[int] = None,
+) -> List[Tuple[int, float]]:
+    """Canonical questions sharing an LSH bucket with `text`, ranked by Jaccard.
+
+    Cost depends on the bucket sizes, not on the number of questions stored.
+    """
+
+    keys = band_keys(signature(text))
+    B = models.QuestionBand
+    # OR of equality pairs (rather than a row-value IN) so SQLite also probes
+    # the (band, bucket) primary key instead of scanning the table
+    candidate_ids = {
+        qid
+        for (qid,) in db.query(B.question_id).filter(
+            or_(*(and_(B.band == band, B.bucket == bucket) for band, bucket in keys))
+        )
+    }
+    candidate_ids.discard(exclude_id)
+    if not candidate_ids:
+        return []
+
+    rows = (
+        db.query(models.Question.question_id, models.Question.question_text)
+        .filter(models.Question.question_id.in_(candidate_ids))
+        .all()
+    )
+    scored = [(qid, jaccard(text, other)) for qid, other in rows]
+    scored = [item for item in scored if item[1] >= threshold]
+    scored.sort(key=lambda item: (-item[1], item[0]))
+    return scored[:limit]
+
+
+def index_question(db: Session, question: models.Question) -> Optional[int]:
+    """Dedupe a freshly flushed question against earlier ones.
+
+    Near-duplicates get `canonical_question_id` set and stay out of the index;
+    otherwise the question becomes canonical and its band buckets are added.
+    Returns the canonical id it was linked to, if any. Nothing is committed.
+    """
+
+    matches = find_similar(
+        db,
+        question.question_text,
+        limit=1,
+        threshold=settings.QUESTION_DEDUPE_THRESHOLD,
+        exclude_id=question.question_id,
+    )
+    if matches:
+        question.canonical_question_id = matches[0][0]
+        return question.canonical_question_id
+
+    db.add_all(
+        models.QuestionBand(band=band, bucket=bucket, question_id=question.question_id)
+        for band, bucket in band_keys(signature(question.question_text))
+    )
+    return None
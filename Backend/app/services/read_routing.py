@@ -0,0 +1,173 @@
+"""Route read-only endpoints to the replica, with read-your-writes stickiness.
+
+`get_read_db` hands out a replica session unless the caller wrote something
+within the last READ_YOUR_WRITES_SECONDS, in which case it reads from the
+primary so it never sees data older than its own write. A write is any
+commit that flushed changes during the request. A cookie carries the
+deadline, so it holds across workers for clients that send cookies;
+callers with a bearer token are also remembered in-process by token
+subject. Anonymous callers are keyed by peer address only when
+READ_YOUR_WRITES_BY_IP says that address is trustworthy: behind a proxy
+every client shares one, and one write would pin all reads to the primary.
+
+Without DATABASE_REPLICA_URL read sessions are primary sessions and the
+middleware is not installed.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from ..core_config import get_settings
+from ..db import ReadSessionLocal, SessionLocal
+from .auth_tokens import InvalidToken, verify_token
+
+
+settings = get_settings()
+
+STICKY_COOKIE = "db_primary_until"
+MAX_TRACKED_CLIENTS = 50_000
+
+
+class _RequestState:
+    __slots__ = ("client", "wrote")
+
+    def __init__(self, client: Optional[str]) -> None:
+        self.client = client
+        self.wrote = False
+
+
+_state: ContextVar[Optional[_RequestState]] = ContextVar("read_routing_state", default=None)
+
+
+class RecentWriters:
+    """client key -> time until which its reads go to the primary."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._until: "OrderedDict[str, float]" = OrderedDict()
+
+    def mark(self, client: str) -> None:
+        with self._lock:
+            self._until[client] = time.monotonic() + settings.READ_YOUR_WRITES_SECONDS
+            self._until.move_to_end(client)
+            while len(self._until) > MAX_TRACKED_CLIENTS:
+                self._until.popitem(last=False)
+
+    def active(self, client: str) -> bool:
+        with self._lock:
+            until = self._until.get(client)
+            if until is None:
+                return False
+            if until <= time.monotonic():
+                del self._until[client]
+                return False
+            return True
+
+
+recent_writers = RecentWriters()
+
+
+def client_key(headers, client) -> Optional[str]:
+    """Identify the caller: bearer token subject when valid, else (if trusted) its address."""
+
+    auth = headers.get("authorization") or ""
+    scheme, _, token = auth.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            return f"user:{verify_token(token)}"
+        except InvalidToken:
+            pass
+    if settings.READ_YOUR_WRITES_BY_IP and client:
+        return f"ip:{client[0]}"
+    return None
+
+
+def prefers_primary(request: Request) -> bool:
+    try:
+        if float(request.cookies.get(STICKY_COOKIE, 0)) > time.time():
+            return True
+    except ValueError:
+        pass
+    client = client_key(request.headers, request.client)
+    return client is not None and recent_writers.active(client)
+
+
+def get_read_db(request: Request):
+    """Session dependency for read-only routes (replica unless the caller just wrote)."""
+
+    factory = SessionLocal if ReadSessionLocal is SessionLocal or prefers_primary(request) else ReadSessionLocal
+    db = factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# --- Write tracking ---------------------------------------------------------------
+
+
+@event.listens_for(Session, "before_flush")
+def _refuse_replica_writes(session: Session, flush_context, instances) -> None:
+    if session.info.get("read_only"):
+        raise RuntimeError("Write attempted on a read-only (replica) session")
+
+
+@event.listens_for(Session, "after_flush")
+def _flag_write(session: Session, flush_context) -> None:
+    session.info["rw_wrote"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _record_write(session: Session) -> None:
+    if session.info.pop("rw_wrote", False):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+            if state.client is not None:
+                recent_writers.mark(state.client)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_write(session: Session) -> None:
+    session.info.pop("rw_wrote", None)
+
+
+class ReadYourWritesMiddleware:
+    """ASGI middleware tracking whether a request committed writes.
+
+    Writers get a cookie with the primary-read deadline.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = {k.decode("latin-1"): v.decode("latin-1") for k, v in scope.get("headers", [])}
+        state = _RequestState(client_key(headers, scope.get("client")))
+        token = _state.set(state)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and state.wrote:
+                until = time.time() + settings.READ_YOUR_WRITES_SECONDS
+                cookie = (
+                    f"{STICKY_COOKIE}={until:.0f}; Max-Age={settings.READ_YOUR_WRITES_SECONDS}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message = {**message, "headers": [*message.get("headers", []), (b"set-cookie", cookie.encode())]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _state.reset(token)
@@ -0,0 +1,121 @@
+"""Additive upgrades for databases created by an older version of the models.
+
+`create_all()` only creates missing tables, so columns and indexes added to
+existing tables never reach a database that already has them. `upgrade()`
+closes that gap for the changes this codebase makes:
+
+- missing columns are added with ALTER TABLE ... ADD COLUMN;
+- missing indexes are created, and indexes whose columns changed are
+  dropped and recreated.
+
+Columns that cannot be added in place (NOT NULL without a server default)
+raise SchemaOutOfDate at startup, naming the column, instead of failing on
+the first query that touches it. Column type changes are not migrated: the
+CompressedText columns read plain text stored before them (see
+text_codec.py), and SQLite stores the compressed bytes in a TEXT column
+as they are.
+
+CLI usage (from the Backend directory):
+
+    python -m app.services.schema_upgrade           # apply
+    python -m app.services.schema_upgrade --check   # list pending changes only
+"""
+
+import argparse
+import json
+import logging
+import sys
+from typing import List, Optional
+
+from sqlalchemy import MetaData, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateColumn, CreateIndex
+
+
+logger = logging.getLogger(__name__)
+
+
+class SchemaOutOfDate(RuntimeError):
+    """The database lacks something upgrade() cannot add by itself."""
+
+
+def pending(engine: Engine, metadata: MetaData) -> List[str]:
+    """DDL statements needed to bring existing tables up to `metadata`.
+
+    Raises SchemaOutOfDate for columns that cannot be added in place.
+    """
+
+    inspector = inspect(engine)
+    preparer = engine.dialect.identifier_preparer
+    statements: List[str] = []
+    blocked: List[str] = []
+
+    for table in metadata.sorted_tables:
+        if not inspector.has_table(table.name, schema=table.schema):
+            continue  # create_all() creates it with everything
+        qualified = preparer.format_table(table)
+        existing = {c["name"] for c in inspector.get_columns(table.name, schema=table.schema)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            if not column.nullable and column.server_default is None:
+                blocked.append(f"{table.fullname}.{column.name}")
+                continue
+            ddl = CreateColumn(column).compile(dialect=engine.dialect)
+            statements.append(f"ALTER TABLE {qualified} ADD COLUMN {ddl}")
+
+        indexes = {i["name"]: i["column_names"] for i in inspector.get_indexes(table.name, schema=table.schema)}
+        for index in sorted(table.indexes, key=lambda i: i.name):
+            columns = [c.name for c in index.columns]
+            if indexes.get(index.name) == columns:
+                continue
+            if index.name in indexes:
+                name = preparer.format_index(index)
+                if table.schema:
+                    name = f"{preparer.quote_schema(table.schema)}.{name}"
+                statements.append(f"DROP INDEX {name}")
+            statements.append(str(CreateIndex(index).compile(dialect=engine.dialect)))
+
+    if blocked:
+        raise SchemaOutOfDate(
+            "Columns missing from the database cannot be added automatically "
+            f"(NOT NULL without a server default): {', '.join(blocked)}"
+        )
+    return statements
+
+
+def upgrade(engine: Engine, metadata: MetaData) -> int:
+    """Apply pending() in one transaction; returns the number of statements run."""
+
+    statements = pending(engine, metadata)
+    if statements:
+        with engine.begin() as conn:
+            for statement in statements:
+                logger.info("Schema upgrade: %s", statement)
+                conn.exec_driver_sql(statement)
+    return len(statements)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Add missing columns and indexes to an existing database.")
+    parser.add_argument("--check", action="store_true", help="only print the statements that would run")
+    args = parser.parse_args(argv)
+
+    from .. import models  # noqa: F401  (registers the tables on Base.metadata)
+    from ..db import Base, engine
+
+    try:
+        if args.check:
+            statements = pending(engine, Base.metadata)
+            print("\n".join(statements) if statements else "Schema is up to date")
+            return 1 if statements else 0
+        Base.metadata.create_all(bind=engine)
+        print(json.dumps({"event": "done", "statements": upgrade(engine, Base.metadata)}))
+    except SchemaOutOfDate as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
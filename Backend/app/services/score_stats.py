@@ -0,0 +1,95 @@
+from typing import Optional
+
+from sqlalchemy import case, func, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .. import models
+
+
+def _running_min(column, value: int):
+    return case((column.is_(None), value), (column > value, value), else_=column)
+
+
+def _running_max(column, value: int):
+    return case((column.is_(None), value), (column < value, value), else_=column)
+
+
+def record_response_scores(
+    db: Session, interview_id: int, relevance_score: int, confidence_level: int
+) -> tuple[models.InterviewStats, Optional[int]]:
+    """Fold one scored response into the interview's running aggregates.
+
+    The increment is a single UPDATE evaluated by the database, so concurrent
+    submissions for the same interview serialize on the row lock instead of
+    overwriting each other. Nothing is committed here: the caller commits the
+    response and the aggregate together.
+
+    Returns the refreshed stats row and the overall score as it stood right
+    before this response (None if there was none, or if the row had to be
+    rebuilt from history).
+    """
+
+    stats_table = models.InterviewStats.__table__
+    c = stats_table.c
+    result = db.execute(
+        update(stats_table)
+        .where(c.interview_id == interview_id)
+        .values(
+            response_count=c.response_count + 1,
+            relevance_sum=c.relevance_sum + relevance_score,
+            confidence_sum=c.confidence_sum + confidence_level,
+            relevance_min=_running_min(c.relevance_min, relevance_score),
+            relevance_max=_running_max(c.relevance_max, relevance_score),
+            confidence_min=_running_min(c.confidence_min, confidence_level),
+            confidence_max=_running_max(c.confidence_max, confidence_level),
+        )
+    )
+
+    if result.rowcount == 0:
+        # Interview created before aggregates existed: build the row once from
+        # the stored responses (which already include the flushed new one).
+        try:
+            with db.begin_nested():
+                db.add(_stats_from_responses(db, interview_id))
+        except IntegrityError:
+            # Another request created the row first; retry as an increment.
+            return record_response_scores(db, interview_id, relevance_score, confidence_level)
+        return db.get(models.InterviewStats, interview_id, populate_existing=True), None
+
+    stats = db.get(models.InterviewStats, interview_id, populate_existing=True)
+    previous = None
+    if stats.response_count > 1:
+        previous = int(
+            (stats.relevance_sum - relevance_score + stats.confidence_sum - confidence_level)
+            / (2 * (stats.response_count - 1))
+        )
+    return stats, previous
+
+
+def _stats_from_responses(db: Session, interview_id: int) -> models.InterviewStats:
+    R = models.Response
+    row = (
+        db.query(
+            func.count(R.response_id),
+            func.coalesce(func.sum(R.relevance_score), 0),
+            func.coalesce(func.sum(R.confidence_level), 0),
+            func.min(R.relevance_score),
+            func.max(R.relevance_score),
+            func.min(R.confidence_level),
+            func.max(R.confidence_level),
+        )
+        .join(models.Question, models.Question.question_id == R.question_id)
+        .filter(models.Question.interview_id == interview_id)
+        .one()
+    )
+    return models.InterviewStats(
+        interview_id=interview_id,
+        response_count=row[0],
+        relevance_sum=row[1],
+        confidence_sum=row[2],
+        relevance_min=row[3],
+        relevance_max=row[4],
+        confidence_min=row[5],
+        confidence_max=row[6],
+    )
@@ -0,0 +1,315 @@
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+from sqlalchemy import event, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..core_config import get_settings
+from . import profile_snapshot
+from .metrics import record_cache
+
+
+settings = get_settings()
+
+_KEY_STRIP_RE = re.compile(r"[^a-z0-9+#]+")
+_NON_DIGIT_RE = re.compile(r"[^0-9]+")
+
+MAX_FUZZY_CACHE = 10_000
+
+# Common spellings -> canonical display name. Keys are already normalized.
+BUILTIN_ALIASES: Dict[str, str] = {
+    "reactjs": "React",
+    "nodejs": "Node.js",
+    "node": "Node.js",
+    "js": "JavaScript",
+    "es6": "JavaScript",
+    "ts": "TypeScript",
+    "golang": "Go",
+    "postgres": "PostgreSQL",
+    "psql": "PostgreSQL",
+    "k8s": "Kubernetes",
+    "py": "Python",
+    "python3": "Python",
+    "ml": "Machine Learning",
+    "dl": "Deep Learning",
+    "nlp": "Natural Language Processing",
+    "cpp": "C++",
+    "csharp": "C#",
+    "vue": "Vue.js",
+    "vuejs": "Vue.js",
+    "nextjs": "Next.js",
+    "angularjs": "Angular",
+    "mongo": "MongoDB",
+    "sklearn": "scikit-learn",
+    "tf": "TensorFlow",
+    "gcp": "Google Cloud",
+    "amazonwebservices": "AWS",
+}
+
+
+class SkillRef(NamedTuple):
+    skill_id: int
+    skill_name: str
+
+
+def normalize_key(name: str) -> str:
+    """Spelling-insensitive key: lowercase, separators and dots removed.
+
+    "React.js", "ReactJS" and "react js" all become "reactjs".
+    """
+
+    return _KEY_STRIP_RE.sub("", (name or "").lower())
+
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance, giving up early once it exceeds `limit`."""
+
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        current = [i]
+        for j, cb in enumerate(b, start=1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class SkillIndex:
+    """Process-local canonical skill dictionary.
+
+    Resolves a raw skill name to an existing `Skill` with no DB round trip:
+    exact normalized key, then alias (stored or built in), then a trigram +
+    edit-distance fuzzy match for long keys. Fuzzy hits are cached in process
+    only, never stored as aliases, since short distinct names ("NestJS",
+    "Next.js") are often one edit apart. The whole table is loaded on first use and
+    reloaded when another worker adds skills (checked at most every
+    SKILL_INDEX_REFRESH_SECONDS) or when a session that created skills rolls
+    back.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._fingerprint: tuple = ()
+        self._last_check = 0.0
+        self._by_key: Dict[str, SkillRef] = {}
+        self._by_id: Dict[int, SkillRef] = {}
+        self._aliases: Dict[str, int] = {}
+        self._fuzzy_hits: Dict[str, Optional[int]] = {}
+        self._trigram_keys: Dict[str, Set[str]] = {}
+
+    # -- loading -----------------------------------------------------------
+
+    def _db_fingerprint(self, db: Session) -> tuple:
+        skills = db.query(func.count(models.Skill.skill_id), func.max(models.Skill.skill_id)).one()
+        aliases = db.query(func.count(models.SkillAlias.alias_key)).scalar()
+        return tuple(skills) + (aliases,)
+
+    def load(self, db: Session) -> None:
+        fingerprint = self._db_fingerprint(db)
+        skills = db.query(models.Skill.skill_id, models.Skill.skill_name).order_by(models.Skill.skill_id).all()
+        aliases = db.query(models.SkillAlias.alias_key, models.SkillAlias.skill_id).all()
+        with self._lock:
+            self._by_key, self._by_id, self._trigram_keys = {}, {}, {}
+            for skill_id, skill_name in skills:
+                self._register(SkillRef(skill_id, skill_name))
+            self._aliases = {key: skill_id for key, skill_id in aliases}
+            self._fuzzy_hits = {}
+            self._fingerprint = fingerprint
+            self._last_check = time.monotonic()
+            self._loaded = True
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded = False
+
+    def _ensure_fresh(self, db: Session) -> None:
+        if not self._loaded:
+            self.load(db)
+            return
+        if time.monotonic() - self._last_check < settings.SKILL_INDEX_REFRESH_SECONDS:
+            return
+        if self._db_fingerprint(db) != self._fingerprint:
+            self.load(db)
+        else:
+            self._last_check = time.monotonic()
+
+    def _register(self, ref: SkillRef) -> None:
+        key = normalize_key(ref.skill_name)
+        self._by_id[ref.skill_id] = ref
+        # First (oldest) skill wins if legacy rows collide on the same key
+        if key and key not in self._by_key:
+            self._by_key[key] = ref
+            for gram in _trigrams(key):
+                self._trigram_keys.setdefault(gram, set()).add(key)
+            # A new skill may be a better answer than a cached fuzzy hit (or miss)
+            self._fuzzy_hits = {}
+
+    def _remember(self, ref: SkillRef) -> None:
+        with self._lock:
+            self._register(ref)
+            count, max_id, aliases = self._fingerprint or (0, 0, 0)
+            self._fingerprint = (len(self._by_id), max(max_id or 0, ref.skill_id), aliases)
+
+    # -- lookup ------------------------------------------------------------
+
+    def _fuzzy(self, key: str) -> Optional[SkillRef]:
+        if len(key) < settings.SKILL_FUZZY_MIN_LENGTH:
+            return None
+        if key in self._fuzzy_hits:
+            skill_id = self._fuzzy_hits[key]
+            return self._by_id.get(skill_id) if skill_id is not None else None
+        grams = _trigrams(key)
+        limit = 1 if len(key) < 12 else 2
+        digits = _NON_DIGIT_RE.sub("", key)
+        candidates: Set[str] = set()
+        for gram in grams:
+            candidates |= self._trigram_keys.get(gram, set())
+
+        best: Optional[tuple] = None
+        for other in candidates:
+            # Typos rarely hit the first letter; differing digits are versions
+            if other[0] != key[0] or _NON_DIGIT_RE.sub("", other) != digits:
+                continue
+            if len(other) < settings.SKILL_FUZZY_MIN_LENGTH:
+                continue
+            other_grams = _trigrams(other)
+            overlap = len(grams & other_grams) / len(grams | other_grams)
+            if overlap < 0.4:
+                continue
+            distance = _edit_distance(key, other, limit)
+            if distance <= limit and (best is None or (distance, -overlap) < best[:2]):
+                best = (distance, -overlap, other)
+        ref = self._by_key[best[2]] if best else None
+        if len(self._fuzzy_hits) >= MAX_FUZZY_CACHE:
+            self._fuzzy_hits = {}
+        self._fuzzy_hits[key] = ref.skill_id if ref else None
+        return ref
+
+    def _lookup(self, key: str) -> tuple[Optional[SkillRef], Optional[str]]:
+        """Return (match, canonical name to create if none)."""
+
+        with self._lock:
+            if key in self._by_key:
+                return self._by_key[key], None
+            if key in self._aliases and self._aliases[key] in self._by_id:
+                return self._by_id[self._aliases[key]], None
+
+            canonical = BUILTIN_ALIASES.get(key)
+            if canonical is None and key.endswith("js") and key[:-2] in self._by_key:
+                return self._by_key[key[:-2]], None
+            if canonical is not None:
+                return self._by_key.get(normalize_key(canonical)), canonical
+
+            return self._fuzzy(key), None
+
+    def resolve(self, db: Session, skill_name: str) -> Optional[SkillRef]:
+        """Canonical skill for a raw name, or None if it is not known yet."""
+
+        self._ensure_fresh(db)
+        key = normalize_key(skill_name)
+        if not key:
+            return None
+        return self._lookup(key)[0]
+
+    def get_or_create(self, db: Session, skill_name: str) -> Optional[SkillRef]:
+        """Resolve a name, creating the canonical `Skill` if needed (flushed, not committed)."""
+
+        self._ensure_fresh(db)
+        key = normalize_key(skill_name)
+        if not key:
+            return None
+
+        ref, canonical = self._lookup(key)
+        record_cache("skill_index", ref is not None)
+        if ref is not None:
+            return ref
+
+        name = (canonical or skill_name).strip()[:100]
+        try:
+            with db.begin_nested():
+                skill = models.Skill(skill_name=name)
+                db.add(skill)
+                db.flush()
+        except IntegrityError:
+            # Created concurrently by another worker: pick up its row
+            skill = db.query(models.Skill).filter(models.Skill.skill_name == name).one()
+        ref = SkillRef(skill.skill_id, skill.skill_name)
+        self._remember(ref)
+        _track_new_skill(db)
+        return ref
+
+
+
+skill_index = SkillIndex()
+
+
+# Skills created in a transaction that later rolls back must not stay in the
+# index, so sessions remember whether they added any and drop it on rollback.
+def _track_new_skill(db: Session) -> None:
+    db.info["skill_index_dirty"] = True
+
+
+@event.listens_for(Session, "after_rollback")
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_index_on_rollback(session: Session, *args) -> None:
+    if session.info.pop("skill_index_dirty", False):
+        skill_index.invalidate()
+
+
+@event.listens_for(Session, "after_commit")
+def _clear_index_flag(session: Session) -> None:
+    session.info.pop("skill_index_dirty", None)
+
+
+@event.listens_for(models.Skill, "after_update")
+@event.listens_for(models.Skill, "after_delete")
+def _skill_changed(mapper, connection, target) -> None:
+    skill_index.invalidate()
+
+
+def get_or_create_skill(db: Session, skill_name: str) -> Optional[SkillRef]:
+    """Canonical skill for a raw name, created if missing (flushed, not committed)."""
+
+    return skill_index.get_or_create(db, skill_name)
+
+
+def attach_skills(db: Session, user_id: int, skill_names: Iterable[str]) -> List[str]:
+    """Link skills to a user without committing; returns the canonical skill names.
+
+    Blank names are skipped, spelling variants collapse to one skill and
+    existing links are left untouched.
+    """
+
+    linked = {
+        skill_id
+        for (skill_id,) in db.query(models.UserSkill.skill_id).filter_by(user_id=user_id).all()
+    }
+
+    names: List[str] = []
+    added = False
+    for skill_name in skill_names:
+        ref = get_or_create_skill(db, skill_name or "")
+        if ref is None:
+            continue
+        if ref.skill_id not in linked:
+            db.add(models.UserSkill(user_id=user_id, skill_id=ref.skill_id))
+            linked.add(ref.skill_id)
+            added = True
+        if ref.skill_name not in names:
+            names.append(ref.skill_name)
+    if added:
+        profile_snapshot.invalidate(db, user_id)
+    return names
@@ -6,6 +6,7 @@ import requests
 from requests import RequestException
 
 from ..core_config import get_settings
+from .metrics import track_external
 
 
 settings = get_settings()
@@ -23,7 +24,7 @@ class TavusService:
     # Use the Tavus CVI base URL that is reachable from this environment.
     # The older host "tavusapi.com" is currently responding correctly for
     # conversation creation and returns `conversation_url`.
-    BASE_URL = "https://tavusapi.com"
+    BASE_URL = settings.TAVUS_BASE_URL.rstrip("/")
 
     def __init__(self) -> None:
         logger.info("TavusService: initializing (no API call)")
@@ -56,6 +57,7 @@ class TavusService:
 
         return None, None
 
+    @track_external("tavus")
     def get_conversation(self, conversation_id: str) -> Dict[str, Any]:
         url = f"{self.BASE_URL}/v2/conversations/{conversation_id}"
         try:
@@ -68,6 +70,7 @@ class TavusService:
 
         return resp.json()
 
+    @track_external("tavus")
     def create_conversation(
         self,
         *,
@@ -128,6 +131,7 @@ class TavusService:
 
         raise RuntimeError(f"Tavus network error: {last_exc}")
 
+    @track_external("tavus")
     def send_system_message(self, conversation_id: str, content: str) -> Dict[str, Any]:
         """Send a system message to an existing conversation to provide context.
 
@@ -0,0 +1,482 @@
+"""Compressed storage for large text columns.
+
+`CompressedText` columns (resumes, answers, feedback) are stored as
+compressed bytes: one tag byte naming the format, an optional 2-byte
+dictionary id, then the payload. Codecs are zlib (raw deflate) or, with
+the optional `zstandard` package, zstd. Both can use a preset dictionary
+trained from existing rows, which is what makes short answers shrink at
+all. Values below TEXT_COMPRESSION_MIN_BYTES, or that would not get
+smaller, are stored as plain UTF-8 behind a tag byte.
+
+Dictionaries are immutable rows in `text_dictionaries`; a value names the
+one it was written with, and new writes use the newest dictionary for the
+configured codec. Rows written before this type existed are plain text
+and read back unchanged until the backfill rewrites them.
+
+PostgreSQL already compresses large values itself (TOAST), so there the
+columns stay TEXT and its tsvector search index keeps working. On SQLite
+a `text_decompress()` SQL function is registered on every connection of
+the app's engines; the candidate search view that feeds the full-text
+index reads resumes through it (the index is kept in sync by the app, see
+candidate_search.py).
+
+CLI usage (from the Backend directory):
+
+    python -m app.services.text_codec train --samples 2000
+    python -m app.services.text_codec backfill --batch-size 500
+"""
+
+import argparse
+import json
+import logging
+import re
+import sys
+import threading
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import LargeBinary, Text, bindparam, event, select, type_coerce, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.types import NullType, TypeDecorator
+
+from ..core_config import get_settings
+from . import schema_upgrade
+
+try:
+    import zstandard
+except ImportError:  # optional; zlib is always available
+    zstandard = None
+
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+ZLIB = "zlib"
+ZSTD = "zstd"
+
+# Format tags (first byte of a stored value)
+_PLAIN = 0x00
+_ZLIB = 0x01
+_ZLIB_DICT = 0x02
+_ZSTD = 0x03
+_ZSTD_DICT = 0x04
+
+_DICT_TAGS = {_ZLIB_DICT: ZLIB, _ZSTD_DICT: ZSTD}
+# zlib only looks back 32 KB, so a larger preset dictionary is wasted
+ZLIB_MAX_DICTIONARY = 32 * 1024
+
+
+class Dictionary(NamedTuple):
+    dict_id: int
+    codec: str
+    data: bytes
+
+
+def configured_codec() -> Optional[str]:
+    """Codec for new writes, or None when compression is turned off."""
+
+    codec = (settings.TEXT_COMPRESSION or "").lower()
+    if codec in ("", "none"):
+        return None
+    if codec == ZSTD and zstandard is None:
+        logger.warning("TEXT_COMPRESSION=zstd but the zstandard package is not installed; using zlib")
+        return ZLIB
+    return codec if codec in (ZLIB, ZSTD) else ZLIB
+
+
+# --- Dictionaries -----------------------------------------------------------------
+
+
+class DictionaryRegistry:
+    """In-process copy of `text_dictionaries`; loaded at startup, then on a miss."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._by_id: Dict[int, Dictionary] = {}
+        self._zstd: Dict[int, "zstandard.ZstdCompressionDict"] = {}
+
+    def load(self, db) -> None:
+        from .. import models  # models imports this module
+
+        rows = db.query(models.TextDictionary).all()
+        with self._lock:
+            for row in rows:
+                self._by_id[row.dict_id] = Dictionary(row.dict_id, row.codec, bytes(row.data))
+
+    def add(self, dictionary: Dictionary) -> None:
+        with self._lock:
+            self._by_id[dictionary.dict_id] = dictionary
+
+    def active(self, codec: str) -> Optional[Dictionary]:
+        with self._lock:
+            ids = [d.dict_id for d in self._by_id.values() if d.codec == codec]
+            return self._by_id[max(ids)] if ids else None
+
+    def get(self, dict_id: int) -> Dictionary:
+        dictionary = self._by_id.get(dict_id)
+        if dictionary is None:
+            from ..db import SessionLocal
+
+            with SessionLocal() as db:
+                self.load(db)
+            dictionary = self._by_id.get(dict_id)
+            if dictionary is None:
+                raise ValueError(f"Unknown text compression dictionary {dict_id}")
+        return dictionary
+
+    def zstd_dict(self, dictionary: Dictionary) -> "zstandard.ZstdCompressionDict":
+        cached = self._zstd.get(dictionary.dict_id)
+        if cached is None:
+            cached = zstandard.ZstdCompressionDict(dictionary.data)
+            self._zstd[dictionary.dict_id] = cached
+        return cached
+
+
+dictionaries = DictionaryRegistry()
+
+
+# --- Codec ------------------------------------------------------------------------
+
+
+def _deflate(raw: bytes, zdict: Optional[bytes]) -> bytes:
+    if zdict:
+        compressor = zlib.compressobj(settings.TEXT_COMPRESSION_LEVEL, zlib.DEFLATED, -15, zdict=zdict)
+    else:
+        compressor = zlib.compressobj(settings.TEXT_COMPRESSION_LEVEL, zlib.DEFLATED, -15)
+    return compressor.compress(raw) + compressor.flush()
+
+
+def _inflate(payload: bytes, zdict: Optional[bytes]) -> bytes:
+    decompressor = zlib.decompressobj(-15, zdict=zdict) if zdict else zlib.decompressobj(-15)
+    return decompressor.decompress(payload) + decompressor.flush()
+
+
+def _require_zstd() -> None:
+    if zstandard is None:
+        raise RuntimeError("Value is zstd-compressed but the zstandard package is not installed")
+
+
+def compress_text(
+    text: str, codec: Optional[str] = None, dictionary: Optional[Dictionary] = None, use_dictionary: bool = True
+) -> bytes:
+    """Encode `text` for storage with `codec` (default: configured) and its active dictionary."""
+
+    raw = text.encode("utf-8")
+    codec = codec or configured_codec()
+    if codec is None or len(raw) < settings.TEXT_COMPRESSION_MIN_BYTES:
+        return bytes([_PLAIN]) + raw
+    if dictionary is None and use_dictionary:
+        dictionary = dictionaries.active(codec)
+
+    if codec == ZSTD:
+        _require_zstd()
+        if dictionary is not None:
+            compressor = zstandard.ZstdCompressor(
+                level=settings.TEXT_COMPRESSION_LEVEL, dict_data=dictionaries.zstd_dict(dictionary)
+            )
+            header = bytes([_ZSTD_DICT]) + dictionary.dict_id.to_bytes(2, "big")
+        else:
+            compressor = zstandard.ZstdCompressor(level=settings.TEXT_COMPRESSION_LEVEL)
+            header = bytes([_ZSTD])
+        payload = compressor.compress(raw)
+    else:
+        if dictionary is not None:
+            header = bytes([_ZLIB_DICT]) + dictionary.dict_id.to_bytes(2, "big")
+        else:
+            header = bytes([_ZLIB])
+        payload = _deflate(raw, dictionary.data if dictionary is not None else None)
+
+    if len(header) + len(payload) >= 1 + len(raw):
+        return bytes([_PLAIN]) + raw
+    return header + payload
+
+
+def decompress_text(value) -> Optional[str]:
+    """Text of a stored value; plain strings from before compression pass through."""
+
+    if value is None or isinstance(value, str):
+        return value
+    data = bytes(value)
+    if not data:
+        return ""
+    tag = data[0]
+    if tag == _PLAIN:
+        return data[1:].decode("utf-8")
+    if tag == _ZLIB:
+        return _inflate(data[1:], None).decode("utf-8")
+    if tag == _ZSTD:
+        _require_zstd()
+        return zstandard.ZstdDecompressor().decompress(data[1:]).decode("utf-8")
+    if tag in _DICT_TAGS:
+        dictionary = dictionaries.get(int.from_bytes(data[1:3], "big"))
+        if tag == _ZLIB_DICT:
+            return _inflate(data[3:], dictionary.data).decode("utf-8")
+        _require_zstd()
+        decompressor = zstandard.ZstdDecompressor(dict_data=dictionaries.zstd_dict(dictionary))
+        return decompressor.decompress(data[3:]).decode("utf-8")
+    # Bytes without a known tag were written as plain UTF-8 by something else
+    return data.decode("utf-8")
+
+
+def stored_format(value) -> Tuple[Optional[str], Optional[int]]:
+    """(codec, dictionary id) of a stored value; (None, None) for plain text."""
+
+    if value is None or isinstance(value, str) or not value:
+        return None, None
+    tag = bytes(value[:1])[0]
+    if tag in (_ZLIB, _ZSTD):
+        return (ZLIB if tag == _ZLIB else ZSTD), None
+    if tag in _DICT_TAGS:
+        return _DICT_TAGS[tag], int.from_bytes(bytes(value[1:3]), "big")
+    return None, None
+
+
+class CompressedText(TypeDecorator):
+    """Text column stored compressed; plain TEXT on PostgreSQL."""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(Text())
+        return dialect.type_descriptor(LargeBinary())
+
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name == "postgresql":
+            return value
+        return compress_text(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None or dialect.name == "postgresql":
+            return value
+        return decompress_text(value)
+
+
+def install_sql_functions(engine: Engine) -> None:
+    """Register text_decompress() on every new SQLite connection of `engine`."""
+
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def _register(dbapi_connection, connection_record) -> None:
+        dbapi_connection.create_function("text_decompress", 1, decompress_text, deterministic=True)
+
+
+# --- Dictionary training ----------------------------------------------------------
+
+_WORD_RE = re.compile(r"\S+")
+
+
+def build_zlib_dictionary(samples: Iterable[str], size: int) -> bytes:
+    """Preset deflate dictionary: the phrases that recur across most samples.
+
+    Word n-grams (1-4 words) are scored by how many samples contain them
+    times their length. deflate reaches the end of the dictionary with the
+    shortest distances, so the most valuable phrases go last.
+    """
+
+    doc_freq: Counter = Counter()
+    for sample in samples:
+        words = _WORD_RE.findall(sample)
+        grams = set()
+        for n in range(1, 5):
+            for i in range(len(words) - n + 1):
+                grams.add(" ".join(words[i : i + n]))
+        doc_freq.update(grams)
+
+    ranked = sorted(
+        (gram for gram, count in doc_freq.items() if count > 1 and len(gram) > 2),
+        key=lambda gram: doc_freq[gram] * len(gram),
+        reverse=True,
+    )
+    chosen: List[str] = []
+    used = 0
+    for gram in ranked:
+        if used + len(gram) + 1 > size:
+            break
+        # Shorter phrases already inside a chosen longer one add nothing
+        if any(gram in longer for longer in chosen[-64:]):
+            continue
+        chosen.append(gram)
+        used += len(gram) + 1
+    return " ".join(reversed(chosen)).encode("utf-8")
+
+
+def train_dictionary(samples: List[str], codec: str, size: Optional[int] = None) -> bytes:
+    size = size or settings.TEXT_DICTIONARY_SIZE
+    if codec == ZSTD:
+        _require_zstd()
+        return zstandard.train_dictionary(size, [s.encode("utf-8") for s in samples]).as_bytes()
+    return build_zlib_dictionary(samples, min(size, ZLIB_MAX_DICTIONARY))
+
+
+def compressed_columns():
+    """(model, primary key column, [CompressedText columns]) per table."""
+
+    from .. import models
+
+    tables = []
+    for model in (models.User, models.Response, models.Feedback):
+        columns = [c for c in model.__table__.columns if isinstance(c.type, CompressedText)]
+        tables.append((model, model.__mapper__.primary_key[0], columns))
+    return tables
+
+
+def sample_texts(db, limit: int) -> List[str]:
+    """Up to `limit` recent non-empty values from every compressed column."""
+
+    samples: List[str] = []
+    for _model, pk, columns in compressed_columns():
+        for column in columns:
+            stmt = select(column).where(column.is_not(None)).order_by(pk.desc()).limit(limit)
+            samples.extend(text for text in db.scalars(stmt) if text)
+    return samples
+
+
+def train(db, codec: Optional[str] = None, limit: int = 2000, size: Optional[int] = None):
+    """Train a dictionary from stored values and make it the active one. Commits."""
+
+    from .. import models
+
+    codec = codec or configured_codec() or ZLIB
+    samples = sample_texts(db, limit)
+    if not samples:
+        raise ValueError("No stored text to train a dictionary from")
+    row = models.TextDictionary(codec=codec, sample_count=len(samples), data=train_dictionary(samples, codec, size))
+    db.add(row)
+    db.commit()
+    dictionaries.add(Dictionary(row.dict_id, row.codec, bytes(row.data)))
+    return row
+
+
+# --- Backfill ---------------------------------------------------------------------
+
+
+def _is_current(stored, codec: Optional[str], active: Optional[Dictionary]) -> bool:
+    if stored is None:
+        return True
+    stored_codec, dict_id = stored_format(stored)
+    if stored_codec is None:
+        # Plain: fine if short (or compression is off), else it needs compressing
+        return isinstance(stored, bytes) and (
+            codec is None or len(stored) - 1 < settings.TEXT_COMPRESSION_MIN_BYTES
+        )
+    return stored_codec == codec and dict_id == (active.dict_id if active else None)
+
+
+def backfill(db, batch_size: int = 500) -> Iterable[dict]:
+    """Rewrite values that are plain text or use an older codec/dictionary.
+
+    Walks each table in primary key order, one committed batch at a time.
+    Yields a progress dict per batch. Resource versions are left alone: the
+    text a client sees does not change.
+    """
+
+    if db.get_bind().dialect.name == "postgresql":
+        return
+    codec = configured_codec()
+    active = dictionaries.active(codec) if codec else None
+
+    for model, pk, columns in compressed_columns():
+        last = None
+        scanned = rewritten = 0
+        raw_columns = [type_coerce(c, NullType()).label(c.key) for c in columns]
+        while True:
+            stmt = select(pk, *raw_columns).order_by(pk).limit(batch_size)
+            if last is not None:
+                stmt = stmt.where(pk > last)
+            rows = db.execute(stmt).all()
+            if not rows:
+                break
+            last = rows[-1][0]
+            scanned += len(rows)
+
+            stale_ids = [
+                row[0] for row in rows if not all(_is_current(row[i + 1], codec, active) for i in range(len(columns)))
+            ]
+            if stale_ids:
+                # Read back through the column type (decoded) and write through it (re-encoded)
+                current = db.execute(select(pk, *columns).where(pk.in_(stale_ids))).all()
+                stmt = (
+                    update(model.__table__)
+                    .where(pk == bindparam("b_pk"))
+                    .values({c.key: bindparam(f"b_{c.key}", type_=c.type) for c in columns})
+                )
+                db.execute(
+                    stmt,
+                    [
+                        {"b_pk": row[0], **{f"b_{c.key}": row[i + 1] for i, c in enumerate(columns)}}
+                        for row in current
+                    ],
+                )
+                db.commit()
+                rewritten += len(stale_ids)
+            yield {"table": model.__tablename__, "scanned": scanned, "rewritten": rewritten}
+
+
+def storage_stats(db) -> List[dict]:
+    """Stored bytes vs. text bytes per compressed column."""
+
+    stats = []
+    for model, _pk, columns in compressed_columns():
+        for column in columns:
+            stored = text_bytes = rows = 0
+            for raw, text in db.execute(
+                select(type_coerce(column, NullType()), column).where(column.is_not(None))
+            ):
+                rows += 1
+                stored += len(raw.encode("utf-8") if isinstance(raw, str) else raw)
+                text_bytes += len(text.encode("utf-8"))
+            stats.append(
+                {
+                    "column": f"{model.__tablename__}.{column.key}",
+                    "rows": rows,
+                    "text_bytes": text_bytes,
+                    "stored_bytes": stored,
+                    "ratio": round(text_bytes / stored, 2) if stored else None,
+                }
+            )
+    return stats
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Train compression dictionaries and backfill compressed text columns.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    train_cmd = sub.add_parser("train", help="Train a dictionary from stored values and make it active")
+    train_cmd.add_argument("--codec", choices=[ZLIB, ZSTD], default=None)
+    train_cmd.add_argument("--samples", type=int, default=2000, help="Values sampled per column")
+    train_cmd.add_argument("--size", type=int, default=None, help="Dictionary size in bytes")
+    backfill_cmd = sub.add_parser("backfill", help="Compress plain rows and re-encode rows using older dictionaries")
+    backfill_cmd.add_argument("--batch-size", type=int, default=500)
+    sub.add_parser("stats", help="Stored vs. text bytes per column")
+    args = parser.parse_args(argv)
+
+    from .. import models  # noqa: F401 - registers the tables
+    from ..db import Base, SessionLocal, engine
+
+    # Under `python -m` this file is __main__; the column type uses the imported
+    # module, so its dictionary registry is the one to load and train into
+    from . import text_codec as codec
+
+    Base.metadata.create_all(bind=engine)
+    schema_upgrade.upgrade(engine, Base.metadata)
+    with SessionLocal() as db:
+        codec.dictionaries.load(db)
+        if args.command == "train":
+            row = codec.train(db, args.codec, args.samples, args.size)
+            summary = {"dict_id": row.dict_id, "codec": row.codec, "bytes": len(row.data), "samples": row.sample_count}
+            print(json.dumps(summary))
+        elif args.command == "backfill":
+            for progress in codec.backfill(db, args.batch_size):
+                print(json.dumps(progress), flush=True)
+        else:
+            for row in codec.storage_stats(db):
+                print(json.dumps(row))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""Login throughput vs. bcrypt cost, and what a login burst does to other routes.
+
+For each cost, users are stored with hashes of that cost and logged in
+concurrently through the app (in-process TestClient) while a probe thread
+keeps calling /health/db. Reports logins/s and login p95 next to the
+probe's p95, which stays flat as long as hashing is kept off the request
+thread pool.
+
+Run from the Backend directory:
+
+    python -m benchmarks.bench_login --costs 10 11 12 13 --logins 200 --concurrency 50
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Point the app at a scratch database before anything imports app.db
+_SCRATCH = tempfile.mktemp(prefix="bench_login_", suffix=".db")
+os.environ["DATABASE_URL"] = f"sqlite:///{_SCRATCH}"
+os.environ.setdefault("SQL_STATS_HEADERS", "false")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import models  # noqa: E402
+from app.core_config import get_settings  # noqa: E402
+from app.db import SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.passwords import hash_password  # noqa: E402
+
+
+PASSWORD = "correct horse battery staple"
+
+
+def p95(samples: list) -> float:
+    samples = sorted(samples)
+    return samples[max(0, int(len(samples) * 0.95) - 1)] * 1000 if samples else 0.0
+
+
+def seed_users(cost: int, count: int) -> list:
+    hashed = hash_password(PASSWORD, rounds=cost)  # one hash is enough; bcrypt cost is per hash
+    emails = [f"login-{cost}-{i}@example.com" for i in range(count)]
+    with SessionLocal() as db:
+        db.add_all(models.User(name=f"user {i}", email=email, password_hash=hashed) for i, email in enumerate(emails))
+        db.commit()
+    return emails
+
+
+def run(client: TestClient, cost: int, logins: int, concurrency: int) -> dict:
+    get_settings().BCRYPT_ROUNDS = cost  # matches the stored hashes, so no rehash happens
+    emails = seed_users(cost, min(logins, 50))
+
+    login_samples: list = []
+    probe_samples: list = []
+    stop = threading.Event()
+
+    def probe():
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            client.get("/health/db")
+            probe_samples.append(time.perf_counter() - t0)
+            time.sleep(0.01)
+
+    def login(i: int):
+        t0 = time.perf_counter()
+        resp = client.post("/api/auth/login", json={"email": emails[i % len(emails)], "password": PASSWORD})
+        login_samples.append(time.perf_counter() - t0)
+        return resp.status_code == 200
+
+    prober = threading.Thread(target=probe, daemon=True)
+    prober.start()
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        ok = list(pool.map(login, range(logins)))
+    wall = time.perf_counter() - t0
+    stop.set()
+    prober.join()
+    failures = ok.count(False)
+
+    return {
+        "cost": cost,
+        "logins_per_s": len(ok) / wall,
+        "login_p50_ms": statistics.median(login_samples) * 1000,
+        "login_p95_ms": p95(login_samples),
+        "probe_p95_ms": p95(probe_samples),
+        "failures": failures,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--costs", type=int, nargs="+", default=[10, 11, 12])
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args(argv)
+
+    settings = get_settings()
+    print(
+        f"hash workers={settings.PASSWORD_HASH_WORKERS} max pending={settings.PASSWORD_HASH_MAX_PENDING} "
+        f"cpus={os.cpu_count()}"
+    )
+    print(f"{'cost':>4} {'logins/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'probe p95':>10} {'failed':>7}")
+    try:
+        with TestClient(app) as client:
+            for cost in args.costs:
+                row = run(client, cost, args.logins, args.concurrency)
+                print(
+                    f"{row['cost']:>4} {row['logins_per_s']:>9.1f} {row['login_p50_ms']:>8.1f} "
+                    f"{row['login_p95_ms']:>8.1f} {row['probe_p95_ms']:>10.1f} {row['failures']:>7}",
+                    flush=True,
+                )
+    finally:
+        engine.dispose()
+        os.unlink(_SCRATCH)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""Near-duplicate question lookup latency vs. table size.
+
+Fills a scratch SQLite database with synthetic questions, indexes them with
+the MinHash/LSH bands used in production and times `find_similar` against a
+brute-force Jaccard scan (the scan is only run up to --scan-limit rows).
+
+Run from the Backend directory:
+
+    python -m benchmarks.bench_question_lsh --sizes 10000 100000 1000000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# Point the app at a scratch database before anything imports app.db
+_SCRATCH = tempfile.mktemp(prefix="bench_lsh_", suffix=".db")
+os.environ["DATABASE_URL"] = f"sqlite:///{_SCRATCH}"
+
+from app import models  # noqa: E402
+from app.db import Base, SessionLocal, engine  # noqa: E402
+from app.services import question_dedupe  # noqa: E402
+
+
+OPENERS = [
+    "Tell me about a time you worked with",
+    "How would you design a system using",
+    "Walk me through a project involving",
+    "What trade-offs matter when combining",
+    "Describe how you debugged an issue with",
+]
+TECH = (
+    "python java react kafka redis postgres docker kubernetes graphql rest caching queues "
+    "sharding replication testing ci pipelines terraform spark airflow pandas numpy go rust "
+    "typescript node django flask fastapi grpc websockets oauth latency throughput"
+).split()
+# Random pseudo-words stand in for project / domain terms so that, like a
+# deduplicated production table, most stored questions are distinct
+_vocab_rng = random.Random(0)
+VOCAB = TECH + [
+    "".join(_vocab_rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(_vocab_rng.randint(4, 9)))
+    for _ in range(5000)
+]
+
+
+def synthetic_question(rng: random.Random) -> str:
+    return f"{rng.choice(OPENERS)} {' '.join(rng.sample(VOCAB, 8))}?"
+
+
+def near_duplicate(text: str, rng: random.Random) -> str:
+    """Same question with one word swapped, like an LLM rephrasing."""
+
+    words = text.rstrip("?").split()
+    words[rng.randrange(len(words))] = rng.choice(VOCAB)
+    return " ".join(words) + "?"
+
+
+def fill(n_from: int, n_to: int, rng: random.Random, sample: list) -> None:
+    """Insert questions n_from..n_to and their LSH bands with bulk inserts.
+
+    Rows are treated as already-deduplicated canonical questions, which is
+    what the index holds in production. A few texts are kept in `sample` to
+    build near-duplicate queries from.
+    """
+
+    batch = 5000
+    with engine.begin() as conn:
+        for start in range(n_from, n_to, batch):
+            stop = min(start + batch, n_to)
+            questions = [
+                {"question_id": qid, "interview_id": 1, "question_text": synthetic_question(rng)}
+                for qid in range(start + 1, stop + 1)
+            ]
+            bands = [
+                {"band": band, "bucket": bucket, "question_id": q["question_id"]}
+                for q in questions
+                for band, bucket in question_dedupe.band_keys(question_dedupe.signature(q["question_text"]))
+            ]
+            sample.extend(q["question_text"] for q in rng.sample(questions, min(20, len(questions))))
+            conn.execute(models.Question.__table__.insert(), questions)
+            conn.execute(models.QuestionBand.__table__.insert(), bands)
+
+
+def time_queries(fn, queries) -> tuple[float, float]:
+    samples = []
+    for q in queries:
+        t0 = time.perf_counter()
+        fn(q)
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--scan-limit", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(models.User.__table__.insert(), [{"user_id": 1, "name": "bench"}])
+        conn.execute(
+            models.Interview.__table__.insert(), [{"interview_id": 1, "candidate_id": 1, "interviewer_id": 1}]
+        )
+
+    print(f"{'rows':>10} {'lsh p50 ms':>11} {'lsh p95 ms':>11} {'scan p50 ms':>12}")
+    filled = 0
+    sample: list = []
+    try:
+        for size in sorted(args.sizes):
+            fill(filled, size, rng, sample)
+            filled = size
+
+            # Half near-duplicates of stored questions, half brand-new questions
+            queries = [
+                near_duplicate(rng.choice(sample), rng) if i % 2 else synthetic_question(rng)
+                for i in range(args.queries)
+            ]
+            with SessionLocal() as db:
+                p50, p95 = time_queries(lambda q: question_dedupe.find_similar(db, q, limit=5), queries)
+
+                scan = "-"
+                if size <= args.scan_limit:
+                    texts = [t for (t,) in db.query(models.Question.question_text)]
+                    scan_p50, _ = time_queries(
+                        lambda q: sorted((question_dedupe.jaccard(q, t) for t in texts), reverse=True)[:5],
+                        queries[:10],
+                    )
+                    scan = f"{scan_p50:.2f}"
+            print(f"{size:>10} {p50:>11.2f} {p95:>11.2f} {scan:>12}", flush=True)
+    finally:
+        engine.dispose()
+        os.unlink(_SCRATCH)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
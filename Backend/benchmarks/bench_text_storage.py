@@ -0,0 +1,229 @@
+"""Storage size and read latency of compressed text columns.
+
+Writes the same synthetic resumes, answers and feedback into scratch SQLite
+databases as plain TEXT and through each codec (zlib, zlib with a trained
+dictionary, and zstd variants when the zstandard package is installed),
+then reports database size per row, point-read and scan latency. A second
+section times loading users through the ORM with `resume_raw` deferred
+(the default) and undeferred.
+
+Run from the Backend directory:
+
+    python -m benchmarks.bench_text_storage --rows 5000 --reads 2000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# Point the app at a scratch database before anything imports app.db
+_SCRATCH = tempfile.mktemp(prefix="bench_text_", suffix=".db")
+os.environ["DATABASE_URL"] = f"sqlite:///{_SCRATCH}"
+
+from sqlalchemy import (  # noqa: E402
+    Column,
+    Integer,
+    LargeBinary,
+    MetaData,
+    Table,
+    Text,
+    bindparam,
+    create_engine,
+    select,
+)
+from sqlalchemy.orm import undefer  # noqa: E402
+
+from app import models  # noqa: E402
+from app.db import Base, SessionLocal, engine  # noqa: E402
+from app.services import text_codec  # noqa: E402
+
+
+SKILLS = ["Python", "FastAPI", "PostgreSQL", "Redis", "Kafka", "Docker", "React", "TypeScript", "AWS", "Go", "Java"]
+VERBS = ["Built", "Designed", "Led", "Migrated", "Optimized", "Automated", "Maintained", "Scaled"]
+THINGS = [
+    "an event pipeline", "the billing service", "a recommendation API", "CI/CD pipelines",
+    "the data warehouse", "a customer dashboard", "internal tooling", "the search backend",
+]
+OUTCOMES = [
+    "cutting p95 latency by {n}%", "handling {n}k requests per second", "reducing cloud cost by {n}%",
+    "serving {n} million users", "improving conversion by {n}%",
+]
+ANSWER_OPENERS = [
+    "In my previous role I", "At my last company we", "On a recent project I", "When I joined the team I",
+]
+
+
+def _sentence(rng: random.Random) -> str:
+    return (
+        f"{rng.choice(VERBS)} {rng.choice(THINGS)} with {rng.choice(SKILLS)} and {rng.choice(SKILLS)}, "
+        + rng.choice(OUTCOMES).format(n=rng.randint(5, 90))
+        + "."
+    )
+
+
+def resume(rng: random.Random) -> str:
+    years = rng.randint(1, 15)
+    lines = ["Summary", f"Engineer with {years} years of experience in {', '.join(rng.sample(SKILLS, 3))}."]
+    lines.append("Experience")
+    for _ in range(rng.randint(3, 6)):
+        title = rng.choice(["Senior ", "Staff ", "Lead ", ""])
+        lines.append(f"{title}Software Engineer, Company {rng.randint(1, 500)}")
+        lines.extend(f"- {_sentence(rng)}" for _ in range(rng.randint(4, 9)))
+    lines += ["Skills", ", ".join(rng.sample(SKILLS, 6)), "Education", "B.Tech in Computer Science"]
+    return "\n".join(lines)
+
+
+def answer(rng: random.Random) -> str:
+    return f"{rng.choice(ANSWER_OPENERS)} " + " ".join(_sentence(rng) for _ in range(rng.randint(1, 4)))
+
+
+def feedback(rng: random.Random) -> str:
+    return (
+        "The candidate communicated clearly and gave structured answers. "
+        + " ".join(_sentence(rng) for _ in range(2))
+        + " Focus on quantifying impact and use the STAR format for behavioural questions."
+    )
+
+
+def corpus(rng: random.Random, rows: int) -> list:
+    makers = [resume, answer, answer, answer, feedback]
+    return [makers[i % len(makers)](rng) for i in range(rows)]
+
+
+def pct(samples: list, q: float) -> float:
+    samples = sorted(samples)
+    return samples[max(0, int(len(samples) * q) - 1)] * 1e6 if samples else 0.0
+
+
+def measure(name: str, texts: list, encode, decode, plain: bool, reads: int, rng: random.Random) -> dict:
+    path = tempfile.mktemp(prefix=f"bench_text_{name}_", suffix=".db")
+    bench_engine = create_engine(f"sqlite:///{path}")
+    table = Table(
+        "texts", MetaData(), Column("id", Integer, primary_key=True), Column("body", Text if plain else LargeBinary)
+    )
+    table.metadata.create_all(bench_engine)
+    try:
+        t0 = time.perf_counter()
+        with bench_engine.begin() as conn:
+            conn.execute(table.insert(), [{"id": i, "body": encode(text)} for i, text in enumerate(texts)])
+        write_s = time.perf_counter() - t0
+        with bench_engine.connect() as conn:
+            conn.exec_driver_sql("VACUUM")
+            pages = conn.exec_driver_sql("PRAGMA page_count").scalar()
+            page_size = conn.exec_driver_sql("PRAGMA page_size").scalar()
+
+            point = select(table.c.body).where(table.c.id == bindparam("id"))
+            samples = []
+            for _ in range(reads):
+                row_id = rng.randrange(len(texts))
+                t0 = time.perf_counter()
+                decode(conn.execute(point, {"id": row_id}).scalar())
+                samples.append(time.perf_counter() - t0)
+
+            t0 = time.perf_counter()
+            for (body,) in conn.execute(select(table.c.body)):
+                decode(body)
+            scan_s = time.perf_counter() - t0
+    finally:
+        bench_engine.dispose()
+        os.unlink(path)
+
+    return {
+        "name": name,
+        "bytes_per_row": pages * page_size / len(texts),
+        "write_ms": write_s * 1000,
+        "read_p50_us": statistics.median(samples) * 1e6,
+        "read_p95_us": pct(samples, 0.95),
+        "scan_ms": scan_s * 1000,
+    }
+
+
+def storage_section(rows: int, reads: int, seed: int) -> None:
+    rng = random.Random(seed)
+    training = corpus(rng, min(rows, 2000))
+    texts = corpus(rng, rows)
+    raw_bytes = sum(len(t.encode("utf-8")) for t in texts) / len(texts)
+
+    codecs = [text_codec.ZLIB] + ([text_codec.ZSTD] if text_codec.zstandard is not None else [])
+    configs = [("plain", lambda t: t, lambda v: v, True)]
+    for dict_id, codec in enumerate(codecs, start=1):
+        dictionary = text_codec.Dictionary(dict_id, codec, text_codec.train_dictionary(training, codec))
+        text_codec.dictionaries.add(dictionary)
+        configs.append(
+            (
+                codec,
+                lambda t, c=codec: text_codec.compress_text(t, c, use_dictionary=False),
+                text_codec.decompress_text,
+                False,
+            )
+        )
+        configs.append(
+            (
+                f"{codec}+dict",
+                lambda t, c=codec, d=dictionary: text_codec.compress_text(t, c, d),
+                text_codec.decompress_text,
+                False,
+            )
+        )
+
+    print(f"rows={rows} mean text bytes={raw_bytes:.0f}")
+    print(f"{'storage':>10} {'B/row':>8} {'ratio':>6} {'write ms':>9} {'p50 us':>8} {'p95 us':>8} {'scan ms':>8}")
+    baseline = None
+    for name, encode, decode, plain in configs:
+        row = measure(name, texts, encode, decode, plain, reads, random.Random(seed))
+        baseline = baseline or row["bytes_per_row"]
+        print(
+            f"{row['name']:>10} {row['bytes_per_row']:>8.0f} {baseline / row['bytes_per_row']:>6.2f} "
+            f"{row['write_ms']:>9.1f} {row['read_p50_us']:>8.1f} {row['read_p95_us']:>8.1f} {row['scan_ms']:>8.1f}",
+            flush=True,
+        )
+
+
+def deferred_section(users: int, seed: int) -> None:
+    rng = random.Random(seed)
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        db.add_all(
+            models.User(name=f"user {i}", email=f"text-{i}@example.com", role="candidate", resume_raw=resume(rng))
+            for i in range(users)
+        )
+        db.commit()
+
+    def load(*options) -> float:
+        best = float("inf")
+        for _ in range(5):
+            with SessionLocal() as db:
+                t0 = time.perf_counter()
+                db.query(models.User).options(*options).all()
+                best = min(best, time.perf_counter() - t0)
+        return best * 1000
+
+    print(f"\nORM load of {users} users (best of 5)")
+    print(f"  resume_raw deferred:   {load():8.1f} ms")
+    print(f"  resume_raw undeferred: {load(undefer(models.User.resume_raw)):8.1f} ms")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--reads", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    try:
+        storage_section(args.rows, args.reads, args.seed)
+        deferred_section(args.users, args.seed)
+    finally:
+        engine.dispose()
+        if os.path.exists(_SCRATCH):
+            os.unlink(_SCRATCH)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
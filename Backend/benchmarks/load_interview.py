@@ -0,0 +1,369 @@
+"""Load test of the interview flow against local Gemini/Tavus stand-ins.
+
+Each virtual user runs register -> upload_resume -> enrich (with the
+extracted text) -> start -> answer (until the interview is done) -> summary
+-> feedback. Latency
+percentiles and throughput per endpoint are written to a JSON results file
+that later runs can be compared against.
+
+By default the stubs run in this process and the API is started with
+uvicorn on a scratch SQLite database; pass --base-url to drive an already
+running server instead (it must be configured with GEMINI_BASE_URL /
+TAVUS_BASE_URL pointing at stubs, see benchmarks/stubs.py).
+
+Run from the Backend directory:
+
+    python -m benchmarks.load_interview --users 50 --concurrency 10 \\
+        --gemini-latency lognormal:800,0.5 --out results/baseline.json
+    python -m benchmarks.load_interview ... --compare results/baseline.json
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import requests
+
+from benchmarks.stubs import GeminiStubHandler, StubConfig, TavusStubHandler, base_url, start_stub
+
+
+RESUME_LINES = [
+    "Backend engineer, 5 years of Python and FastAPI.",
+    "Built a Kafka and PostgreSQL event pipeline at 20k messages per second.",
+    "Cut API p95 latency 40% with Redis caching.",
+]
+
+
+def resume_pdf(lines: List[str]) -> bytes:
+    """A minimal one-page PDF with the given text lines."""
+
+    text = "BT /F1 11 Tf 50 780 Td 14 TL " + " ".join(
+        "(" + line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ") Tj T*" for line in lines
+    ) + " ET"
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n" % len(text) + text.encode("latin-1") + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+class Recorder:
+    """Latency samples and error counts per endpoint label."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.samples: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def call(
+        self, session: requests.Session, label: str, method: str, url: str, **kwargs
+    ) -> Optional[requests.Response]:
+        started = time.perf_counter()
+        try:
+            resp = session.request(method, url, timeout=120, **kwargs)
+        except requests.RequestException:
+            resp = None
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.samples.setdefault(label, []).append(elapsed)
+            if resp is None or resp.status_code >= 400:
+                self.errors[label] = self.errors.get(label, 0) + 1
+        return resp if resp is not None and resp.status_code < 400 else None
+
+    def summary(self, wall_seconds: float) -> Dict[str, dict]:
+        result = {}
+        for label, values in sorted(self.samples.items()):
+            values = sorted(values)
+            result[label] = {
+                "requests": len(values),
+                "errors": self.errors.get(label, 0),
+                "rps": round(len(values) / wall_seconds, 2) if wall_seconds else 0.0,
+                "p50_ms": round(_percentile(values, 0.50) * 1000, 1),
+                "p95_ms": round(_percentile(values, 0.95) * 1000, 1),
+                "p99_ms": round(_percentile(values, 0.99) * 1000, 1),
+                "max_ms": round(values[-1] * 1000, 1),
+            }
+        return result
+
+
+def run_flow(api: str, recorder: Recorder, interviewer_id: int, run_id: str, index: int, pdf: bytes) -> bool:
+    """One candidate through the whole flow; False if a step failed."""
+
+    email = f"bench-{run_id}-{index}@example.com"
+    name = f"Bench Candidate {index}"
+    with requests.Session() as s:
+        params = {"name": name, "email": email, "role": "candidate"}
+        if not recorder.call(s, "POST /api/users/", "POST", f"{api}/api/users/", params=params):
+            return False
+
+        uploaded = recorder.call(
+            s,
+            "POST /api/profile/upload_resume",
+            "POST",
+            f"{api}/api/profile/upload_resume",
+            files={"file": ("resume.pdf", pdf, "application/pdf")},
+        )
+        resume_text = uploaded.json().get("resume_text") if uploaded else "\n".join(RESUME_LINES)
+
+        profile = {
+            "name": name,
+            "email": email,
+            "tech_stack": ["Python", "FastAPI", "PostgreSQL", "Redis"],
+            "companies_worked": ["Acme"],
+            "target_role": "Backend Engineer",
+            "resume_text": resume_text,
+        }
+        if not recorder.call(s, "POST /api/profile/enrich", "POST", f"{api}/api/profile/enrich", json=profile):
+            return False
+
+        started = recorder.call(
+            s,
+            "POST /api/interview/start",
+            "POST",
+            f"{api}/api/interview/start",
+            json={
+                "candidate": {"name": name, "email": email},
+                "interviewer_id": interviewer_id,
+                "interview_type": "Technical",
+            },
+        )
+        if not started:
+            return False
+        data = started.json()
+        interview_id, question_id = data["interview_id"], data["question"]["question_id"]
+
+        for _ in range(50):
+            answered = recorder.call(
+                s,
+                "POST /api/interview/{interview_id}/questions/{question_id}/answer",
+                "POST",
+                f"{api}/api/interview/{interview_id}/questions/{question_id}/answer",
+                json={"answer_text": "I designed the caching layer in Python and measured a 40% latency drop."},
+            )
+            if not answered:
+                return False
+            body = answered.json()
+            if body["done"] or not body.get("follow_up_question"):
+                break
+            question_id = body["follow_up_question"]["question_id"]
+
+        ok = recorder.call(
+            s, "GET /api/interview/{interview_id}/summary", "GET", f"{api}/api/interview/{interview_id}/summary"
+        )
+        ok = recorder.call(
+            s, "GET /api/interview/{interview_id}/feedback", "GET", f"{api}/api/interview/{interview_id}/feedback"
+        ) and ok
+        return bool(ok)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_ready(api: str, proc: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"API server exited with code {proc.returncode}")
+        try:
+            if requests.get(f"{api}/health/db", timeout=2).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError("API server did not become ready")
+
+
+def spawn_api(gemini_url: str, tavus_url: str, workers: int, database_url: str, extra_env: Dict[str, str]) -> tuple:
+    port = _free_port()
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "GEMINI_API_KEY": "bench",
+        "GEMINI_BASE_URL": gemini_url,
+        "LLM_PROVIDERS": "gemini",
+        "TAVUS_API_KEY": "bench",
+        "TAVUS_PERSONA_ID": "bench-persona",
+        "TAVUS_BASE_URL": tavus_url,
+        **extra_env,
+    }
+    proc = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+        ],
+        env=env,
+    )
+    api = f"http://127.0.0.1:{port}"
+    try:
+        _wait_ready(api, proc)
+    except Exception:
+        proc.terminate()
+        raise
+    return api, proc
+
+
+def compare(current: dict, baseline_path: str) -> None:
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\nvs {baseline_path} ({baseline.get('label') or baseline.get('started_at')})")
+    print(f"{'endpoint':<68} {'p95 ms':>16} {'rps':>14}")
+    for label, now in current["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(label)
+        if not before:
+            print(f"{label:<68} {'(new)':>16}")
+            continue
+        dp95 = (now["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100 if before["p95_ms"] else 0.0
+        drps = (now["rps"] - before["rps"]) / before["rps"] * 100 if before["rps"] else 0.0
+        print(f"{label:<68} {now['p95_ms']:>8.1f} {dp95:>+6.1f}% {now['rps']:>7.2f} {drps:>+5.1f}%")
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20, help="candidates to run through the flow")
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--base-url", help="drive an existing server instead of spawning one")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the spawned server")
+    parser.add_argument("--database-url", help="database for the spawned server (default: scratch SQLite)")
+    parser.add_argument("--gemini-latency", default="lognormal:800,0.5")
+    parser.add_argument("--tavus-latency", default="lognormal:1200,0.4")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of stub calls that fail")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="extra server setting")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--label", help="name for this run in the results file")
+    parser.add_argument("--out", help="results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="earlier results file to diff against")
+    args = parser.parse_args(argv)
+
+    started_at = datetime.now(timezone.utc)
+    proc = None
+    scratch = None
+    try:
+        api = args.base_url
+        if not api:
+            gemini = start_stub(
+                GeminiStubHandler, StubConfig(args.gemini_latency, args.error_rate, args.error_status, args.seed)
+            )
+            tavus = start_stub(
+                TavusStubHandler, StubConfig(args.tavus_latency, args.error_rate, args.error_status, args.seed + 1)
+            )
+            database_url = args.database_url
+            if not database_url:
+                scratch = tempfile.mktemp(prefix="bench_load_", suffix=".db")
+                database_url = f"sqlite:///{scratch}"
+            extra_env = dict(item.split("=", 1) for item in args.env)
+            api, proc = spawn_api(base_url(gemini, "/v1beta"), base_url(tavus), args.workers, database_url, extra_env)
+        api = api.rstrip("/")
+
+        run_id = uuid.uuid4().hex[:8]
+        interviewer = requests.post(
+            f"{api}/api/users/",
+            params={"name": "Bench Interviewer", "email": f"bench-{run_id}@example.com", "role": "interviewer"},
+            timeout=30,
+        )
+        interviewer.raise_for_status()
+        interviewer_id = interviewer.json()["user_id"]
+
+        recorder = Recorder()
+        pdf = resume_pdf(RESUME_LINES)
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            outcomes = list(
+                pool.map(lambda i: run_flow(api, recorder, interviewer_id, run_id, i, pdf), range(args.users))
+            )
+        wall = time.perf_counter() - t0
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=30)
+        if scratch and os.path.exists(scratch):
+            os.unlink(scratch)
+
+    results = {
+        "label": args.label,
+        "started_at": started_at.isoformat(),
+        "git_revision": _git_revision(),
+        "config": {
+            "users": args.users,
+            "concurrency": args.concurrency,
+            "workers": args.workers,
+            "gemini_latency": args.gemini_latency,
+            "tavus_latency": args.tavus_latency,
+            "error_rate": args.error_rate,
+            "env": args.env,
+        },
+        "wall_seconds": round(wall, 2),
+        "flows_completed": sum(outcomes),
+        "flows_failed": len(outcomes) - sum(outcomes),
+        "flows_per_second": round(sum(outcomes) / wall, 3) if wall else 0.0,
+        "endpoints": recorder.summary(wall),
+    }
+
+    print(f"{'endpoint':<68} {'n':>5} {'err':>4} {'rps':>7} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for label, row in results["endpoints"].items():
+        print(
+            f"{label:<68} {row['requests']:>5} {row['errors']:>4} {row['rps']:>7.2f} "
+            f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f}"
+        )
+    print(
+        f"\n{results['flows_completed']}/{args.users} flows in {results['wall_seconds']}s "
+        f"({results['flows_per_second']} flows/s)"
+    )
+
+    out = args.out or os.path.join(
+        os.path.dirname(__file__), "results", started_at.strftime("%Y%m%dT%H%M%SZ") + ".json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {out}")
+
+    if args.compare:
+        compare(results, args.compare)
+    return 0 if results["flows_failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
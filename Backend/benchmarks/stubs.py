@@ -0,0 +1,262 @@
+"""Local stand-ins for the Gemini and Tavus HTTP APIs.
+
+The Gemini stub answers `POST /v1beta/models/{model}:generateContent` with
+the same task-shaped outputs as the "fake" LLM provider (the task is
+recognised from the prompt). The Tavus stub serves create / get /
+system-message calls under `/v2/conversations`. Both sleep for a latency
+drawn from a configurable distribution and fail a configurable share of
+requests, so the app's timeouts, fallbacks and failover see realistic load.
+
+Point the app at them with GEMINI_BASE_URL / TAVUS_BASE_URL. Standalone:
+
+    python -m benchmarks.stubs --gemini-port 9101 --tavus-port 9102 \\
+        --gemini-latency lognormal:800,0.5 --error-rate 0.02
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from app.services.llm_providers import FakeProvider
+
+
+class LatencyModel:
+    """Latency distribution parsed from "kind:args" (milliseconds).
+
+    fixed:200 | uniform:100,400 | normal:300,50 | lognormal:300,0.5
+    (lognormal takes the median and sigma, giving the long tail typical of
+    LLM APIs). A bare number means fixed.
+    """
+
+    def __init__(self, spec: str = "fixed:0", seed: Optional[int] = None) -> None:
+        kind, _, args = spec.partition(":")
+        if not args:
+            kind, args = "fixed", kind
+        self.spec = spec
+        self.kind = kind.strip().lower()
+        self.args = [float(a) for a in args.split(",") if a.strip()]
+        if self.kind not in {"fixed", "uniform", "normal", "lognormal"}:
+            raise ValueError(f"Unknown latency distribution: {spec}")
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        """One latency in seconds."""
+
+        with self._lock:
+            if self.kind == "fixed":
+                ms = self.args[0]
+            elif self.kind == "uniform":
+                ms = self._rng.uniform(self.args[0], self.args[1])
+            elif self.kind == "normal":
+                ms = self._rng.gauss(self.args[0], self.args[1])
+            else:
+                median, sigma = self.args
+                ms = self._rng.lognormvariate(0.0, sigma) * median
+        return max(0.0, ms) / 1000
+
+
+class StubConfig:
+    def __init__(
+        self, latency: str = "fixed:0", error_rate: float = 0.0, error_status: int = 503, seed: Optional[int] = None
+    ) -> None:
+        self.latency = LatencyModel(latency, seed)
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            return self._rng.random() < self.error_rate
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    config: StubConfig
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args) -> None:  # noqa: A002 - stdlib signature
+        pass
+
+    def _body(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            return json.loads(raw or b"{}")
+        except ValueError:
+            return {}
+
+    def _send(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _simulate(self) -> bool:
+        """Sleep for a sampled latency; returns False after sending an error."""
+
+        time.sleep(self.config.latency.sample())
+        if self.config.should_fail():
+            status = self.config.error_status
+            self._send(status, {"error": {"code": status, "message": "stub failure"}})
+            return False
+        return True
+
+
+# --- Gemini ---------------------------------------------------------------------
+
+_TASK_MARKERS = [
+    ("evaluating a candidate's answer", "evaluate_answer"),
+    ("still answering the last question", "follow_up_candidates"),
+    ("summarize a candidate's background", "summarize_profile"),
+    ("interview coach generating feedback", "summarize_interview"),
+    ("preparing context for an AI interviewer avatar", "interviewer_context"),
+    ("Rewrite this interview question", "personalize_question"),
+]
+_GENERATE_RE = re.compile(r"^/v1beta/models/([^/:]+):generateContent$")
+
+SAMPLE_RESUME = """Summary
+Backend engineer with 5 years of experience building Python and FastAPI services.
+Experience
+- Built an event pipeline on Kafka and PostgreSQL handling 20k messages per second.
+- Cut API p95 latency by 40% by adding Redis caching and query tuning.
+Projects
+- Interview scheduling tool with React and FastAPI.
+Skills
+Python, FastAPI, PostgreSQL, Redis, Kafka, Docker, React
+Education
+B.Tech in Computer Science"""
+
+_fake = FakeProvider()
+
+
+def guess_task(contents: list) -> str:
+    parts = [p for item in contents for p in item.get("parts") or []]
+    if any("inlineData" in p for p in parts):
+        return "extract_resume"
+    prompt = "\n".join(p.get("text", "") for p in parts)
+    for marker, task in _TASK_MARKERS:
+        if marker in prompt:
+            return task
+    return "generate_question"
+
+
+class GeminiStubHandler(_StubHandler):
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        match = _GENERATE_RE.match(self.path.split("?", 1)[0])
+        body = self._body()
+        if not match:
+            self._send(404, {"error": {"code": 404, "message": "not found"}})
+            return
+        if not self._simulate():
+            return
+
+        contents = body.get("contents") or []
+        task = guess_task(contents)
+        text = SAMPLE_RESUME if task == "extract_resume" else _fake.generate(task, contents)
+        self._send(
+            200,
+            {
+                "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}, "finishReason": "STOP"}],
+                "modelVersion": match.group(1),
+            },
+        )
+
+
+# --- Tavus ----------------------------------------------------------------------
+
+_CONVERSATION_RE = re.compile(r"^/v2/conversations(?:/([^/]+))?(/messages)?$")
+
+
+class TavusStubHandler(_StubHandler):
+    def _conversation(self, conversation_id: str) -> dict:
+        return {
+            "conversation_id": conversation_id,
+            "conversation_url": f"https://tavus.daily.co/{conversation_id}",
+            "status": "active",
+        }
+
+    def do_GET(self) -> None:  # noqa: N802
+        match = _CONVERSATION_RE.match(self.path)
+        if not match or not match.group(1) or match.group(2):
+            self._send(404, {"message": "not found"})
+            return
+        if self._simulate():
+            self._send(200, self._conversation(match.group(1)))
+
+    def do_POST(self) -> None:  # noqa: N802
+        match = _CONVERSATION_RE.match(self.path)
+        body = self._body()
+        if not match or (match.group(1) and not match.group(2)):
+            self._send(404, {"message": "not found"})
+            return
+        if not self._simulate():
+            return
+        if match.group(2):
+            self._send(200, {"conversation_id": match.group(1), "role": body.get("role"), "status": "delivered"})
+        else:
+            self._send(200, self._conversation(uuid.uuid4().hex[:12]))
+
+
+# --- Servers --------------------------------------------------------------------
+
+
+def start_stub(handler: type, config: StubConfig, port: int = 0, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve `handler` on a daemon thread; port 0 picks a free port."""
+
+    handler_cls = type(handler.__name__, (handler,), {"config": config})
+    server = ThreadingHTTPServer((host, port), handler_cls)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name=f"{handler.__name__}-{port}", daemon=True).start()
+    return server
+
+
+def base_url(server: ThreadingHTTPServer, path: str = "") -> str:
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}{path}"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run local Gemini/Tavus stand-in servers.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--gemini-port", type=int, default=9101)
+    parser.add_argument("--tavus-port", type=int, default=9102)
+    parser.add_argument("--gemini-latency", default="lognormal:800,0.5")
+    parser.add_argument("--tavus-latency", default="lognormal:1200,0.4")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    gemini = start_stub(
+        GeminiStubHandler,
+        StubConfig(args.gemini_latency, args.error_rate, args.error_status, args.seed),
+        args.gemini_port,
+        args.host,
+    )
+    tavus = start_stub(
+        TavusStubHandler,
+        StubConfig(args.tavus_latency, args.error_rate, args.error_status, args.seed),
+        args.tavus_port,
+        args.host,
+    )
+    print(f"GEMINI_BASE_URL={base_url(gemini, '/v1beta')}")
+    print(f"TAVUS_BASE_URL={base_url(tavus)}", flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
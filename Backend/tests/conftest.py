@@ -0,0 +1,77 @@
+"""Shared fixtures: the app on a scratch SQLite database with the fake LLM.
+
+The environment is set before anything imports `app`, since settings and
+engines are created at import time. Run from the Backend directory:
+
+    python -m pytest -q
+"""
+
+import os
+import shutil
+import tempfile
+import uuid
+
+_SCRATCH = tempfile.mkdtemp(prefix="interviewdost-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_SCRATCH, 'test.db')}"
+os.environ["LLM_PROVIDERS"] = "fake"
+os.environ["FAKE_LLM_LATENCY_MS"] = "0"
+os.environ["AUTH_REQUIRED"] = "false"
+os.environ["ARCHIVE_INTERVAL_SECONDS"] = "0"
+# Empty rather than unset, so a developer's .env cannot fill them back in
+for key in ("DATABASE_REPLICA_URL", "GEMINI_API_KEY", "OPENROUTER_API_KEY", "TAVUS_API_KEY"):
+    os.environ[key] = ""
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.db import SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+def pytest_sessionfinish(session, exitstatus):
+    engine.dispose()
+    shutil.rmtree(_SCRATCH, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def db(client):
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def make_user(client):
+    def make(role: str = "candidate", name: str = "Test User") -> int:
+        email = f"{uuid.uuid4().hex[:12]}@example.com"
+        resp = client.post("/api/users/", params={"name": name, "email": email, "role": role})
+        assert resp.status_code == 200, resp.text
+        return resp.json()["user_id"]
+
+    return make
+
+
+@pytest.fixture
+def start_interview(client, make_user):
+    def start(interview_type: str = "HR", skills=()) -> dict:
+        resp = client.post(
+            "/api/interview/start",
+            json={
+                "candidate": {"name": "Candidate", "email": f"{uuid.uuid4().hex[:12]}@example.com"},
+                "interviewer_id": make_user(role="interviewer"),
+                "interview_type": interview_type,
+                "skills": list(skills),
+            },
+        )
+        assert resp.status_code == 200, resp.text
+        return resp.json()
+
+    return start
@@ -0,0 +1,30 @@
+from app import models
+
+
+def _buckets(db):
+    return {(b.dimension, b.key, b.score): b.count for b in db.query(models.ScoreBucket)}
+
+
+def test_skill_change_between_answers_keeps_buckets_consistent(client, db, start_interview):
+    interview = start_interview(interview_type="Technical", skills=["Elixir"])
+    interview_id = interview["interview_id"]
+    candidate_id = db.get(models.Interview, interview_id).candidate_id
+
+    first = client.post(
+        f"/api/interview/{interview_id}/questions/{interview['question']['question_id']}/answer",
+        json={"answer_text": "I wrote Elixir services."},
+    ).json()
+    client.post(f"/api/users/{candidate_id}/skills", json={"skill_names": ["Haskell"], "proficiencies": None})
+    client.post(
+        f"/api/interview/{interview_id}/questions/{first['follow_up_question']['question_id']}/answer",
+        json={"answer_text": "And some Haskell."},
+    )
+
+    db.expire_all()
+    stats = db.get(models.InterviewStats, interview_id)
+    score = stats.overall_score
+    buckets = _buckets(db)
+    assert stats.analytics_keys == [["type", "technical"], ["skill", "elixir"], ["skill", "haskell"]]
+    assert buckets[("skill", "elixir", score)] == 1
+    assert buckets[("skill", "haskell", score)] == 1
+    assert all(count >= 0 for count in buckets.values())
@@ -0,0 +1,82 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.routers import interview as interview_router
+from app.services.auth_tokens import InvalidToken, issue_token, verify_token
+
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _import_with(env_overrides):
+    env = dict(os.environ, **env_overrides)
+    return subprocess.run(
+        [sys.executable, "-c", "import app.services.auth_tokens"], cwd=BACKEND, env=env, capture_output=True, text=True
+    )
+
+
+@pytest.mark.parametrize("secret", ["dev-insecure-token-secret", ""])
+def test_default_secret_is_refused_outside_development(secret):
+    result = _import_with({"ENV": "production", "AUTH_TOKEN_SECRET": secret})
+    assert result.returncode != 0
+    assert "AUTH_TOKEN_SECRET must be set" in result.stderr
+
+
+def test_private_secret_is_accepted_outside_development():
+    assert _import_with({"ENV": "production", "AUTH_TOKEN_SECRET": "s3cret-for-tests"}).returncode == 0
+
+
+def test_tampered_token_is_rejected(make_user):
+    token, _ = issue_token(make_user())
+    version, payload, signature = token.split(".")
+    with pytest.raises(InvalidToken):
+        verify_token(f"{version}.{payload}x.{signature}")
+
+
+@pytest.fixture
+def auth_required(monkeypatch):
+    monkeypatch.setattr(interview_router.settings, "AUTH_REQUIRED", True)
+
+
+def test_socket_accepts_the_token_as_a_subprotocol(client, start_interview, make_user, auth_required):
+    interview = start_interview()
+    token, _ = issue_token(make_user())
+    with client.websocket_connect(f"/api/interview/{interview['interview_id']}/ws", subprotocols=["bearer", token]) as ws:
+        assert ws.accepted_subprotocol == "bearer"
+        assert ws.receive_json()["type"] == "ready"
+
+
+def test_socket_ignores_a_token_in_the_query_string(client, start_interview, make_user, auth_required):
+    interview = start_interview()
+    token, _ = issue_token(make_user())
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect(f"/api/interview/{interview['interview_id']}/ws?token={token}") as ws:
+            ws.receive_json()
+
+
+def test_register_admin_hashes_on_the_bcrypt_executor(client, db, monkeypatch):
+    from app import models
+    from app.services import passwords
+
+    db.query(models.User).filter_by(email="prajwalts.is23@rvce.edu.in").delete()
+    db.commit()
+    calls = []
+    run = passwords.hashing_executor.run
+
+    async def spy(fn, *args):
+        calls.append(fn.__name__)
+        return await run(fn, *args)
+
+    monkeypatch.setattr(passwords.hashing_executor, "run", spy)
+
+    resp = client.post("/api/auth/register_admin")
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["role"] == "admin"
+    assert calls == ["hash_password"]
+
+    login = client.post("/api/auth/login", json={"email": "prajwalts.is23@rvce.edu.in", "password": "1234"})
+    assert login.status_code == 200, login.text
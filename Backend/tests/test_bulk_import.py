@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+
+def _events(resp):
+    return [json.loads(line) for line in resp.text.splitlines() if line.strip()]
+
+
+def test_invalid_utf8_row_is_reported_and_others_import(client):
+    body = (
+        b'{"name": "A", "email": "bulk-a@example.com"}\n'
+        b'{"name": "B\xff\xfe", "email": "bulk-b@example.com"}\n'
+        b'{"name": "C", "email": "bulk-c@example.com"}\n'
+    )
+
+    resp = client.post("/api/profile/bulk_import", files={"file": ("people.jsonl", body, "application/json")})
+
+    assert resp.status_code == 200
+    events = _events(resp)
+    assert {"event": "error", "row": 2, "error": "Invalid UTF-8"} in events
+    assert sorted(e["row"] for e in events if e["event"] == "row") == [1, 3]
+    assert events[-1] == {"event": "done", "processed": 3, "succeeded": 2, "failed": 1}
+
+
+def test_invalid_utf8_in_csv(client):
+    body = b"name,email\nA,bulk-csv-a@example.com\nB\xff,bulk-csv-b@example.com\n"
+
+    resp = client.post("/api/profile/bulk_import", files={"file": ("people.csv", body, "text/csv")})
+
+    events = _events(resp)
+    assert {"event": "error", "row": 3, "error": "Invalid UTF-8"} in events
+    assert events[-1]["event"] == "done"
+
+
+@pytest.mark.parametrize("params", [{"batch_size": -1}, {"batch_size": 0}, {"workers": 10000}, {"workers": 0}])
+def test_batch_size_and_workers_are_bounded(client, params):
+    body = b'{"name": "A", "email": "bulk-bounds@example.com"}\n'
+
+    resp = client.post(
+        "/api/profile/bulk_import", files={"file": ("people.jsonl", body, "application/json")}, params=params
+    )
+
+    assert resp.status_code == 422
+
+
+def test_imported_candidates_get_a_profile_snapshot(client, db):
+    from app import models
+
+    body = b'{"name": "Snap", "email": "bulk-snapshot@example.com", "tech_stack": ["Python", "SQL"]}\n'
+
+    resp = client.post("/api/profile/bulk_import", files={"file": ("people.jsonl", body, "application/json")})
+
+    (row,) = [e for e in _events(resp) if e["event"] == "row"]
+    snapshot = db.get(models.ProfileSnapshot, row["user_id"])
+    assert snapshot is not None
+    assert snapshot.skills == sorted(row["skills"])
+    assert snapshot.contexts == {}
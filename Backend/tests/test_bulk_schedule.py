@@ -0,0 +1,37 @@
+from app import models
+from app.routers import interview as interview_router
+
+
+def test_failed_item_does_not_leave_its_candidate_for_later_items(client, db, make_user, monkeypatch):
+    attach = interview_router.attach_skills
+    calls = []
+
+    def flaky_attach(session, user_id, names):
+        calls.append(user_id)
+        if len(calls) == 1:
+            raise RuntimeError("skill lookup failed")
+        return attach(session, user_id, names)
+
+    monkeypatch.setattr(interview_router, "attach_skills", flaky_attach)
+    candidate = {"name": "Repeat", "email": "bulk-schedule-repeat@example.com"}
+    resp = client.post(
+        "/api/interview/bulk_schedule",
+        json={
+            "interviewer_id": make_user(role="interviewer"),
+            "create_conversations": False,
+            "interviews": [
+                {"candidate": candidate, "interview_type": "HR", "skills": ["Python"]},
+                {"candidate": candidate, "interview_type": "HR", "skills": ["Python"]},
+            ],
+        },
+    )
+
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    first, second = body["results"]
+    assert first["status"] == "failed" and first["error"] == "skill lookup failed"
+    assert second["status"] == "scheduled"
+    assert body["scheduled"] == 1 and body["failed"] == 1
+    stored = db.get(models.User, second["candidate_id"])
+    assert stored is not None and stored.email == candidate["email"]
+    assert db.get(models.Interview, second["interview_id"]).candidate_id == stored.user_id
@@ -0,0 +1,58 @@
+import uuid
+
+from sqlalchemy import delete, insert, update
+
+from app import models
+from app.db import engine
+from app.services import candidate_search
+
+
+def _ids(client, q):
+    return {item["user_id"] for item in client.get("/api/users/search", params={"q": q}).json()["items"]}
+
+
+def _user(db, resume):
+    user = models.User(name="Search", email=f"{uuid.uuid4().hex[:12]}@example.com", resume_raw=resume)
+    db.add(user)
+    db.commit()
+    return user.user_id
+
+
+def test_orm_writes_keep_the_index_in_sync(client, db):
+    user_id = _user(db, "Fortran numerical solvers")
+    assert user_id in _ids(client, "fortran")
+
+    db.get(models.User, user_id).resume_raw = "Cobol batch jobs"
+    db.commit()
+    assert user_id not in _ids(client, "fortran")
+    assert user_id in _ids(client, "cobol")
+
+    db.delete(db.get(models.User, user_id))
+    db.commit()
+    assert user_id not in _ids(client, "cobol")
+
+
+def test_bulk_statements_through_the_session_are_indexed(client, db):
+    user_id = _user(db, "Pascal compilers")
+    db.execute(update(models.User).where(models.User.user_id == user_id).values(resume_raw="Ada avionics"))
+    db.commit()
+    assert user_id in _ids(client, "avionics")
+    assert user_id not in _ids(client, "pascal")
+
+    rows = [{"name": "Bulk", "email": f"{uuid.uuid4().hex[:12]}@example.com", "resume_summary": "Prolog expert systems"}]
+    db.execute(insert(models.User), rows)
+    db.commit()
+    assert _ids(client, "prolog")
+
+    db.execute(delete(models.User).where(models.User.user_id == user_id))
+    db.commit()
+    assert user_id not in _ids(client, "avionics")
+
+
+def test_core_writes_need_a_rebuild(client, db):
+    user_id = _user(db, "Smalltalk environments")
+    with engine.begin() as conn:
+        users = models.User.__table__
+        conn.execute(update(users).where(users.c.user_id == user_id).values(resume_summary="Lisp macros"))
+    candidate_search.rebuild(engine)
+    assert user_id in _ids(client, "lisp")
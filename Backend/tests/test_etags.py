@@ -0,0 +1,34 @@
+def test_summary_revalidates_with_304(client, start_interview):
+    interview = start_interview()
+    url = f"/api/interview/{interview['interview_id']}/summary"
+
+    first = client.get(url)
+    tag = first.headers["etag"]
+    again = client.get(url, headers={"If-None-Match": tag})
+
+    assert first.status_code == 200
+    assert again.status_code == 304
+    assert again.headers["etag"] == tag
+
+
+def test_answer_changes_the_summary_etag(client, start_interview):
+    interview = start_interview()
+    url = f"/api/interview/{interview['interview_id']}/summary"
+    tag = client.get(url).headers["etag"]
+
+    client.post(
+        f"/api/interview/{interview['interview_id']}/questions/{interview['question']['question_id']}/answer",
+        json={"answer_text": "I have shipped several Python services."},
+    )
+    resp = client.get(url, headers={"If-None-Match": tag})
+
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != tag
+
+
+def test_user_read_revalidates_with_304(client, make_user):
+    user_id = make_user()
+
+    tag = client.get(f"/api/users/{user_id}").headers["etag"]
+
+    assert client.get(f"/api/users/{user_id}", headers={"If-None-Match": tag}).status_code == 304
@@ -0,0 +1,52 @@
+from datetime import date, time
+
+from sqlalchemy import text
+
+from app import models
+from app.services import archive
+
+
+def _interview(db, candidate_id, interviewer_id, day):
+    interview = models.Interview(
+        candidate_id=candidate_id, interviewer_id=interviewer_id, date=day, time=time(10, 0), type="HR"
+    )
+    db.add(interview)
+    db.flush()
+    db.add(models.Feedback(interview_id=interview.interview_id, comments="ok"))
+    return interview.interview_id
+
+
+def test_history_pages_through_live_and_archived_interviews(client, db, make_user):
+    candidate, interviewer = make_user(), make_user(role="interviewer")
+    old = [_interview(db, candidate, interviewer, date(2020, 1, day)) for day in (1, 2, 3)]
+    # Newest rows stay live (see archive._candidates), and it is recent anyway
+    recent = _interview(db, candidate, interviewer, date.today())
+    db.commit()
+    assert archive.archive_batch(db, date(2021, 1, 1), 10) >= 3
+    assert all(archive.find_interview(db, interview_id) for interview_id in old)
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = client.get(f"/api/users/{candidate}/interviews", params=params).json()
+        seen += [item["interview_id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert seen == [recent, *reversed(old)]
+    archived_page = client.get(f"/api/users/{interviewer}/interviews", params={"role": "interviewer"}).json()
+    assert archived_page["items"][-1]["time"] == "10:00:00"
+
+
+def test_history_scan_uses_the_covering_index(db):
+    plan = " ".join(
+        str(row[-1])
+        for row in db.execute(
+            text(
+                "EXPLAIN QUERY PLAN SELECT interview_id, date, time, type, overall_score, candidate_id, interviewer_id "
+                "FROM interviews WHERE candidate_id = 1 AND date IS NOT NULL ORDER BY date DESC, interview_id DESC"
+            )
+        )
+    )
+    assert "COVERING INDEX ix_interviews_candidate_history" in plan
@@ -0,0 +1,60 @@
+import pytest
+
+from app.services import interview_engine as engine_module
+from app.services.interview_engine import InterviewEngine
+
+
+PROFILE = {"role": "Backend Engineer", "interview_type": "Technical", "skills": ["Python"]}
+
+
+@pytest.fixture
+def engine():
+    engine = InterviewEngine()
+    yield engine
+    engine._executor.shutdown(wait=True)
+
+
+def _history(answer=None):
+    return [{"question": "Tell me about a project.", "answer": answer}]
+
+
+def test_pending_drafts_are_capped(engine, monkeypatch):
+    monkeypatch.setattr(engine_module.settings, "FOLLOW_UP_PREFETCH_MAX_PENDING", 3)
+    for interview_id in range(10):
+        engine.prefetch(interview_id, 1, PROFILE, _history())
+    assert sorted(key[0] for key in engine._pending) == [7, 8, 9]
+
+
+def test_expired_drafts_are_dropped(engine, monkeypatch):
+    monkeypatch.setattr(engine_module.settings, "FOLLOW_UP_PREFETCH_TTL_SECONDS", -1.0)
+    engine.prefetch(1, 1, PROFILE, _history())
+    engine.prefetch(2, 1, PROFILE, _history())
+    assert list(engine._pending) == [(2, 1)]
+
+
+def test_finished_interview_drops_its_drafts(engine):
+    engine.prefetch(1, 1, PROFILE, _history())
+    engine.prefetch(2, 1, PROFILE, _history())
+    engine.discard(1)
+    assert list(engine._pending) == [(2, 1)]
+
+
+def test_unrelated_draft_is_refined_against_the_answer(engine):
+    engine.prefetch(1, 1, PROFILE, _history())
+    question = engine.next_question(1, 1, PROFILE, _history("Mostly Kotlin on Android."))
+    assert question.startswith("Building on your answer: ")
+    assert (1, 1) not in engine._pending
+
+
+def test_matching_draft_is_used_as_is(engine):
+    engine.prefetch(1, 1, PROFILE, _history())
+    answer = "The hardest technical decision in that work was how deeper caching could go."
+    question = engine.next_question(1, 1, PROFILE, _history(answer))
+    assert question == "Can you go deeper into the hardest technical decision in that work?"
+
+
+def test_refinement_can_be_disabled(engine, monkeypatch):
+    monkeypatch.setattr(engine_module.settings, "FOLLOW_UP_REFINE_BELOW", 0.0)
+    engine.prefetch(1, 1, PROFILE, _history())
+    question = engine.next_question(1, 1, PROFILE, _history("Mostly Kotlin on Android."))
+    assert not question.startswith("Building on your answer")
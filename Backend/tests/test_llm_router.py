@@ -0,0 +1,145 @@
+import threading
+import time
+
+import pytest
+
+from app.services import llm_providers
+from app.services.llm_providers import LLMProvider, LLMRouter, UnsupportedRequest
+
+
+CONTENTS = [{"role": "user", "parts": [{"text": "Ask me something."}]}]
+
+
+class StubProvider(LLMProvider):
+    """Provider answering with its own name, optionally slow or failing."""
+
+    def __init__(self, name, delay=0.0, fail=False, unsupported=False):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.unsupported = unsupported
+        self.calls = 0
+        self.finished = threading.Event()
+
+    def model_for(self, task):
+        return "stub"
+
+    def generate(self, task, contents):
+        self.calls += 1
+        try:
+            if self.unsupported:
+                raise UnsupportedRequest("no files")
+            time.sleep(self.delay)
+            if self.fail:
+                raise RuntimeError(f"{self.name} is down")
+            return self.name
+        finally:
+            self.finished.set()
+
+
+@pytest.fixture
+def router_settings(monkeypatch):
+    settings = llm_providers.settings
+    monkeypatch.setattr(settings, "LLM_PROVIDER_FAILURE_THRESHOLD", 2)
+    monkeypatch.setattr(settings, "LLM_PROVIDER_COOLDOWN_SECONDS", 60.0)
+    monkeypatch.setattr(settings, "LLM_HEDGE_ENABLED", False)
+    monkeypatch.setattr(settings, "LLM_HEDGE_AFTER_MS", 50)
+    return settings
+
+
+def test_fails_over_to_the_next_provider(router_settings):
+    down, up = StubProvider("down", fail=True), StubProvider("up")
+    router = LLMRouter([down, up])
+
+    assert router.generate("generate_question", CONTENTS) == "up"
+    assert down.calls == 1 and up.calls == 1
+
+
+def test_unsupported_requests_skip_the_provider_without_counting_a_failure(router_settings):
+    picky, up = StubProvider("picky", unsupported=True), StubProvider("up")
+    router = LLMRouter([picky, up])
+
+    for _ in range(3):
+        assert router.generate("extract_resume", CONTENTS) == "up"
+    assert router.ranked("extract_resume")[0] is picky
+
+
+def test_all_providers_failing_raises(router_settings):
+    router = LLMRouter([StubProvider("a", fail=True), StubProvider("b", fail=True)])
+
+    with pytest.raises(RuntimeError, match="All LLM providers failed"):
+        router.generate("generate_question", CONTENTS)
+
+
+def test_repeated_failures_put_a_provider_in_cooldown(router_settings):
+    down, up = StubProvider("down", fail=True), StubProvider("up")
+    router = LLMRouter([down, up])
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            router._call(down, "generate_question", CONTENTS)
+
+    # Cooling down: tried last, so a healthy provider answers without it
+    assert router.ranked("generate_question") == [up, down]
+    router.generate("generate_question", CONTENTS)
+    assert down.calls == 2
+
+
+def test_cooldown_expires(router_settings, monkeypatch):
+    monkeypatch.setattr(router_settings, "LLM_PROVIDER_COOLDOWN_SECONDS", 0.0)
+    flaky, up = StubProvider("flaky", fail=True), StubProvider("up")
+    router = LLMRouter([flaky, up])
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            router._call(flaky, "generate_question", CONTENTS)
+    assert router._healthy(flaky)
+
+
+def test_faster_provider_is_preferred(router_settings):
+    slow, fast = StubProvider("slow", delay=0.05), StubProvider("fast")
+    router = LLMRouter([slow, fast])
+
+    # Unmeasured providers keep their configured order until measured
+    assert router.ranked("generate_question") == [slow, fast]
+    router._call(slow, "generate_question", CONTENTS)
+    router._call(fast, "generate_question", CONTENTS)
+    assert router.ranked("generate_question") == [fast, slow]
+    assert router.generate("generate_question", CONTENTS) == "fast"
+
+
+def test_hedged_call_returns_the_faster_provider(router_settings, monkeypatch):
+    monkeypatch.setattr(router_settings, "LLM_HEDGE_ENABLED", True)
+    slow, fast = StubProvider("slow", delay=1.0), StubProvider("fast")
+    router = LLMRouter([slow, fast])
+
+    started = time.perf_counter()
+    assert router.generate("generate_question", CONTENTS) == "fast"
+    assert time.perf_counter() - started < 0.5
+    # The slow call is left to finish in the background
+    assert slow.finished.wait(2)
+
+
+def test_hedge_fails_over_when_the_first_provider_errors_early(router_settings, monkeypatch):
+    monkeypatch.setattr(router_settings, "LLM_HEDGE_ENABLED", True)
+    down, up = StubProvider("down", fail=True), StubProvider("up")
+    router = LLMRouter([down, up])
+
+    assert router.generate("generate_question", CONTENTS) == "up"
+    assert up.calls == 1
+
+
+def test_fast_failures_do_not_make_a_provider_look_fast(router_settings, monkeypatch):
+    monkeypatch.setattr(router_settings, "LLM_PROVIDER_COOLDOWN_SECONDS", 0.0)
+    broken, steady = StubProvider("broken", fail=True), StubProvider("steady", delay=0.02)
+    router = LLMRouter([broken, steady])
+
+    router._call(steady, "generate_question", CONTENTS)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            router._call(broken, "generate_question", CONTENTS)
+
+    # Cooldown over and failure streak reset, but it has never succeeded
+    assert router._healthy(broken)
+    assert router.ranked("generate_question") == [steady, broken]
+    assert router.latency.percentile(router._key(broken, "generate_question"), 0.95) is None
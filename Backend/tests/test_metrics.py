@@ -0,0 +1,23 @@
+from app.db import engine
+from app.services.metrics import db_pool_wait
+
+
+def test_pool_checkout_wait_is_recorded(client):
+    before = db_pool_wait.count()
+    for _ in range(5):
+        assert client.get("/health/db").status_code == 200
+    assert db_pool_wait.count() >= before + 5
+
+
+def test_pool_checkout_wait_survives_dispose(client):
+    # archive.install() disposes the engine, which swaps in a new pool
+    engine.dispose()
+    before = db_pool_wait.count()
+    client.get("/health/db")
+    assert db_pool_wait.count() > before
+
+
+def test_metrics_endpoint_renders_the_pool_histogram(client):
+    client.get("/health/db")
+    body = client.get("/metrics").text
+    assert "db_pool_checkout_wait_seconds_count" in body
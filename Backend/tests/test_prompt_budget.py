@@ -0,0 +1,40 @@
+from app.services.prompt_budget import compress_resume, estimate_tokens
+
+
+def test_short_resume_is_unchanged():
+    result = compress_resume("Python developer.", 100)
+
+    assert result.text == "Python developer."
+    assert result.saved_tokens == 0
+
+
+def test_single_line_resume_is_clipped_not_emptied():
+    text = "Python FastAPI engineer " * 400
+
+    result = compress_resume(text, 200)
+
+    assert result.text
+    assert result.tokens <= 200
+    assert "Python FastAPI engineer" in result.text
+
+
+def test_unbroken_text_is_clipped():
+    result = compress_resume("x" * 5000, 50)
+
+    assert "xxxx" in result.text
+    assert result.tokens <= 50
+
+
+def test_relevant_sentences_are_kept_within_budget():
+    resume = "\n".join(
+        ["Experience"]
+        + [f"Built Kafka pipeline number {i} in Python for analytics." for i in range(40)]
+        + ["Interests", "Chess, hiking and photography."]
+    )
+
+    result = compress_resume(resume, 120, role="Data Engineer", skills=["Kafka"])
+
+    assert result.tokens <= 120
+    assert result.text.startswith("Experience:")
+    assert "Kafka pipeline number 0" in result.text
+    assert estimate_tokens(result.text) == result.tokens
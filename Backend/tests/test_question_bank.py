@@ -0,0 +1,83 @@
+from app.services.question_bank import question_bank
+
+
+def _texts(db, query, k=3):
+    return [row["question_text"] for row, _ in question_bank.search(db, query, k)]
+
+
+def test_rolled_back_question_is_not_indexed(db):
+    question_bank.add(db, "Explain Kubernetes pod eviction policies", "Technical", "kubernetes")
+    db.rollback()
+
+    assert "Explain Kubernetes pod eviction policies" not in _texts(db, "kubernetes pod eviction policies")
+
+
+def test_question_is_indexed_on_commit(db):
+    question = question_bank.add(db, "How does Rust ownership prevent data races?", "Technical", "rust")
+    assert "How does Rust ownership prevent data races?" not in _texts(db, "rust ownership data races")
+
+    db.commit()
+
+    hits = question_bank.search(db, "rust ownership data races", 1)
+    assert hits[0][0]["bank_question_id"] == question.bank_question_id
+
+
+def test_savepoint_rollback_is_not_indexed(db):
+    try:
+        with db.begin_nested():
+            question_bank.add(db, "Describe Erlang supervision trees", "Technical", "erlang")
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    question_bank.add(db, "What is a Cassandra compaction strategy?", "Technical", "cassandra")
+    db.commit()
+
+    assert "Describe Erlang supervision trees" not in _texts(db, "erlang supervision trees")
+    assert "What is a Cassandra compaction strategy?" in _texts(db, "cassandra compaction strategy")
+
+
+def test_rows_committed_elsewhere_are_picked_up(db):
+    from app import models
+
+    # Written without add(), as another worker would
+    db.add(models.BankQuestion(question_text="How do you shard a Postgres table by tenant?", tags="postgres"))
+    db.commit()
+
+    question_bank.refresh(db, force=True)
+
+    assert "How do you shard a Postgres table by tenant?" in _texts(db, "shard postgres tenant")
+
+
+def test_late_commit_below_the_newest_id_is_picked_up(db):
+    from sqlalchemy import func
+
+    from app import models
+
+    newest = db.query(func.max(models.BankQuestion.bank_question_id)).scalar()
+    question_bank.refresh(db, force=True)
+    # Another worker commits id newest + 3 first; newest + 1 commits later
+    db.add(models.BankQuestion(bank_question_id=newest + 3, question_text="Explain Elm architecture updates"))
+    db.commit()
+    question_bank.refresh(db, force=True)
+    db.add(models.BankQuestion(bank_question_id=newest + 1, question_text="How do Zig comptime generics work?"))
+    db.commit()
+    question_bank.refresh(db, force=True)
+
+    assert "Explain Elm architecture updates" in _texts(db, "elm architecture updates")
+    assert "How do Zig comptime generics work?" in _texts(db, "zig comptime generics")
+
+
+def test_bulk_load_matches_one_by_one_indexing():
+    import numpy as np
+
+    from app.services.question_bank import HashingTfidfIndex
+
+    texts = [f"question {i} about topic{i % 7} and tool{i % 3}" for i in range(200)]
+    single, bulk = HashingTfidfIndex(256), HashingTfidfIndex(256)
+    for text in texts:
+        single.add(text)
+    bulk.add_many(texts)
+
+    assert len(single) == len(bulk) == 200
+    assert np.array_equal(single._df, bulk._df)
+    assert single.search("topic3 tool1", 5) == bulk.search("topic3 tool1", 5)
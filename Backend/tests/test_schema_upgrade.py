@@ -0,0 +1,46 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, inspect
+
+from app.db import Base
+from app.services import schema_upgrade
+
+
+LEGACY_DDL = """
+CREATE TABLE users (user_id INTEGER PRIMARY KEY, name VARCHAR(100), email VARCHAR(255), password_hash VARCHAR(255), role VARCHAR(50));
+CREATE TABLE interviews (interview_id INTEGER PRIMARY KEY, candidate_id INTEGER, interviewer_id INTEGER, date DATE, time TIME, type VARCHAR(50), overall_score INTEGER);
+CREATE INDEX ix_interviews_candidate_history ON interviews (candidate_id, date, interview_id, type, overall_score);
+INSERT INTO users (user_id, name) VALUES (1, 'Old');
+"""
+
+
+@pytest.fixture
+def legacy_engine(tmp_path):
+    path = tmp_path / "legacy.db"
+    with sqlite3.connect(path) as conn:
+        conn.executescript(LEGACY_DDL)
+    engine = create_engine(f"sqlite:///{path}")
+    yield engine
+    engine.dispose()
+
+
+def test_missing_columns_and_changed_indexes_are_upgraded(legacy_engine):
+    Base.metadata.create_all(bind=legacy_engine)
+    assert schema_upgrade.upgrade(legacy_engine, Base.metadata) > 0
+
+    inspector = inspect(legacy_engine)
+    assert {"resume_raw", "resume_summary", "version"} <= {c["name"] for c in inspector.get_columns("users")}
+    indexes = {i["name"]: i["column_names"] for i in inspector.get_indexes("interviews")}
+    assert indexes["ix_interviews_candidate_history"][-2:] == ["time", "interviewer_id"]
+    with legacy_engine.connect() as conn:
+        assert conn.exec_driver_sql("SELECT version FROM users WHERE user_id = 1").scalar() == 1
+    assert schema_upgrade.pending(legacy_engine, Base.metadata) == []
+
+
+def test_not_null_column_without_default_fails_loudly(legacy_engine):
+    metadata = MetaData()
+    Table("users", metadata, Column("user_id", Integer, primary_key=True), Column("tenant_id", Integer, nullable=False))
+
+    with pytest.raises(schema_upgrade.SchemaOutOfDate, match="users.tenant_id"):
+        schema_upgrade.upgrade(legacy_engine, metadata)
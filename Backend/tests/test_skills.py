@@ -0,0 +1,30 @@
+import pytest
+
+from app import models
+from app.services.skills import skill_index
+
+
+@pytest.fixture
+def known_skills(db):
+    for name in ("Next.js", "Flask", "Java", "Kubernetes", "PostgreSQL", "Python3"):
+        skill_index.get_or_create(db, name)
+    db.commit()
+
+
+@pytest.mark.parametrize("name", ["NestJS", "Nuxt.js", "Flash", "Javac", "Python2"])
+def test_distinct_technologies_are_not_merged(db, known_skills, name):
+    ref = skill_index.get_or_create(db, name)
+
+    assert ref.skill_name == name
+
+
+@pytest.mark.parametrize("name, canonical", [("Kubernets", "Kubernetes"), ("nextjs", "Next.js"), ("postgres", "PostgreSQL")])
+def test_typos_and_aliases_resolve(db, known_skills, name, canonical):
+    assert skill_index.get_or_create(db, name).skill_name == canonical
+
+
+def test_fuzzy_hits_are_not_stored_as_aliases(db, known_skills):
+    skill_index.get_or_create(db, "Kubernets")
+    db.commit()
+
+    assert db.query(models.SkillAlias).filter_by(alias_key="kubernets").first() is None
@@ -0,0 +1,29 @@
+def test_binary_frame_gets_an_error_and_the_socket_stays_open(client, start_interview):
+    interview = start_interview()
+
+    with client.websocket_connect(f"/api/interview/{interview['interview_id']}/ws") as ws:
+        assert ws.receive_json()["type"] == "ready"
+
+        ws.send_bytes(b"\x00\x01")
+        assert ws.receive_json() == {"type": "error", "detail": "Messages must be JSON text frames"}
+
+        ws.send_text("not json")
+        assert ws.receive_json()["type"] == "error"
+
+        ws.send_json({"type": "ping"})
+        assert ws.receive_json() == {"type": "pong"}
+
+
+def test_answer_over_the_socket(client, start_interview):
+    interview = start_interview()
+    question_id = interview["question"]["question_id"]
+
+    with client.websocket_connect(f"/api/interview/{interview['interview_id']}/ws") as ws:
+        ws.receive_json()
+        ws.send_json({"type": "answer", "question_id": question_id, "answer_text": "I built APIs in Python."})
+
+        scores = ws.receive_json()
+        follow_up = ws.receive_json()
+
+    assert scores["type"] == "scores" and scores["question_id"] == question_id
+    assert follow_up["type"] in {"question", "done"}